@@ -1,10 +1,10 @@
 import contextvars
-import json
 from dataclasses import dataclass
 from typing import Optional
 
 from cadence.cadence_types import WorkflowExecution, RecordActivityTaskHeartbeatRequest, ActivityType, \
     PollForActivityTaskResponse, RespondActivityTaskFailedRequest, RespondActivityTaskCompletedRequest
+from cadence.data_converter import DataConverter, DEFAULT_DATA_CONVERTER
 from cadence.exception_handling import serialize_exception
 from cadence.exceptions import ActivityCancelledException
 from cadence.workflowservice import WorkflowService
@@ -43,9 +43,10 @@ class ActivityTask:
     workflow_domain: str = None
 
 
-def heartbeat(service: WorkflowService, task_token: bytes, details: object):
+def heartbeat(service: WorkflowService, task_token: bytes, details: object,
+              data_converter: DataConverter = DEFAULT_DATA_CONVERTER):
     request = RecordActivityTaskHeartbeatRequest()
-    request.details = json.dumps(details).encode("utf-8")
+    request.details = data_converter.to_payload(details)
     request.identity = WorkflowService.get_identity()
     request.task_token = task_token
     response, error = service.record_activity_task_heartbeat(request)
@@ -55,11 +56,10 @@ def heartbeat(service: WorkflowService, task_token: bytes, details: object):
         raise ActivityCancelledException()
 
 
-def get_heartbeat_details(heartbeat_details) -> object:
+def get_heartbeat_details(heartbeat_details, data_converter: DataConverter = DEFAULT_DATA_CONVERTER) -> object:
     if not heartbeat_details:
         return None
-    json_text = heartbeat_details.decode("utf-8")
-    return json.loads(json_text)
+    return data_converter.from_payload(heartbeat_details)
 
 
 class ActivityContext:
@@ -67,6 +67,7 @@ class ActivityContext:
     activity_task: ActivityTask = None
     domain: str = None
     do_not_complete: bool = False
+    data_converter: DataConverter = DEFAULT_DATA_CONVERTER
 
     @staticmethod
     def get() -> 'ActivityContext':
@@ -77,10 +78,10 @@ class ActivityContext:
         current_activity_context.set(context)
 
     def heartbeat(self, details: object):
-        heartbeat(self.service, self.activity_task.task_token, details)
+        heartbeat(self.service, self.activity_task.task_token, details, self.data_converter)
 
     def get_heartbeat_details(self) -> object:
-        return get_heartbeat_details(self.activity_task.heartbeat_details)
+        return get_heartbeat_details(self.activity_task.heartbeat_details, self.data_converter)
 
     def do_not_complete_on_return(self):
         self.do_not_complete = True
@@ -120,12 +121,13 @@ class Activity:
 @dataclass
 class ActivityCompletionClient:
     service: WorkflowService
+    data_converter: DataConverter = DEFAULT_DATA_CONVERTER
 
     def heartbeat(self, task_token: bytes, details: object):
-        heartbeat(self.service, task_token, details)
+        heartbeat(self.service, task_token, details, self.data_converter)
 
     def complete(self, task_token: bytes, return_value: object):
-        error = complete(self.service, task_token, return_value)
+        error = complete(self.service, task_token, return_value, self.data_converter)
         if error:
             raise error
 
@@ -145,10 +147,11 @@ def complete_exceptionally(service, task_token, ex: Exception) -> Optional[Excep
     return error
 
 
-def complete(service, task_token, return_value: object) -> Optional[Exception]:
+def complete(service, task_token, return_value: object,
+             data_converter: DataConverter = DEFAULT_DATA_CONVERTER) -> Optional[Exception]:
     respond = RespondActivityTaskCompletedRequest()
     respond.task_token = task_token
-    respond.result = json.dumps(return_value)
+    respond.result = data_converter.to_payload(return_value)
     respond.identity = WorkflowService.get_identity()
     _, error = service.respond_activity_task_completed(respond)
     return error
@@ -1,86 +1,178 @@
-import datetime
 import logging
-import json
+import time
+from typing import Optional
 
 from cadence.activity import ActivityContext, ActivityTask, complete_exceptionally, complete
-from cadence.cadence_types import PollForActivityTaskRequest, TaskListMetadata, TaskList, PollForActivityTaskResponse
-from cadence.conversions import json_to_args
+from cadence.activity_responder import ActivityCompletionResponder, ActivityCompletion
+from cadence.cadence_types import PollForActivityTaskRequest, TaskListMetadata, TaskList, PollForActivityTaskResponse, \
+    TaskListType
+from cadence.interceptors import ActivityInvocation
+from cadence.metrics import ACTIVITY_POLL_LATENCY, ACTIVITY_POLL_FAILED, ACTIVITY_POLL_NO_TASK, ACTIVITY_POLL_SUCCEED, \
+    ACTIVITY_SCHEDULE_TO_START_LATENCY, ACTIVITY_TASK_COMPLETED, ACTIVITY_TASK_FAILED, ACTIVITY_EXECUTION_LATENCY
+from cadence.tracing import SPAN_KIND_CONSUMER
+from cadence.poller_autoscaler import PollerAutoScaler, TaskListBacklogSampler
 from cadence.workflowservice import WorkflowService
 from cadence.worker import Worker, StopRequestedException
 
 logger = logging.getLogger(__name__)
 
+# How long an inactive poller waits to be activated before checking whether stop was requested
+SCALER_WAIT_SECONDS = 1
 
-def activity_task_loop(worker: Worker):
-    service: WorkflowService = WorkflowService.create(worker.host, worker.port, timeout=worker.get_timeout())
-    worker.manage_service(service)
+
+def activity_task_loop(worker: Worker, poller_index: int = 0, scaler: PollerAutoScaler = None,
+                       responder: ActivityCompletionResponder = None):
+    """
+    responder is shared by the pollers of the worker, see create_responder.
+    """
+    service: WorkflowService = worker.create_service()
+    sampler = create_backlog_sampler(worker, scaler) if poller_index == 0 else None
+    backoff = worker.create_poll_backoff()
+    metrics_scope = worker.metrics_scope
+    tracer = worker.options.tracer
+    data_converter = worker.data_converter
     logger.info(f"Activity task worker started: {WorkflowService.get_identity()}")
     try:
         while True:
             if worker.is_stop_requested():
                 return
+            if scaler and not scaler.wait_until_active(poller_index, timeout=SCALER_WAIT_SECONDS):
+                continue
             try:
+                backoff.wait(worker.interruptible_sleep)
+                if worker.activity_rate_limiter:
+                    worker.activity_rate_limiter.acquire(worker.interruptible_sleep)
+                if sampler:
+                    sampler.maybe_sample(service)
                 service.set_next_timeout_cb(worker.raise_if_stop_requested)
 
-                polling_start = datetime.datetime.now()
+                polling_start = time.perf_counter()
                 polling_request = PollForActivityTaskRequest()
                 polling_request.task_list_metadata = TaskListMetadata()
-                polling_request.task_list_metadata.max_tasks_per_second = 200000
+                polling_request.task_list_metadata.max_tasks_per_second = worker.options.task_list_activities_per_second
                 polling_request.domain = worker.domain
                 polling_request.identity = WorkflowService.get_identity()
                 polling_request.task_list = TaskList()
                 polling_request.task_list.name = worker.task_list
                 task: PollForActivityTaskResponse
                 task, err = service.poll_for_activity_task(polling_request)
-                polling_end = datetime.datetime.now()
-                logger.debug("PollForActivityTask: %dms", (polling_end - polling_start).total_seconds() * 1000)
+                polling_latency = time.perf_counter() - polling_start
+                metrics_scope.histogram(ACTIVITY_POLL_LATENCY, polling_latency)
+                logger.debug("PollForActivityTask: %dms", polling_latency * 1000)
             except StopRequestedException:
                 return
             except Exception as ex:
                 logger.error("PollForActivityTask error: %s", ex)
+                metrics_scope.counter(ACTIVITY_POLL_FAILED)
+                backoff.failure()
                 continue
             if err:
                 logger.error("PollForActivityTask failed: %s", err)
+                metrics_scope.counter(ACTIVITY_POLL_FAILED)
+                backoff.failure()
                 continue
+            backoff.success()
             task_token = task.task_token
+            if scaler:
+                scaler.record_poll(bool(task_token))
             if not task_token:
                 logger.debug("PollForActivityTask has no task_token (expected): %s", task)
+                metrics_scope.counter(ACTIVITY_POLL_NO_TASK)
                 continue
+            metrics_scope.counter(ACTIVITY_POLL_SUCCEED)
+            activity_tags = {"activity_type": task.activity_type.name}
+            if task.started_timestamp and task.scheduled_timestamp_of_this_attempt:
+                metrics_scope.histogram(ACTIVITY_SCHEDULE_TO_START_LATENCY,
+                                        (task.started_timestamp - task.scheduled_timestamp_of_this_attempt) / 1e9,
+                                        tags=activity_tags)
 
-            args = json_to_args(task.input)
+            args = data_converter.payload_to_args(task.input)
             logger.info(f"Request for activity: {task.activity_type.name}")
             fn = worker.activities.get(task.activity_type.name)
             if not fn:
                 logger.error("Activity type not found: " + task.activity_type.name)
                 continue
+            rate_limiter = worker.activity_type_rate_limiters.get(task.activity_type.name)
+            if rate_limiter:
+                try:
+                    rate_limiter.acquire(worker.interruptible_sleep)
+                except StopRequestedException:
+                    return
 
-            process_start = datetime.datetime.now()
+            process_start = time.perf_counter()
             activity_context = ActivityContext()
             activity_context.service = service
             activity_context.activity_task = ActivityTask.from_poll_for_activity_task_response(task)
             activity_context.domain = worker.domain
-            try:
-                ActivityContext.set(activity_context)
-                return_value = fn(*args)
-                if activity_context.do_not_complete:
-                    logger.info(f"Not completing activity {task.activity_type.name}({str(args)[1:-1]})")
-                    continue
-                error = complete(service, task_token, return_value)
-                if error:
-                    logger.error("Error invoking RespondActivityTaskCompleted: %s", error)
-                logger.info(f"Activity {task.activity_type.name}({str(args)[1:-1]}) returned {json.dumps(return_value)}")
-            except Exception as ex:
-                logger.error(f"Activity {task.activity_type.name} failed: {type(ex).__name__}({ex})", exc_info=1)
-                error = complete_exceptionally(service, task_token, ex)
-                if error:
-                    logger.error("Error invoking RespondActivityTaskFailed: %s", error)
-            finally:
-                ActivityContext.set(None)
-                process_end = datetime.datetime.now()
-                logger.info("Process ActivityTask: %dms", (process_end - process_start).total_seconds() * 1000)
+            activity_context.data_converter = data_converter
+            execution = task.workflow_execution
+            with tracer.span("ExecuteActivity:" + task.activity_type.name, parent=tracer.extract(task.header),
+                             kind=SPAN_KIND_CONSUMER,
+                             attributes={"activity_id": task.activity_id, "workflow_id": execution.workflow_id,
+                                         "run_id": execution.run_id}) as span:
+                try:
+                    ActivityContext.set(activity_context)
+                    chain = worker.interceptor_chains.activity
+                    if chain:
+                        return_value = chain(ActivityInvocation(task.activity_type.name, fn, args, task))
+                    else:
+                        return_value = fn(*args)
+                    if activity_context.do_not_complete:
+                        logger.info(f"Not completing activity {task.activity_type.name}({str(args)[1:-1]})")
+                        continue
+                    metrics_scope.counter(ACTIVITY_TASK_COMPLETED, tags=activity_tags)
+                    if responder:
+                        responder.submit(ActivityCompletion(task_token, task.activity_type.name,
+                                                            return_value=return_value, data_converter=data_converter))
+                    else:
+                        error = complete(service, task_token, return_value, data_converter)
+                        if error:
+                            logger.error("Error invoking RespondActivityTaskCompleted: %s", error)
+                    logger.info(f"Activity {task.activity_type.name}({str(args)[1:-1]}) returned {return_value!r}")
+                except Exception as ex:
+                    logger.error(f"Activity {task.activity_type.name} failed: {type(ex).__name__}({ex})", exc_info=1)
+                    if span:
+                        span.record_exception(ex)
+                    metrics_scope.counter(ACTIVITY_TASK_FAILED, tags=activity_tags)
+                    if responder:
+                        responder.submit(ActivityCompletion(task_token, task.activity_type.name, exception=ex))
+                    else:
+                        error = complete_exceptionally(service, task_token, ex)
+                        if error:
+                            logger.error("Error invoking RespondActivityTaskFailed: %s", error)
+                finally:
+                    ActivityContext.set(None)
+                    process_latency = time.perf_counter() - process_start
+                    metrics_scope.histogram(ACTIVITY_EXECUTION_LATENCY, process_latency, tags=activity_tags)
+                    logger.info("Process ActivityTask: %dms", process_latency * 1000)
     finally:
+        if responder:
+            responder.release()
         try:
             service.close()
         except:
             logger.warning("service.close() failed", exc_info=1)
         worker.notify_thread_stopped()
+
+
+def create_responder(worker: Worker, pollers: int) -> Optional[ActivityCompletionResponder]:
+    """
+    Creates the responder shared by the pollers of the worker, stopped when the last of them exits.
+    """
+    options = worker.options
+    if not options.activity_completion_responders:
+        return None
+    pool = worker.create_service_pool(options.activity_completion_responders)
+    responder = ActivityCompletionResponder(pool, responders=options.activity_completion_responders,
+                                            queue_size=options.activity_completion_queue_size,
+                                            max_attempts=options.activity_completion_max_attempts,
+                                            pollers=pollers)
+    responder.start()
+    return responder
+
+
+def create_backlog_sampler(worker: Worker, scaler: Optional[PollerAutoScaler]) -> Optional[TaskListBacklogSampler]:
+    interval = worker.options.poller_backlog_sample_interval_seconds
+    if not scaler or not interval:
+        return None
+    return TaskListBacklogSampler(scaler, worker.domain, worker.task_list, TaskListType.Activity, interval)
@@ -5,7 +5,7 @@ from dataclasses import dataclass, field
 from typing import Callable, List
 
 from cadence.cadence_types import ActivityType, RetryPolicy
-from cadence.conversions import args_to_json
+from cadence.data_converter import DEFAULT_DATA_CONVERTER
 
 
 def get_activity_method_name(method: Callable):
@@ -58,7 +58,8 @@ def activity_method(func: Callable = None, name: str = "", schedule_to_close_tim
                 self._activity_options.fill_execute_activity_parameters(parameters)
             if self._retry_parameters:
                 parameters.retry_parameters = self._retry_parameters
-            parameters.input = args_to_json(args).encode("utf-8")
+            data_converter = getattr(self, "_data_converter", DEFAULT_DATA_CONVERTER)
+            parameters.input = data_converter.args_to_payload(args)
             from cadence.decision_loop import DecisionContext
             decision_context: DecisionContext = self._decision_context
             return await decision_context.schedule_activity_task(parameters=parameters)
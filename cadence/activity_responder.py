@@ -0,0 +1,108 @@
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from cadence.activity import complete, complete_exceptionally
+from cadence.backoff import BackoffPolicy, is_retryable
+from cadence.data_converter import DataConverter, DEFAULT_DATA_CONVERTER
+from cadence.workflowservice import WorkflowServicePool
+
+logger = logging.getLogger(__name__)
+
+MAXIMUM_RETRY_INTERVAL_SECONDS = 5
+
+
+@dataclass
+class ActivityCompletion:
+    task_token: bytes
+    activity_type: str
+    return_value: object = None
+    exception: Exception = None
+    data_converter: DataConverter = DEFAULT_DATA_CONVERTER
+
+    def respond(self, service) -> Optional[Exception]:
+        if self.exception:
+            return complete_exceptionally(service, self.task_token, self.exception)
+        else:
+            return complete(service, self.task_token, self.return_value, self.data_converter)
+
+
+class ActivityCompletionResponder:
+    """
+    Sends RespondActivityTaskCompleted/RespondActivityTaskFailed from a pool of background threads
+    so that the activity poller does not wait for a round trip before polling again.
+    """
+
+    def __init__(self, pool: WorkflowServicePool, responders: int, queue_size: int, max_attempts: int,
+                 pollers: int = 1):
+        """
+        pollers is the number of activity pollers sharing the responder, see release.
+        """
+        self.pool = pool
+        self.responders = responders
+        self.pollers = pollers
+        self.lock = threading.Lock()
+        self.retry_policy = BackoffPolicy(maximum_interval_seconds=MAXIMUM_RETRY_INTERVAL_SECONDS,
+                                          maximum_attempts=max_attempts)
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.threads: List[threading.Thread] = []
+
+    def start(self):
+        for i in range(self.responders):
+            thread = threading.Thread(target=self.run, name=f"activity-responder-{i}")
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, completion: ActivityCompletion):
+        # Blocks when the queue is full so that the poller slows down instead of buffering without limit
+        self.queue.put(completion)
+
+    def stop(self):
+        """
+        Waits for queued completions to be sent before returning.
+        """
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+    def release(self):
+        """
+        Called by each poller when it exits, the last one stops the responder.
+        """
+        with self.lock:
+            self.pollers -= 1
+            last = self.pollers == 0
+        if last:
+            self.stop()
+
+    def run(self):
+        while True:
+            completion: ActivityCompletion = self.queue.get()
+            if completion is None:
+                return
+            self.send(completion)
+
+    def send(self, completion: ActivityCompletion):
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                # Connection errors are retried as well since the pool replaces the broken connection
+                with self.pool.acquire() as service:
+                    error = completion.respond(service)
+            except Exception as ex:
+                error = ex
+            if not error:
+                return
+            if not is_retryable(error) or not self.retry_policy.should_retry(attempt):
+                logger.error("Error responding to activity task %s (attempt %d): %s",
+                             completion.activity_type, attempt, error)
+                return
+            logger.warning("Transient error responding to activity task %s (attempt %d), retrying: %s",
+                           completion.activity_type, attempt, error)
+            time.sleep(self.retry_policy.get_interval(attempt))
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Type, Tuple
+
+from cadence.cadence_types import WorkflowExecution, StartWorkflowExecutionRequest, StartWorkflowExecutionResponse
+from cadence.constants import DEFAULT_SOCKET_TIMEOUT_SECONDS
+from cadence.data_converter import DataConverter
+from cadence.payload_codec import create_data_converter
+from cadence.tracing import SPAN_KIND_CLIENT
+from cadence.workflow import WorkflowClientOptions, WorkflowOptions, WorkflowStub, WorkflowExecutionContext, \
+    WorkflowMethod, SignalMethod, QueryMethod, create_start_workflow_request, create_signal_request, \
+    create_query_request, create_close_history_event_request, create_stub_class, get_query_result, \
+    get_workflow_result, create_circuit_breaker, EMPTY_POLL_BACKOFF
+from cadence.workflowservice import WorkflowServicePool
+
+DEFAULT_MAX_CONNECTIONS = 8
+DEFAULT_MAX_LONG_POLLS = 32
+
+
+@dataclass
+class AsyncWorkflowClient:
+    """
+    asyncio counterpart of WorkflowClient.
+
+    TChannelConnection is a blocking request/response connection, so calls are run on a thread pool
+    and each one borrows a connection from service_pool for its duration: any number of coroutines
+    share at most service_pool.size sockets. Long polls for workflow results are made on their own
+    pool so that waiting on results never delays starts, signals and queries.
+    """
+    service_pool: WorkflowServicePool
+    domain: str
+    options: WorkflowClientOptions = None
+    long_poll_pool: WorkflowServicePool = None
+    data_converter: DataConverter = None
+
+    def __post_init__(self):
+        if not self.options:
+            self.options = WorkflowClientOptions()
+        if not self.long_poll_pool:
+            self.long_poll_pool = self.service_pool
+        self.data_converter = create_data_converter(self.options.data_converter, self.options.payload_codec,
+                                                    self.options.metrics_scope.tagged({"domain": self.domain}))
+        # One thread per connection, calls wait for a connection in the executor's queue rather than
+        # holding a thread
+        self.executor = ThreadPoolExecutor(max_workers=self.service_pool.size,
+                                           thread_name_prefix="cadence-client")
+        if self.long_poll_pool is self.service_pool:
+            self.long_poll_executor = self.executor
+        else:
+            self.long_poll_executor = ThreadPoolExecutor(max_workers=self.long_poll_pool.size,
+                                                         thread_name_prefix="cadence-client-poll")
+
+    @classmethod
+    def new_client(cls, host: str = "localhost", port: int = 7933, domain: str = "",
+                   options: WorkflowClientOptions = None, timeout: int = DEFAULT_SOCKET_TIMEOUT_SECONDS,
+                   max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                   max_long_polls: int = DEFAULT_MAX_LONG_POLLS) -> AsyncWorkflowClient:
+        options = options if options else WorkflowClientOptions()
+        circuit_breaker = create_circuit_breaker(options)
+
+        def create_pool(size):
+            return WorkflowServicePool.create(host, port, size, timeout=timeout, metrics_scope=options.metrics_scope,
+                                              tracer=options.tracer, interceptors=options.interceptors,
+                                              retry_policy=options.service_retry_policy,
+                                              circuit_breaker=circuit_breaker)
+
+        return cls(service_pool=create_pool(max_connections), domain=domain, options=options,
+                   long_poll_pool=create_pool(max_long_polls))
+
+    async def call(self, method_name: str, request, long_poll: bool = False) -> Tuple[object, object]:
+        """
+        Calls WorkflowService.<method_name>(request) on a pooled connection and returns its
+        (response, err) tuple.
+        """
+        pool = self.long_poll_pool if long_poll else self.service_pool
+        executor = self.long_poll_executor if long_poll else self.executor
+
+        def call_service():
+            with pool.acquire() as service:
+                return getattr(service, method_name)(request)
+
+        # Run in a copy of the current context so that RPC spans are children of the caller's span
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(executor, context.run, call_service)
+
+    @classmethod
+    async def start(cls, stub_fn: Callable, *args) -> WorkflowExecutionContext:
+        stub = stub_fn.__self__
+        assert stub._workflow_client is not None
+        assert stub_fn._workflow_method is not None
+        return await exec_workflow_async(stub._workflow_client, stub_fn._workflow_method, args,
+                                         workflow_options=stub._workflow_options, stub_instance=stub)
+
+    def new_workflow_stub(self, cls: Type, workflow_options: WorkflowOptions = None):
+        return get_async_workflow_stub_class(cls)(self, workflow_options)
+
+    def new_workflow_stub_from_workflow_id(self, cls: Type, workflow_id: str):
+        """
+        Use it to send signals or queries to a running workflow.
+        Do not call workflow methods on it
+        """
+        execution = WorkflowExecution(workflow_id=workflow_id, run_id=None)
+        return get_async_workflow_stub_class(cls)(self, execution=execution)
+
+    async def wait_for_close(self, context: WorkflowExecutionContext) -> object:
+        return await self.wait_for_close_with_workflow_id(workflow_id=context.workflow_execution.workflow_id,
+                                                          run_id=context.workflow_execution.run_id,
+                                                          workflow_type=context.workflow_type)
+
+    async def wait_for_close_with_workflow_id(self, workflow_id: str, run_id: str = None,
+                                              workflow_type: str = None) -> object:
+        empty_polls = 0
+        while True:
+            history_request = create_close_history_event_request(self, workflow_id, run_id)
+            history_response, err = await self.call("get_workflow_execution_history", history_request,
+                                                    long_poll=True)
+            if err:
+                raise Exception(err)
+            if not history_response.history.events:
+                empty_polls += 1
+                await asyncio.sleep(EMPTY_POLL_BACKOFF.get_interval(empty_polls))
+                continue
+            return get_workflow_result(self.data_converter, history_response.history.events[0], workflow_id, run_id,
+                                       workflow_type)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+        self.long_poll_executor.shutdown(wait=False)
+        self.service_pool.close()
+        self.long_poll_pool.close()
+
+    async def __aenter__(self) -> AsyncWorkflowClient:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+@lru_cache(maxsize=None)
+def get_async_workflow_stub_class(cls: Type) -> Type[WorkflowStub]:
+    return create_stub_class(cls, get_async_workflow_stub_fn, get_async_signal_stub_fn, get_async_query_stub_fn)
+
+
+async def exec_workflow_async(workflow_client: AsyncWorkflowClient, wm: WorkflowMethod, args,
+                              workflow_options: WorkflowOptions = None,
+                              stub_instance: object = None) -> WorkflowExecutionContext:
+    start_request = create_start_workflow_request(workflow_client, wm, args, workflow_options)
+    start_response, err = await call_start_workflow(workflow_client, wm, start_request)
+    if err:
+        raise Exception(err)
+    execution = WorkflowExecution(workflow_id=start_request.workflow_id, run_id=start_response.run_id)
+    stub_instance._execution = execution
+    return WorkflowExecutionContext(workflow_type=wm._name, workflow_execution=execution)
+
+
+async def call_start_workflow(workflow_client: AsyncWorkflowClient, wm: WorkflowMethod,
+                              start_request: StartWorkflowExecutionRequest
+                              ) -> Tuple[StartWorkflowExecutionResponse, object]:
+    tracer = workflow_client.options.tracer
+    with tracer.span("StartWorkflow:" + wm._name, kind=SPAN_KIND_CLIENT,
+                     attributes={"workflow_id": start_request.workflow_id}) as span:
+        # Decision tasks of the workflow are traced as children of this span
+        start_request.header = tracer.inject(start_request.header)
+        start_response, err = await workflow_client.call("start_workflow", start_request)
+        if span:
+            if err:
+                span.error = str(err)
+            else:
+                span.set_attribute("run_id", start_response.run_id)
+    return start_response, err
+
+
+def get_async_workflow_stub_fn(wm: WorkflowMethod):
+    async def workflow_stub_fn(self, *args):
+        assert self._workflow_client is not None
+        context = await exec_workflow_async(self._workflow_client, wm, args, workflow_options=self._workflow_options,
+                                            stub_instance=self)
+        return await self._workflow_client.wait_for_close(context)
+
+    workflow_stub_fn._workflow_method = wm
+    return workflow_stub_fn
+
+
+def get_async_signal_stub_fn(sm: SignalMethod):
+    async def signal_stub_fn(self, *args):
+        assert self._workflow_client is not None
+        assert self._execution
+        request = create_signal_request(self._workflow_client, sm, args, self._execution)
+        response, err = await self._workflow_client.call("signal_workflow_execution", request)
+        if err:
+            raise Exception(err)
+
+    signal_stub_fn._signal_method = sm
+    return signal_stub_fn
+
+
+def get_async_query_stub_fn(qm: QueryMethod):
+    async def query_stub_fn(self, *args):
+        assert self._workflow_client is not None
+        assert self._execution
+        request = create_query_request(self._workflow_client, qm, args, self._execution)
+        response, err = await self._workflow_client.call("query_workflow", request)
+        return get_query_result(self._workflow_client.data_converter, qm, self._execution, response, err)
+
+    query_stub_fn._query_method = qm
+    return query_stub_fn
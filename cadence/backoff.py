@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable
+
+from cadence.errors import TRANSIENT_ERRORS
+from cadence.tchannel import TChannelException
+
+
+def is_retryable(error: object) -> bool:
+    """
+    Errors from CADENCE_ERROR_FIELDS are retryable only when they indicate a transient condition on
+    the server (see errors.TRANSIENT_ERRORS). Transport level errors are always retryable.
+    """
+    return isinstance(error, TRANSIENT_ERRORS + (TChannelException, OSError, EOFError))
+
+
+@dataclass
+class BackoffPolicy:
+    initial_interval_seconds: float = 0.1
+    backoff_coefficient: float = 2
+    maximum_interval_seconds: float = 10
+    # Fraction of the interval that is randomized so that workers don't retry in lockstep
+    jitter: float = 0.2
+    # 0 means unlimited
+    maximum_attempts: int = 0
+
+    def get_interval(self, attempt: int) -> float:
+        """
+        Interval to wait before the retry following the `attempt`-th (1 based) consecutive failure.
+        """
+        interval = self.initial_interval_seconds * (self.backoff_coefficient ** (attempt - 1))
+        interval = min(interval, self.maximum_interval_seconds)
+        return interval * (1 - self.jitter * random.random())
+
+    def should_retry(self, attempt: int) -> bool:
+        return not self.maximum_attempts or attempt < self.maximum_attempts
+
+
+class CircuitOpenError(Exception):
+    """
+    Returned instead of calling the service while the circuit breaker is open.
+    """
+
+    def __init__(self, method_name: str):
+        super().__init__(f"Circuit breaker is open, {method_name} was not called")
+        self.method_name = method_name
+
+
+class CircuitState(Enum):
+    CLOSED = 1
+    OPEN = 2
+    HALF_OPEN = 3
+
+
+class CircuitBreaker:
+    """
+    Shared by all the callers of a service (e.g. all the pollers of a worker). After
+    `failure_threshold` consecutive failures requests are rejected for `open_seconds`. The circuit
+    then lets through a fraction of requests that grows linearly to 100% over `recovery_seconds`;
+    a failure during that period opens the circuit again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, open_seconds: float = 10, recovery_seconds: float = 30,
+                 clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.recovery_seconds = recovery_seconds
+        self.clock = clock
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.lock = threading.Lock()
+
+    def get_state(self) -> CircuitState:
+        with self.lock:
+            self.update_state()
+            return self.state
+
+    def update_state(self):
+        now = self.clock()
+        if self.state == CircuitState.OPEN and now - self.opened_at >= self.open_seconds:
+            self.state = CircuitState.HALF_OPEN
+        if self.state == CircuitState.HALF_OPEN and now - self.opened_at >= self.open_seconds + self.recovery_seconds:
+            self.state = CircuitState.CLOSED
+            self.consecutive_failures = 0
+
+    def allow_request(self) -> bool:
+        with self.lock:
+            self.update_state()
+            if self.state == CircuitState.CLOSED:
+                return True
+            if self.state == CircuitState.OPEN:
+                return False
+            recovered = (self.clock() - self.opened_at - self.open_seconds) / self.recovery_seconds
+            return random.random() < recovered
+
+    def record_success(self):
+        with self.lock:
+            self.consecutive_failures = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.update_state()
+            self.consecutive_failures += 1
+            if self.state == CircuitState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = CircuitState.OPEN
+                self.opened_at = self.clock()
+
+
+class Backoff:
+    """
+    Backoff state of a single caller, e.g. one poller thread.
+    """
+
+    def __init__(self, policy: BackoffPolicy, circuit_breaker: CircuitBreaker = None):
+        self.policy = policy
+        self.circuit_breaker = circuit_breaker
+        self.consecutive_failures = 0
+
+    def success(self):
+        self.consecutive_failures = 0
+        if self.circuit_breaker:
+            self.circuit_breaker.record_success()
+
+    def failure(self):
+        self.consecutive_failures += 1
+        if self.circuit_breaker:
+            self.circuit_breaker.record_failure()
+
+    def wait(self, sleep: Callable[[float], None] = time.sleep):
+        """
+        Sleeps for the backoff interval if the previous call failed, and then for as long as the
+        circuit breaker rejects calls.
+        """
+        if self.consecutive_failures:
+            sleep(self.policy.get_interval(self.consecutive_failures))
+        while self.circuit_breaker and not self.circuit_breaker.allow_request():
+            sleep(self.policy.get_interval(max(self.consecutive_failures, 1)))
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, field, replace
+from typing import Callable, Iterable, List, Optional, Set, Tuple, Union
+
+from cadence.cadence_types import WorkflowExecution, WorkflowExecutionInfo, SignalWorkflowExecutionRequest, \
+    RequestCancelWorkflowExecutionRequest, TerminateWorkflowExecutionRequest, ListWorkflowExecutionsRequest
+from cadence.constants import DEFAULT_SOCKET_TIMEOUT_SECONDS
+from cadence.data_converter import DataConverter, DEFAULT_DATA_CONVERTER
+from cadence.pagination import iterate_pages, check_response
+from cadence.payload_codec import create_data_converter
+from cadence.rate_limiter import TokenBucket
+from cadence.workflow import WorkflowClientOptions, create_circuit_breaker
+from cadence.workflowservice import WorkflowService, WorkflowServicePool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 10
+QUERY_PAGE_SIZE = 1000
+
+BatchTarget = Union[WorkflowExecution, WorkflowExecutionInfo, str]
+
+
+class BatchOperation:
+    """
+    Request sent to each execution of a batch. request_id is the same every time the batch is run
+    for the execution, so that the server deduplicates it when a batch is resumed.
+    """
+    method_name: str = None
+
+    def create_request(self, domain: str, execution: WorkflowExecution, request_id: str,
+                       data_converter: DataConverter):
+        raise NotImplementedError()
+
+
+@dataclass
+class SignalOperation(BatchOperation):
+    signal_name: str
+    args: List = field(default_factory=list)
+    method_name = "signal_workflow_execution"
+
+    def create_request(self, domain, execution, request_id, data_converter):
+        return SignalWorkflowExecutionRequest(domain=domain, workflow_execution=execution,
+                                              signal_name=self.signal_name,
+                                              input=data_converter.args_to_payload(self.args),
+                                              identity=WorkflowService.get_identity(), request_id=request_id)
+
+
+@dataclass
+class CancelOperation(BatchOperation):
+    method_name = "request_cancel_workflow_execution"
+
+    def create_request(self, domain, execution, request_id, data_converter):
+        return RequestCancelWorkflowExecutionRequest(domain=domain, workflow_execution=execution,
+                                                     identity=WorkflowService.get_identity(), request_id=request_id)
+
+
+@dataclass
+class TerminateOperation(BatchOperation):
+    reason: str = None
+    details: bytes = None
+    method_name = "terminate_workflow_execution"
+
+    def create_request(self, domain, execution, request_id, data_converter):
+        return TerminateWorkflowExecutionRequest(domain=domain, workflow_execution=execution, reason=self.reason,
+                                                 details=self.details, identity=WorkflowService.get_identity())
+
+
+@dataclass
+class BatchItemError:
+    workflow_id: str
+    run_id: Optional[str]
+    error: str
+
+
+@dataclass
+class BatchProgress:
+    succeeded: int = 0
+    failed: int = 0
+    # Already processed by a previous run, according to the checkpoint
+    skipped: int = 0
+    errors: List[BatchItemError] = field(default_factory=list)
+
+    @property
+    def processed(self) -> int:
+        return self.succeeded + self.failed + self.skipped
+
+
+class Checkpoint:
+    """
+    Append-only JSON lines file: a header with the batch id, then one line per processed execution.
+    Failed executions are retried when the batch is resumed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.batch_id: Optional[str] = None
+        self.succeeded: Set[Tuple[str, Optional[str]]] = set()
+        self.lock = threading.Lock()
+        self.file = None
+
+    def open(self, batch_id: str):
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if "batch_id" in entry:
+                        self.batch_id = entry["batch_id"]
+                    elif entry.get("error") is None:
+                        self.succeeded.add((entry["workflow_id"], entry["run_id"]))
+        self.file = open(self.path, "a")
+        if not self.batch_id:
+            self.batch_id = batch_id
+            self.write({"batch_id": batch_id})
+
+    def write(self, entry: dict):
+        with self.lock:
+            self.file.write(json.dumps(entry) + "\n")
+            self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+class BatchRunner:
+    """
+    Signals, cancels or terminates many workflow executions, e.g. every execution matching a
+    visibility query:
+
+        runner = BatchRunner.create("localhost", 7933, "sample", concurrency=20, rate_limit=100,
+                                    checkpoint_path="terminate-backfill.jsonl")
+        progress = runner.run_query(TerminateOperation(reason="bad deploy"), "WorkflowType = 'Backfill'")
+
+    Running the batch again with the same checkpoint file skips the executions already processed.
+    """
+
+    @classmethod
+    def create(cls, host: str, port: int, domain: str, concurrency: int = DEFAULT_CONCURRENCY,
+               options: WorkflowClientOptions = None, timeout: int = DEFAULT_SOCKET_TIMEOUT_SECONDS,
+               **kwargs) -> BatchRunner:
+        options = options if options else WorkflowClientOptions()
+        service_pool = WorkflowServicePool.create(host, port, concurrency, timeout=timeout,
+                                                  metrics_scope=options.metrics_scope, tracer=options.tracer,
+                                                  interceptors=options.interceptors,
+                                                  retry_policy=options.service_retry_policy,
+                                                  circuit_breaker=create_circuit_breaker(options))
+        data_converter = create_data_converter(options.data_converter, options.payload_codec,
+                                               options.metrics_scope.tagged({"domain": domain}))
+        return cls(service_pool, domain, data_converter=data_converter, **kwargs)
+
+    def __init__(self, service_pool: WorkflowServicePool, domain: str, data_converter: DataConverter = None,
+                 rate_limit: float = None, checkpoint_path: str = None,
+                 progress_callback: Callable[[BatchProgress], None] = None, batch_id: str = None):
+        """
+        At most service_pool.size requests are in flight and at most rate_limit are sent per second.
+        progress_callback is called from the worker threads with a copy of the counters every time
+        an execution is processed (errors is the list being filled).
+        """
+        self.service_pool = service_pool
+        self.domain = domain
+        self.data_converter = data_converter if data_converter else DEFAULT_DATA_CONVERTER
+        self.rate_limiter = TokenBucket(rate_limit) if rate_limit else None
+        self.checkpoint_path = checkpoint_path
+        self.progress_callback = progress_callback
+        self.batch_id = batch_id if batch_id else str(uuid.uuid4())
+
+    def run_query(self, operation: BatchOperation, query: str) -> BatchProgress:
+        """
+        Runs operation on every execution matching a visibility query. The executions are scanned
+        while the operation runs, don't use a query whose results are changed by the operation
+        (e.g. open executions when terminating) without a checkpoint.
+        """
+        # Closed so that a page prefetch doesn't outlive a run that stopped early
+        with closing(self.scan(query)) as targets:
+            return self.run(operation, targets)
+
+    def scan(self, query: str) -> Iterable[WorkflowExecutionInfo]:
+        def fetch_page(next_page_token):
+            request = ListWorkflowExecutionsRequest(domain=self.domain, page_size=QUERY_PAGE_SIZE,
+                                                    next_page_token=next_page_token, query=query)
+            with self.service_pool.acquire() as service:
+                response = check_response(*service.scan_workflow_executions(request))
+            return response.executions, response.next_page_token
+
+        return iterate_pages(fetch_page)
+
+    def run(self, operation: BatchOperation, targets: Iterable[BatchTarget]) -> BatchProgress:
+        """
+        Runs operation on each of targets, which are workflow ids, WorkflowExecution or
+        WorkflowExecutionInfo (e.g. from WorkflowClient.list_open_workflows). targets are consumed
+        lazily. Errors are collected in BatchProgress.errors rather than raised.
+        """
+        progress = BatchProgress()
+        lock = threading.Lock()
+        in_flight = threading.BoundedSemaphore(self.service_pool.size)
+        checkpoint = Checkpoint(self.checkpoint_path) if self.checkpoint_path else None
+        if checkpoint:
+            checkpoint.open(self.batch_id)
+            self.batch_id = checkpoint.batch_id
+
+        def report(execution: WorkflowExecution, error: Optional[str], skipped: bool = False):
+            with lock:
+                if skipped:
+                    progress.skipped += 1
+                elif error:
+                    progress.failed += 1
+                    progress.errors.append(BatchItemError(execution.workflow_id, execution.run_id, error))
+                else:
+                    progress.succeeded += 1
+                snapshot = replace(progress)
+            if checkpoint and not skipped:
+                checkpoint.write({"workflow_id": execution.workflow_id, "run_id": execution.run_id, "error": error})
+            if self.progress_callback:
+                self.progress_callback(snapshot)
+
+        def process(execution: WorkflowExecution):
+            try:
+                report(execution, self.execute(operation, execution))
+            except Exception as ex:
+                report(execution, str(ex) or type(ex).__name__)
+            finally:
+                in_flight.release()
+
+        executor = ThreadPoolExecutor(max_workers=self.service_pool.size, thread_name_prefix="cadence-batch")
+        try:
+            for target in targets:
+                execution = get_execution(target)
+                if checkpoint and (execution.workflow_id, execution.run_id) in checkpoint.succeeded:
+                    report(execution, None, skipped=True)
+                    continue
+                in_flight.acquire()
+                if self.rate_limiter:
+                    self.rate_limiter.acquire()
+                executor.submit(process, execution)
+        finally:
+            executor.shutdown(wait=True)
+            if checkpoint:
+                checkpoint.close()
+        logger.info("Batch %s %s: %d succeeded, %d failed, %d skipped", self.batch_id, operation.method_name,
+                    progress.succeeded, progress.failed, progress.skipped)
+        return progress
+
+    def execute(self, operation: BatchOperation, execution: WorkflowExecution) -> Optional[str]:
+        request_id = str(uuid.uuid5(uuid.NAMESPACE_URL, "cadence-batch:%s:%s:%s" % (
+            self.batch_id, execution.workflow_id, execution.run_id)))
+        request = operation.create_request(self.domain, execution, request_id, self.data_converter)
+        with self.service_pool.acquire() as service:
+            _, err = getattr(service, operation.method_name)(request)
+        return str(err) if err else None
+
+
+def get_execution(target: BatchTarget) -> WorkflowExecution:
+    if isinstance(target, WorkflowExecutionInfo):
+        return target.execution
+    if isinstance(target, str):
+        return WorkflowExecution(workflow_id=target)
+    return target
@@ -0,0 +1,59 @@
+"""
+Memory and decode time of the generated types in cadence_types, for a history of activity events.
+
+    python -m cadence.benchmarks.bench_cadence_types
+"""
+import timeit
+import tracemalloc
+
+from cadence.cadence_types import HistoryEvent, EventType, ActivityTaskScheduledEventAttributes, \
+    ActivityTaskStartedEventAttributes, ActivityTaskCompletedEventAttributes, ActivityType, TaskList, History, \
+    DecisionType
+from cadence.conversions import copy_py_to_thrift, copy_thrift_to_py
+
+ACTIVITIES = 300
+ITERATIONS = 100000
+
+
+def create_history() -> History:
+    events = []
+    for i in range(ACTIVITIES):
+        scheduled_event_id = len(events) + 1
+        events.append(HistoryEvent(event_id=scheduled_event_id, timestamp=i, event_type=EventType.ActivityTaskScheduled,
+                                   activity_task_scheduled_event_attributes=ActivityTaskScheduledEventAttributes(
+                                       activity_id=str(i), activity_type=ActivityType(name="Activities::greet"),
+                                       task_list=TaskList(name="tasks"), input=b'"bob"',
+                                       schedule_to_close_timeout_seconds=60,
+                                       decision_task_completed_event_id=scheduled_event_id - 1)))
+        events.append(HistoryEvent(event_id=len(events) + 1, timestamp=i, event_type=EventType.ActivityTaskStarted,
+                                   activity_task_started_event_attributes=ActivityTaskStartedEventAttributes(
+                                       scheduled_event_id=scheduled_event_id, identity="worker", attempt=0)))
+        events.append(HistoryEvent(event_id=len(events) + 1, timestamp=i, event_type=EventType.ActivityTaskCompleted,
+                                   activity_task_completed_event_attributes=ActivityTaskCompletedEventAttributes(
+                                       result=b'"hello bob"', scheduled_event_id=scheduled_event_id,
+                                       started_event_id=scheduled_event_id + 1, identity="worker")))
+    return History(events=events)
+
+
+def main():
+    thrift_history = copy_py_to_thrift(create_history())
+    count = len(thrift_history.events)
+
+    tracemalloc.start()
+    history = copy_thrift_to_py(thrift_history)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{'memory per decoded HistoryEvent':<40} {size / count:8.0f} bytes")
+
+    seconds = min(timeit.repeat(lambda: copy_thrift_to_py(thrift_history), number=1, repeat=5))
+    print(f"{'copy_thrift_to_py':<40} {seconds / count * 1e6:8.1f} us/event")
+
+    seconds = min(timeit.repeat(lambda: EventType.value_for(40), number=ITERATIONS, repeat=5))
+    print(f"{'EventType.value_for':<40} {seconds / ITERATIONS * 1e9:8.0f} ns/call")
+    seconds = min(timeit.repeat(lambda: DecisionType.value_for(12), number=ITERATIONS, repeat=5))
+    print(f"{'DecisionType.value_for':<40} {seconds / ITERATIONS * 1e9:8.0f} ns/call")
+    assert len(history.events) == count
+
+
+if __name__ == "__main__":
+    main()
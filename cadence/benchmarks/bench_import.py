@@ -0,0 +1,41 @@
+"""
+Time to import cadence.thrift and cadence.workflow in a new process, with and without the parsed
+thrift IDL in the cache.
+
+    python -m cadence.benchmarks.bench_import
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RUNS = 10
+MODULES = ("cadence.thrift", "cadence.workflow")
+
+
+def import_seconds(module: str, cache_dir: str) -> float:
+    env = dict(os.environ, CADENCE_THRIFT_CACHE_DIR=cache_dir)
+    code = "import time; start = time.perf_counter(); import %s; print(time.perf_counter() - start)" % module
+    output = subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True, text=True).stdout
+    return float(output)
+
+
+def report(name: str, samples):
+    print(f"{name:<40} {statistics.median(samples) * 1000:8.1f} ms (min {min(samples) * 1000:.1f} ms)")
+
+
+def main():
+    for module in MODULES:
+        cold = []
+        for _ in range(RUNS):
+            with tempfile.TemporaryDirectory() as cache_dir:
+                cold.append(import_seconds(module, cache_dir))
+        report(f"{module}: parse IDL", cold)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            import_seconds(module, cache_dir)
+            report(f"{module}: cached IDL", [import_seconds(module, cache_dir) for _ in range(RUNS)])
+
+
+if __name__ == "__main__":
+    main()
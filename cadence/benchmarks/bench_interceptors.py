@@ -0,0 +1,54 @@
+"""
+Overhead of the interceptor chains on activity invocations and service calls.
+
+    python -m cadence.benchmarks.bench_interceptors
+"""
+import timeit
+from unittest.mock import Mock
+
+from cadence.interceptors import InterceptorChains, ActivityInterceptor, ActivityInvocation, ServiceInterceptor
+from cadence.workflowservice import WorkflowService
+
+ITERATIONS = 200000
+
+
+class PassThroughInterceptor(ActivityInterceptor, ServiceInterceptor):
+    pass
+
+
+def activity(name):
+    return name
+
+
+def invoke_activity(chains: InterceptorChains):
+    chain = chains.activity
+    if chain:
+        return chain(ActivityInvocation("Activities::greet", activity, ["bob"]))
+    else:
+        return activity("bob")
+
+
+def create_service(interceptors) -> WorkflowService:
+    service = WorkflowService(Mock(), interceptors=interceptors)
+    # Leave out serialization and the network round trip, only the dispatch is measured
+    service.traced_thrift_call = lambda method_name, request: None
+    return service
+
+
+def report(name: str, fn):
+    seconds = min(timeit.repeat(fn, number=ITERATIONS, repeat=5))
+    print(f"{name:<40} {seconds / ITERATIONS * 1e9:8.0f} ns/call")
+
+
+def main():
+    report("activity: direct call", lambda: activity("bob"))
+    for count in (0, 1, 3):
+        chains = InterceptorChains([PassThroughInterceptor() for _ in range(count)])
+        report(f"activity: {count} interceptors", lambda: invoke_activity(chains))
+    for count in (0, 1, 3):
+        service = create_service([PassThroughInterceptor() for _ in range(count)])
+        report(f"thrift_call: {count} interceptors", lambda: service.thrift_call("DescribeDomain", None))
+
+
+if __name__ == "__main__":
+    main()
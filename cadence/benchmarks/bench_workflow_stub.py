@@ -0,0 +1,58 @@
+"""
+Cost of creating workflow stubs and of dispatching a signal through one, without the service call.
+
+    python -m cadence.benchmarks.bench_workflow_stub
+"""
+import timeit
+import tracemalloc
+
+from cadence.workflow import WorkflowClient, workflow_method, signal_method, query_method
+
+ITERATIONS = 20000
+
+
+class OrderWorkflow:
+    @workflow_method(task_list="orders")
+    async def process(self, order_id):
+        raise NotImplementedError
+
+    @signal_method
+    async def cancel(self, reason):
+        raise NotImplementedError
+
+    @signal_method
+    async def add_item(self, item):
+        raise NotImplementedError
+
+    @query_method
+    async def get_status(self):
+        raise NotImplementedError
+
+
+class NoopService:
+    def signal_workflow_execution(self, request):
+        return None, None
+
+
+def report(name: str, fn):
+    seconds = min(timeit.repeat(fn, number=ITERATIONS, repeat=5))
+    print(f"{name:<40} {seconds / ITERATIONS * 1e6:8.2f} us/call")
+
+
+def main():
+    client = WorkflowClient(service=NoopService(), domain="domain", options=None)
+    report("new_workflow_stub", lambda: client.new_workflow_stub(OrderWorkflow))
+    report("new_workflow_stub_from_workflow_id",
+           lambda: client.new_workflow_stub_from_workflow_id(OrderWorkflow, "order-1"))
+    report("stub from workflow id + signal",
+           lambda: client.new_workflow_stub_from_workflow_id(OrderWorkflow, "order-1").cancel("late"))
+
+    tracemalloc.start()
+    stubs = [client.new_workflow_stub_from_workflow_id(OrderWorkflow, "order-%d" % i) for i in range(1000)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{'memory per stub':<40} {size / len(stubs):8.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from cadence.payload_codec import PayloadCodec
+
+# Offloaded payloads are replaced in history by BLOB_REFERENCE_MAGIC followed by the sha256 of
+# the payload. Keys are derived from the content so that retried activities write the same blob.
+BLOB_REFERENCE_MAGIC = b"\x00cb:"
+BLOB_KEY_PATTERN = re.compile(r"sha256-[0-9a-f]{64}")
+DEFAULT_OFFLOAD_THRESHOLD_BYTES = 256 * 1024
+DEFAULT_CACHE_SIZE_BYTES = 64 * 1024 * 1024
+
+
+class BlobNotFoundError(Exception):
+    pass
+
+
+class BlobIntegrityError(Exception):
+    pass
+
+
+class BlobStore:
+    """
+    Storage for payloads offloaded by BlobStoreCodec. Workers and clients of the same workflows must
+    use the same store, and blobs must be kept as long as the histories referencing them.
+    """
+
+    def put(self, key: str, data: bytes):
+        raise NotImplementedError()
+
+    def get(self, key: str) -> bytes:
+        """
+        Raises BlobNotFoundError when there is no blob for key.
+        """
+        raise NotImplementedError()
+
+
+class FileSystemBlobStore(BlobStore):
+    """
+    Stores each blob in its own file under `directory`, which can be a shared network mount.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get_path(self, key: str) -> str:
+        if not key or key in (".", "..") or os.path.basename(key) != key:
+            raise ValueError(f"Invalid blob key: {key!r}")
+        return os.path.join(self.directory, key)
+
+    def put(self, key: str, data: bytes):
+        path = self.get_path(key)
+        if os.path.exists(path):
+            return
+        # Written to a temporary file first so that readers never see a partial blob
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, key: str) -> bytes:
+        try:
+            with open(self.get_path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise BlobNotFoundError(key) from None
+
+
+class BlobCache:
+    """
+    LRU cache of blobs bounded by their total size, shared by the decision task threads of a worker.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_SIZE_BYTES):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.blobs: OrderedDict[str, bytes] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self.lock:
+            data = self.blobs.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self.blobs.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.blobs:
+                self.blobs.move_to_end(key)
+                return
+            self.blobs[key] = data
+            self.size_bytes += len(data)
+            while self.size_bytes > self.max_bytes:
+                _, evicted = self.blobs.popitem(last=False)
+                self.size_bytes -= len(evicted)
+
+
+class BlobStoreCodec(PayloadCodec):
+    """
+    Offloads payloads of at least threshold_bytes to `store` and keeps only a reference in history.
+
+    References are resolved when the payload is converted: an activity result when the workflow
+    awaits the activity, heartbeat details when the activity asks for them. Fetched blobs are kept in
+    an LRU cache so that replaying a workflow doesn't fetch them again.
+    """
+    name = "blob_store"
+
+    def __init__(self, store: BlobStore, threshold_bytes: int = DEFAULT_OFFLOAD_THRESHOLD_BYTES,
+                 cache: BlobCache = None):
+        self.store = store
+        self.threshold_bytes = threshold_bytes
+        self.cache = cache if cache else BlobCache()
+
+    def encode(self, payload: bytes) -> bytes:
+        if not payload or len(payload) < self.threshold_bytes:
+            return payload
+        key = "sha256-" + hashlib.sha256(payload).hexdigest()
+        self.store.put(key, payload)
+        self.cache.put(key, payload)
+        return BLOB_REFERENCE_MAGIC + key.encode("ascii")
+
+    def decode(self, payload: bytes) -> bytes:
+        if not isinstance(payload, bytes) or not payload.startswith(BLOB_REFERENCE_MAGIC):
+            return payload
+        key = payload[len(BLOB_REFERENCE_MAGIC):].decode("ascii", errors="replace")
+        # The reference comes from history, which anyone able to start or signal the workflow writes to
+        if not BLOB_KEY_PATTERN.fullmatch(key):
+            raise ValueError(f"Invalid blob reference: {key!r}")
+        data = self.cache.get(key)
+        if data is None:
+            data = self.store.get(key)
+            if "sha256-" + hashlib.sha256(data).hexdigest() != key:
+                raise BlobIntegrityError(f"Content of blob {key} doesn't match its sha256")
+            self.cache.put(key, data)
+        return data
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Callable, Iterable, Sequence, Tuple, AsyncIterator, Optional
+
+from cadence.async_client import AsyncWorkflowClient, call_start_workflow
+from cadence.backoff import BackoffPolicy
+from cadence.errors import WorkflowExecutionAlreadyStartedError, ServiceBusyError
+from cadence.workflow import WorkflowOptions, WorkflowMethod, create_start_workflow_request
+
+# Retries of starts rejected with ServiceBusyError, 0 attempts means until they succeed
+DEFAULT_BUSY_BACKOFF = BackoffPolicy(initial_interval_seconds=0.5, maximum_interval_seconds=30)
+
+StartItem = Tuple[Callable, Sequence, Optional[WorkflowOptions]]
+
+
+@dataclass
+class StartResult:
+    # Position of the item in the iterable given to start_workflows
+    index: int
+    workflow_type: str
+    workflow_id: str
+    run_id: str = None
+    # The workflow id was already in use: run_id is the one of the existing execution
+    already_started: bool = False
+    error: Exception = None
+
+
+class Backpressure:
+    """
+    Number of starts that may be in flight. Halved and paused for a backoff interval every time the
+    server answers ServiceBusyError, and grown back by one with every successful start.
+    """
+
+    def __init__(self, max_concurrent: int, policy: BackoffPolicy):
+        self.max_concurrent = max_concurrent
+        self.limit = max_concurrent
+        self.policy = policy
+        self.resume_at = 0.0
+
+    async def wait(self):
+        delay = self.resume_at - asyncio.get_running_loop().time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def busy(self, attempt: int):
+        self.limit = max(1, self.limit // 2)
+        resume_at = asyncio.get_running_loop().time() + self.policy.get_interval(attempt)
+        self.resume_at = max(self.resume_at, resume_at)
+
+    def success(self):
+        self.limit = min(self.max_concurrent, self.limit + 1)
+
+
+async def start_workflows(client: AsyncWorkflowClient, items: Iterable[StartItem], max_concurrent: int = None,
+                          busy_backoff: BackoffPolicy = DEFAULT_BUSY_BACKOFF) -> AsyncIterator[StartResult]:
+    """
+    Starts a workflow for each (workflow method of a stub, args, WorkflowOptions or None) of items
+    and yields their StartResult in order of completion.
+
+    items is consumed lazily and at most max_concurrent starts are in flight, by default twice the
+    number of connections of the client so that the next request is queued when a connection is
+    released. Failures are reported in StartResult.error instead of being raised, and retried starts
+    keep their request id so that the server deduplicates them.
+    """
+    if not max_concurrent:
+        max_concurrent = 2 * client.service_pool.size
+    backpressure = Backpressure(max_concurrent, busy_backoff)
+    iterator = enumerate(items)
+    pending = set()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < backpressure.limit:
+                try:
+                    index, item = next(iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.ensure_future(start_workflow(client, index, item, backpressure)))
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def start_workflow(client: AsyncWorkflowClient, index: int, item: StartItem,
+                         backpressure: Backpressure) -> StartResult:
+    stub_fn, args, workflow_options = item
+    wm: WorkflowMethod = stub_fn._workflow_method
+    result = StartResult(index=index, workflow_type=wm._name, workflow_id=None)
+    try:
+        start_request = create_start_workflow_request(client, wm, args, workflow_options)
+        result.workflow_id = start_request.workflow_id
+        attempt = 0
+        while True:
+            await backpressure.wait()
+            start_response, err = await call_start_workflow(client, wm, start_request)
+            if isinstance(err, ServiceBusyError):
+                attempt += 1
+                backpressure.busy(attempt)
+                if not backpressure.policy.should_retry(attempt):
+                    result.error = err
+                    return result
+                continue
+            break
+        if isinstance(err, WorkflowExecutionAlreadyStartedError):
+            result.already_started = True
+            result.run_id = err.run_id
+        elif err:
+            result.error = err if isinstance(err, Exception) else Exception(err)
+        else:
+            backpressure.success()
+            result.run_id = start_response.run_id
+    except Exception as ex:
+        result.error = ex
+    return result
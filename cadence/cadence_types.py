@@ -1,28 +1,45 @@
 from __future__ import annotations
 from typing import List, Dict
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import IntEnum
 
 
+def slots(cls):
+    # Same as @dataclass(slots=True), which requires Python 3.10: instances have no __dict__
+    cls_dict = dict(cls.__dict__)
+    names = tuple(f.name for f in fields(cls))
+    cls_dict["__slots__"] = names
+    for name in names:
+        # Defaults are kept by the generated __init__
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+
 # noinspection PyPep8
+@slots
 @dataclass
 class BadRequestError:
     message: str = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class InternalServiceError:
     message: str = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DomainAlreadyExistsError:
     message: str = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class WorkflowExecutionAlreadyStartedError:
     message: str = None
@@ -31,30 +48,35 @@ class WorkflowExecutionAlreadyStartedError:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class EntityNotExistsError:
     message: str = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ServiceBusyError:
     message: str = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class CancellationAlreadyRequestedError:
     message: str = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class QueryFailedError:
     message: str = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DomainNotActiveError:
     message: str = None
@@ -64,18 +86,21 @@ class DomainNotActiveError:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class LimitExceededError:
     message: str = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class AccessDeniedError:
     message: str = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RetryTaskError:
     message: str = None
@@ -86,6 +111,7 @@ class RetryTaskError:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ClientVersionNotSupportedError:
     feature_version: str = None
@@ -101,9 +127,11 @@ class WorkflowIdReusePolicy(IntEnum):
     
     @classmethod
     def value_for(cls, n: int) -> WorkflowIdReusePolicy:
-        return next(filter(lambda i: i == n, cls), None)
+        return _WorkflowIdReusePolicy_BY_VALUE.get(n)
+
+
+_WorkflowIdReusePolicy_BY_VALUE = {item.value: item for item in WorkflowIdReusePolicy}
 
-    
 class DomainStatus(IntEnum):
     REGISTERED = 0
     DEPRECATED = 1
@@ -111,9 +139,11 @@ class DomainStatus(IntEnum):
     
     @classmethod
     def value_for(cls, n: int) -> DomainStatus:
-        return next(filter(lambda i: i == n, cls), None)
+        return _DomainStatus_BY_VALUE.get(n)
+
+
+_DomainStatus_BY_VALUE = {item.value: item for item in DomainStatus}
 
-    
 class TimeoutType(IntEnum):
     START_TO_CLOSE = 0
     SCHEDULE_TO_START = 1
@@ -122,9 +152,11 @@ class TimeoutType(IntEnum):
     
     @classmethod
     def value_for(cls, n: int) -> TimeoutType:
-        return next(filter(lambda i: i == n, cls), None)
+        return _TimeoutType_BY_VALUE.get(n)
+
+
+_TimeoutType_BY_VALUE = {item.value: item for item in TimeoutType}
 
-    
 class DecisionType(IntEnum):
     ScheduleActivityTask = 0
     RequestCancelActivityTask = 1
@@ -142,9 +174,11 @@ class DecisionType(IntEnum):
     
     @classmethod
     def value_for(cls, n: int) -> DecisionType:
-        return next(filter(lambda i: i == n, cls), None)
+        return _DecisionType_BY_VALUE.get(n)
+
+
+_DecisionType_BY_VALUE = {item.value: item for item in DecisionType}
 
-    
 class EventType(IntEnum):
     WorkflowExecutionStarted = 0
     WorkflowExecutionCompleted = 1
@@ -191,9 +225,11 @@ class EventType(IntEnum):
     
     @classmethod
     def value_for(cls, n: int) -> EventType:
-        return next(filter(lambda i: i == n, cls), None)
+        return _EventType_BY_VALUE.get(n)
+
+
+_EventType_BY_VALUE = {item.value: item for item in EventType}
 
-    
 class DecisionTaskFailedCause(IntEnum):
     UNHANDLED_DECISION = 0
     BAD_SCHEDULE_ACTIVITY_ATTRIBUTES = 1
@@ -221,33 +257,41 @@ class DecisionTaskFailedCause(IntEnum):
     
     @classmethod
     def value_for(cls, n: int) -> DecisionTaskFailedCause:
-        return next(filter(lambda i: i == n, cls), None)
+        return _DecisionTaskFailedCause_BY_VALUE.get(n)
+
+
+_DecisionTaskFailedCause_BY_VALUE = {item.value: item for item in DecisionTaskFailedCause}
 
-    
 class CancelExternalWorkflowExecutionFailedCause(IntEnum):
     UNKNOWN_EXTERNAL_WORKFLOW_EXECUTION = 0
     
     @classmethod
     def value_for(cls, n: int) -> CancelExternalWorkflowExecutionFailedCause:
-        return next(filter(lambda i: i == n, cls), None)
+        return _CancelExternalWorkflowExecutionFailedCause_BY_VALUE.get(n)
+
+
+_CancelExternalWorkflowExecutionFailedCause_BY_VALUE = {item.value: item for item in CancelExternalWorkflowExecutionFailedCause}
 
-    
 class SignalExternalWorkflowExecutionFailedCause(IntEnum):
     UNKNOWN_EXTERNAL_WORKFLOW_EXECUTION = 0
     
     @classmethod
     def value_for(cls, n: int) -> SignalExternalWorkflowExecutionFailedCause:
-        return next(filter(lambda i: i == n, cls), None)
+        return _SignalExternalWorkflowExecutionFailedCause_BY_VALUE.get(n)
+
+
+_SignalExternalWorkflowExecutionFailedCause_BY_VALUE = {item.value: item for item in SignalExternalWorkflowExecutionFailedCause}
 
-    
 class ChildWorkflowExecutionFailedCause(IntEnum):
     WORKFLOW_ALREADY_RUNNING = 0
     
     @classmethod
     def value_for(cls, n: int) -> ChildWorkflowExecutionFailedCause:
-        return next(filter(lambda i: i == n, cls), None)
+        return _ChildWorkflowExecutionFailedCause_BY_VALUE.get(n)
+
+
+_ChildWorkflowExecutionFailedCause_BY_VALUE = {item.value: item for item in ChildWorkflowExecutionFailedCause}
 
-    
 class WorkflowExecutionCloseStatus(IntEnum):
     COMPLETED = 0
     FAILED = 1
@@ -258,9 +302,11 @@ class WorkflowExecutionCloseStatus(IntEnum):
     
     @classmethod
     def value_for(cls, n: int) -> WorkflowExecutionCloseStatus:
-        return next(filter(lambda i: i == n, cls), None)
+        return _WorkflowExecutionCloseStatus_BY_VALUE.get(n)
+
+
+_WorkflowExecutionCloseStatus_BY_VALUE = {item.value: item for item in WorkflowExecutionCloseStatus}
 
-    
 class ChildPolicy(IntEnum):
     TERMINATE = 0
     REQUEST_CANCEL = 1
@@ -268,18 +314,22 @@ class ChildPolicy(IntEnum):
     
     @classmethod
     def value_for(cls, n: int) -> ChildPolicy:
-        return next(filter(lambda i: i == n, cls), None)
+        return _ChildPolicy_BY_VALUE.get(n)
+
+
+_ChildPolicy_BY_VALUE = {item.value: item for item in ChildPolicy}
 
-    
 class QueryTaskCompletedType(IntEnum):
     COMPLETED = 0
     FAILED = 1
     
     @classmethod
     def value_for(cls, n: int) -> QueryTaskCompletedType:
-        return next(filter(lambda i: i == n, cls), None)
+        return _QueryTaskCompletedType_BY_VALUE.get(n)
+
+
+_QueryTaskCompletedType_BY_VALUE = {item.value: item for item in QueryTaskCompletedType}
 
-    
 class PendingActivityState(IntEnum):
     SCHEDULED = 0
     STARTED = 1
@@ -287,36 +337,44 @@ class PendingActivityState(IntEnum):
     
     @classmethod
     def value_for(cls, n: int) -> PendingActivityState:
-        return next(filter(lambda i: i == n, cls), None)
+        return _PendingActivityState_BY_VALUE.get(n)
+
+
+_PendingActivityState_BY_VALUE = {item.value: item for item in PendingActivityState}
 
-    
 class HistoryEventFilterType(IntEnum):
     ALL_EVENT = 0
     CLOSE_EVENT = 1
     
     @classmethod
     def value_for(cls, n: int) -> HistoryEventFilterType:
-        return next(filter(lambda i: i == n, cls), None)
+        return _HistoryEventFilterType_BY_VALUE.get(n)
+
+
+_HistoryEventFilterType_BY_VALUE = {item.value: item for item in HistoryEventFilterType}
 
-    
 class TaskListKind(IntEnum):
     NORMAL = 0
     STICKY = 1
     
     @classmethod
     def value_for(cls, n: int) -> TaskListKind:
-        return next(filter(lambda i: i == n, cls), None)
+        return _TaskListKind_BY_VALUE.get(n)
+
+
+_TaskListKind_BY_VALUE = {item.value: item for item in TaskListKind}
 
-    
 class ArchivalStatus(IntEnum):
     DISABLED = 0
     ENABLED = 1
     
     @classmethod
     def value_for(cls, n: int) -> ArchivalStatus:
-        return next(filter(lambda i: i == n, cls), None)
+        return _ArchivalStatus_BY_VALUE.get(n)
+
+
+_ArchivalStatus_BY_VALUE = {item.value: item for item in ArchivalStatus}
 
-    
 class IndexedValueType(IntEnum):
     STRING = 0
     KEYWORD = 1
@@ -327,26 +385,32 @@ class IndexedValueType(IntEnum):
     
     @classmethod
     def value_for(cls, n: int) -> IndexedValueType:
-        return next(filter(lambda i: i == n, cls), None)
+        return _IndexedValueType_BY_VALUE.get(n)
+
+
+_IndexedValueType_BY_VALUE = {item.value: item for item in IndexedValueType}
 
-    
 class EncodingType(IntEnum):
     ThriftRW = 0
     
     @classmethod
     def value_for(cls, n: int) -> EncodingType:
-        return next(filter(lambda i: i == n, cls), None)
+        return _EncodingType_BY_VALUE.get(n)
+
+
+_EncodingType_BY_VALUE = {item.value: item for item in EncodingType}
 
-    
 class QueryRejectCondition(IntEnum):
     NOT_OPEN = 0
     NOT_COMPLETED_CLEANLY = 1
     
     @classmethod
     def value_for(cls, n: int) -> QueryRejectCondition:
-        return next(filter(lambda i: i == n, cls), None)
+        return _QueryRejectCondition_BY_VALUE.get(n)
+
+
+_QueryRejectCondition_BY_VALUE = {item.value: item for item in QueryRejectCondition}
 
-    
 class ContinueAsNewInitiator(IntEnum):
     Decider = 0
     RetryPolicy = 1
@@ -354,37 +418,45 @@ class ContinueAsNewInitiator(IntEnum):
     
     @classmethod
     def value_for(cls, n: int) -> ContinueAsNewInitiator:
-        return next(filter(lambda i: i == n, cls), None)
+        return _ContinueAsNewInitiator_BY_VALUE.get(n)
+
+
+_ContinueAsNewInitiator_BY_VALUE = {item.value: item for item in ContinueAsNewInitiator}
 
-    
 class TaskListType(IntEnum):
     Decision = 0
     Activity = 1
     
     @classmethod
     def value_for(cls, n: int) -> TaskListType:
-        return next(filter(lambda i: i == n, cls), None)
+        return _TaskListType_BY_VALUE.get(n)
+
+
+_TaskListType_BY_VALUE = {item.value: item for item in TaskListType}
 
-    
 # noinspection PyPep8
+@slots
 @dataclass
 class Header:
     fields: Dict[str, bytes] = field(default_factory=dict)
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class WorkflowType:
     name: str = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ActivityType:
     name: str = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class TaskList:
     name: str = None
@@ -392,6 +464,7 @@ class TaskList:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DataBlob:
     encoding_type: EncodingType = None
@@ -399,6 +472,7 @@ class DataBlob:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ReplicationInfo:
     version: int = None
@@ -406,12 +480,14 @@ class ReplicationInfo:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class TaskListMetadata:
     max_tasks_per_second: float = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class WorkflowExecution:
     workflow_id: str = None
@@ -419,18 +495,21 @@ class WorkflowExecution:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class Memo:
     fields: Dict[str, bytes] = field(default_factory=dict)
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class SearchAttributes:
     indexed_fields: Dict[str, bytes] = field(default_factory=dict)
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class WorkflowExecutionInfo:
     execution: WorkflowExecution = None
@@ -448,6 +527,7 @@ class WorkflowExecutionInfo:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class WorkflowExecutionConfiguration:
     task_list: TaskList = None
@@ -457,6 +537,7 @@ class WorkflowExecutionConfiguration:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class TransientDecisionInfo:
     scheduled_event: HistoryEvent = None
@@ -464,6 +545,7 @@ class TransientDecisionInfo:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ScheduleActivityTaskDecisionAttributes:
     activity_id: str = None
@@ -480,12 +562,14 @@ class ScheduleActivityTaskDecisionAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RequestCancelActivityTaskDecisionAttributes:
     activity_id: str = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class StartTimerDecisionAttributes:
     timer_id: str = None
@@ -493,12 +577,14 @@ class StartTimerDecisionAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class CompleteWorkflowExecutionDecisionAttributes:
     result: bytes = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class FailWorkflowExecutionDecisionAttributes:
     reason: str = None
@@ -506,18 +592,21 @@ class FailWorkflowExecutionDecisionAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class CancelTimerDecisionAttributes:
     timer_id: str = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class CancelWorkflowExecutionDecisionAttributes:
     details: bytes = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RequestCancelExternalWorkflowExecutionDecisionAttributes:
     domain: str = None
@@ -528,6 +617,7 @@ class RequestCancelExternalWorkflowExecutionDecisionAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class SignalExternalWorkflowExecutionDecisionAttributes:
     domain: str = None
@@ -539,12 +629,14 @@ class SignalExternalWorkflowExecutionDecisionAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class UpsertWorkflowSearchAttributesDecisionAttributes:
     search_attributes: SearchAttributes = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RecordMarkerDecisionAttributes:
     marker_name: str = None
@@ -553,6 +645,7 @@ class RecordMarkerDecisionAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ContinueAsNewWorkflowExecutionDecisionAttributes:
     workflow_type: WorkflowType = None
@@ -573,6 +666,7 @@ class ContinueAsNewWorkflowExecutionDecisionAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class StartChildWorkflowExecutionDecisionAttributes:
     domain: str = None
@@ -593,6 +687,7 @@ class StartChildWorkflowExecutionDecisionAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class Decision:
     decision_type: DecisionType = None
@@ -612,6 +707,7 @@ class Decision:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class WorkflowExecutionStartedEventAttributes:
     workflow_type: WorkflowType = None
@@ -643,12 +739,14 @@ class WorkflowExecutionStartedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ResetPoints:
     points: List[ResetPointInfo] = field(default_factory=list)
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ResetPointInfo:
     binary_checksum: str = None
@@ -660,6 +758,7 @@ class ResetPointInfo:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class WorkflowExecutionCompletedEventAttributes:
     result: bytes = None
@@ -667,6 +766,7 @@ class WorkflowExecutionCompletedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class WorkflowExecutionFailedEventAttributes:
     reason: str = None
@@ -675,12 +775,14 @@ class WorkflowExecutionFailedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class WorkflowExecutionTimedOutEventAttributes:
     timeout_type: TimeoutType = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class WorkflowExecutionContinuedAsNewEventAttributes:
     new_execution_run_id: str = None
@@ -701,6 +803,7 @@ class WorkflowExecutionContinuedAsNewEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DecisionTaskScheduledEventAttributes:
     task_list: TaskList = None
@@ -709,6 +812,7 @@ class DecisionTaskScheduledEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DecisionTaskStartedEventAttributes:
     scheduled_event_id: int = None
@@ -717,6 +821,7 @@ class DecisionTaskStartedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DecisionTaskCompletedEventAttributes:
     execution_context: bytes = None
@@ -727,6 +832,7 @@ class DecisionTaskCompletedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DecisionTaskTimedOutEventAttributes:
     scheduled_event_id: int = None
@@ -735,6 +841,7 @@ class DecisionTaskTimedOutEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DecisionTaskFailedEventAttributes:
     scheduled_event_id: int = None
@@ -749,6 +856,7 @@ class DecisionTaskFailedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ActivityTaskScheduledEventAttributes:
     activity_id: str = None
@@ -766,6 +874,7 @@ class ActivityTaskScheduledEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ActivityTaskStartedEventAttributes:
     scheduled_event_id: int = None
@@ -775,6 +884,7 @@ class ActivityTaskStartedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ActivityTaskCompletedEventAttributes:
     result: bytes = None
@@ -784,6 +894,7 @@ class ActivityTaskCompletedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ActivityTaskFailedEventAttributes:
     reason: str = None
@@ -794,6 +905,7 @@ class ActivityTaskFailedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ActivityTaskTimedOutEventAttributes:
     details: bytes = None
@@ -803,6 +915,7 @@ class ActivityTaskTimedOutEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ActivityTaskCancelRequestedEventAttributes:
     activity_id: str = None
@@ -810,6 +923,7 @@ class ActivityTaskCancelRequestedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RequestCancelActivityTaskFailedEventAttributes:
     activity_id: str = None
@@ -818,6 +932,7 @@ class RequestCancelActivityTaskFailedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ActivityTaskCanceledEventAttributes:
     details: bytes = None
@@ -828,6 +943,7 @@ class ActivityTaskCanceledEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class TimerStartedEventAttributes:
     timer_id: str = None
@@ -836,6 +952,7 @@ class TimerStartedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class TimerFiredEventAttributes:
     timer_id: str = None
@@ -843,6 +960,7 @@ class TimerFiredEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class TimerCanceledEventAttributes:
     timer_id: str = None
@@ -852,6 +970,7 @@ class TimerCanceledEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class CancelTimerFailedEventAttributes:
     timer_id: str = None
@@ -861,6 +980,7 @@ class CancelTimerFailedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class WorkflowExecutionCancelRequestedEventAttributes:
     cause: str = None
@@ -870,6 +990,7 @@ class WorkflowExecutionCancelRequestedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class WorkflowExecutionCanceledEventAttributes:
     decision_task_completed_event_id: int = None
@@ -877,6 +998,7 @@ class WorkflowExecutionCanceledEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class MarkerRecordedEventAttributes:
     marker_name: str = None
@@ -886,6 +1008,7 @@ class MarkerRecordedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class WorkflowExecutionSignaledEventAttributes:
     signal_name: str = None
@@ -894,6 +1017,7 @@ class WorkflowExecutionSignaledEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class WorkflowExecutionTerminatedEventAttributes:
     reason: str = None
@@ -902,6 +1026,7 @@ class WorkflowExecutionTerminatedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RequestCancelExternalWorkflowExecutionInitiatedEventAttributes:
     decision_task_completed_event_id: int = None
@@ -912,6 +1037,7 @@ class RequestCancelExternalWorkflowExecutionInitiatedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RequestCancelExternalWorkflowExecutionFailedEventAttributes:
     cause: CancelExternalWorkflowExecutionFailedCause = None
@@ -923,6 +1049,7 @@ class RequestCancelExternalWorkflowExecutionFailedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ExternalWorkflowExecutionCancelRequestedEventAttributes:
     initiated_event_id: int = None
@@ -931,6 +1058,7 @@ class ExternalWorkflowExecutionCancelRequestedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class SignalExternalWorkflowExecutionInitiatedEventAttributes:
     decision_task_completed_event_id: int = None
@@ -943,6 +1071,7 @@ class SignalExternalWorkflowExecutionInitiatedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class SignalExternalWorkflowExecutionFailedEventAttributes:
     cause: SignalExternalWorkflowExecutionFailedCause = None
@@ -954,6 +1083,7 @@ class SignalExternalWorkflowExecutionFailedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ExternalWorkflowExecutionSignaledEventAttributes:
     initiated_event_id: int = None
@@ -963,6 +1093,7 @@ class ExternalWorkflowExecutionSignaledEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class UpsertWorkflowSearchAttributesEventAttributes:
     decision_task_completed_event_id: int = None
@@ -970,6 +1101,7 @@ class UpsertWorkflowSearchAttributesEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class StartChildWorkflowExecutionInitiatedEventAttributes:
     domain: str = None
@@ -991,6 +1123,7 @@ class StartChildWorkflowExecutionInitiatedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class StartChildWorkflowExecutionFailedEventAttributes:
     domain: str = None
@@ -1003,6 +1136,7 @@ class StartChildWorkflowExecutionFailedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ChildWorkflowExecutionStartedEventAttributes:
     domain: str = None
@@ -1013,6 +1147,7 @@ class ChildWorkflowExecutionStartedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ChildWorkflowExecutionCompletedEventAttributes:
     result: bytes = None
@@ -1024,6 +1159,7 @@ class ChildWorkflowExecutionCompletedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ChildWorkflowExecutionFailedEventAttributes:
     reason: str = None
@@ -1036,6 +1172,7 @@ class ChildWorkflowExecutionFailedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ChildWorkflowExecutionCanceledEventAttributes:
     details: bytes = None
@@ -1047,6 +1184,7 @@ class ChildWorkflowExecutionCanceledEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ChildWorkflowExecutionTimedOutEventAttributes:
     timeout_type: TimeoutType = None
@@ -1058,6 +1196,7 @@ class ChildWorkflowExecutionTimedOutEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ChildWorkflowExecutionTerminatedEventAttributes:
     domain: str = None
@@ -1068,6 +1207,7 @@ class ChildWorkflowExecutionTerminatedEventAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class HistoryEvent:
     event_id: int = None
@@ -1120,24 +1260,28 @@ class HistoryEvent:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class History:
     events: List[HistoryEvent] = field(default_factory=list)
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class WorkflowExecutionFilter:
     workflow_id: str = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class WorkflowTypeFilter:
     name: str = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class StartTimeFilter:
     earliest_time: int = None
@@ -1145,6 +1289,7 @@ class StartTimeFilter:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DomainInfo:
     name: str = None
@@ -1156,6 +1301,7 @@ class DomainInfo:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DomainConfiguration:
     workflow_execution_retention_period_in_days: int = None
@@ -1166,12 +1312,14 @@ class DomainConfiguration:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class BadBinaries:
     binaries: Dict[str, BadBinaryInfo] = field(default_factory=dict)
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class BadBinaryInfo:
     reason: str = None
@@ -1180,6 +1328,7 @@ class BadBinaryInfo:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class UpdateDomainInfo:
     description: str = None
@@ -1188,12 +1337,14 @@ class UpdateDomainInfo:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ClusterReplicationConfiguration:
     cluster_name: str = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DomainReplicationConfiguration:
     active_cluster_name: str = None
@@ -1201,6 +1352,7 @@ class DomainReplicationConfiguration:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RegisterDomainRequest:
     name: str = None
@@ -1218,6 +1370,7 @@ class RegisterDomainRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ListDomainsRequest:
     page_size: int = None
@@ -1225,6 +1378,7 @@ class ListDomainsRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ListDomainsResponse:
     domains: List[DescribeDomainResponse] = field(default_factory=list)
@@ -1232,6 +1386,7 @@ class ListDomainsResponse:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DescribeDomainRequest:
     name: str = None
@@ -1239,6 +1394,7 @@ class DescribeDomainRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DescribeDomainResponse:
     domain_info: DomainInfo = None
@@ -1249,6 +1405,7 @@ class DescribeDomainResponse:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class UpdateDomainRequest:
     name: str = None
@@ -1260,6 +1417,7 @@ class UpdateDomainRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class UpdateDomainResponse:
     domain_info: DomainInfo = None
@@ -1270,6 +1428,7 @@ class UpdateDomainResponse:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DeprecateDomainRequest:
     name: str = None
@@ -1277,6 +1436,7 @@ class DeprecateDomainRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class StartWorkflowExecutionRequest:
     domain: str = None
@@ -1298,12 +1458,14 @@ class StartWorkflowExecutionRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class StartWorkflowExecutionResponse:
     run_id: str = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class PollForDecisionTaskRequest:
     domain: str = None
@@ -1313,6 +1475,7 @@ class PollForDecisionTaskRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class PollForDecisionTaskResponse:
     task_token: bytes = None
@@ -1331,6 +1494,7 @@ class PollForDecisionTaskResponse:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class StickyExecutionAttributes:
     worker_task_list: TaskList = None
@@ -1338,6 +1502,7 @@ class StickyExecutionAttributes:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RespondDecisionTaskCompletedRequest:
     task_token: bytes = None
@@ -1351,12 +1516,14 @@ class RespondDecisionTaskCompletedRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RespondDecisionTaskCompletedResponse:
     decision_task: PollForDecisionTaskResponse = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RespondDecisionTaskFailedRequest:
     task_token: bytes = None
@@ -1366,6 +1533,7 @@ class RespondDecisionTaskFailedRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class PollForActivityTaskRequest:
     domain: str = None
@@ -1375,6 +1543,7 @@ class PollForActivityTaskRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class PollForActivityTaskResponse:
     task_token: bytes = None
@@ -1396,6 +1565,7 @@ class PollForActivityTaskResponse:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RecordActivityTaskHeartbeatRequest:
     task_token: bytes = None
@@ -1404,6 +1574,7 @@ class RecordActivityTaskHeartbeatRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RecordActivityTaskHeartbeatByIDRequest:
     domain: str = None
@@ -1415,12 +1586,14 @@ class RecordActivityTaskHeartbeatByIDRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RecordActivityTaskHeartbeatResponse:
     cancel_requested: bool = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RespondActivityTaskCompletedRequest:
     task_token: bytes = None
@@ -1429,6 +1602,7 @@ class RespondActivityTaskCompletedRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RespondActivityTaskFailedRequest:
     task_token: bytes = None
@@ -1438,6 +1612,7 @@ class RespondActivityTaskFailedRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RespondActivityTaskCanceledRequest:
     task_token: bytes = None
@@ -1446,6 +1621,7 @@ class RespondActivityTaskCanceledRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RespondActivityTaskCompletedByIDRequest:
     domain: str = None
@@ -1457,6 +1633,7 @@ class RespondActivityTaskCompletedByIDRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RespondActivityTaskFailedByIDRequest:
     domain: str = None
@@ -1469,6 +1646,7 @@ class RespondActivityTaskFailedByIDRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RespondActivityTaskCanceledByIDRequest:
     domain: str = None
@@ -1480,6 +1658,7 @@ class RespondActivityTaskCanceledByIDRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RequestCancelWorkflowExecutionRequest:
     domain: str = None
@@ -1489,6 +1668,7 @@ class RequestCancelWorkflowExecutionRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class GetWorkflowExecutionHistoryRequest:
     domain: str = None
@@ -1500,6 +1680,7 @@ class GetWorkflowExecutionHistoryRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class GetWorkflowExecutionHistoryResponse:
     history: History = None
@@ -1508,6 +1689,7 @@ class GetWorkflowExecutionHistoryResponse:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class SignalWorkflowExecutionRequest:
     domain: str = None
@@ -1520,6 +1702,7 @@ class SignalWorkflowExecutionRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class SignalWithStartWorkflowExecutionRequest:
     domain: str = None
@@ -1543,6 +1726,7 @@ class SignalWithStartWorkflowExecutionRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class TerminateWorkflowExecutionRequest:
     domain: str = None
@@ -1553,6 +1737,7 @@ class TerminateWorkflowExecutionRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ResetWorkflowExecutionRequest:
     domain: str = None
@@ -1563,12 +1748,14 @@ class ResetWorkflowExecutionRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ResetWorkflowExecutionResponse:
     run_id: str = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ListOpenWorkflowExecutionsRequest:
     domain: str = None
@@ -1580,6 +1767,7 @@ class ListOpenWorkflowExecutionsRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ListOpenWorkflowExecutionsResponse:
     executions: List[WorkflowExecutionInfo] = field(default_factory=list)
@@ -1587,6 +1775,7 @@ class ListOpenWorkflowExecutionsResponse:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ListClosedWorkflowExecutionsRequest:
     domain: str = None
@@ -1599,6 +1788,7 @@ class ListClosedWorkflowExecutionsRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ListClosedWorkflowExecutionsResponse:
     executions: List[WorkflowExecutionInfo] = field(default_factory=list)
@@ -1606,6 +1796,7 @@ class ListClosedWorkflowExecutionsResponse:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ListWorkflowExecutionsRequest:
     domain: str = None
@@ -1615,6 +1806,7 @@ class ListWorkflowExecutionsRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ListWorkflowExecutionsResponse:
     executions: List[WorkflowExecutionInfo] = field(default_factory=list)
@@ -1622,6 +1814,7 @@ class ListWorkflowExecutionsResponse:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class CountWorkflowExecutionsRequest:
     domain: str = None
@@ -1629,18 +1822,21 @@ class CountWorkflowExecutionsRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class CountWorkflowExecutionsResponse:
     count: int = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class GetSearchAttributesResponse:
     keys: Dict[str, IndexedValueType] = field(default_factory=dict)
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class QueryWorkflowRequest:
     domain: str = None
@@ -1650,12 +1846,14 @@ class QueryWorkflowRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class QueryRejected:
     close_status: WorkflowExecutionCloseStatus = None
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class QueryWorkflowResponse:
     query_result: bytes = None
@@ -1663,6 +1861,7 @@ class QueryWorkflowResponse:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class WorkflowQuery:
     query_type: str = None
@@ -1670,6 +1869,7 @@ class WorkflowQuery:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ResetStickyTaskListRequest:
     domain: str = None
@@ -1677,12 +1877,14 @@ class ResetStickyTaskListRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class ResetStickyTaskListResponse:
     pass
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RespondQueryTaskCompletedRequest:
     task_token: bytes = None
@@ -1692,6 +1894,7 @@ class RespondQueryTaskCompletedRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DescribeWorkflowExecutionRequest:
     domain: str = None
@@ -1699,6 +1902,7 @@ class DescribeWorkflowExecutionRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class PendingActivityInfo:
     activity_id: str = None
@@ -1716,6 +1920,7 @@ class PendingActivityInfo:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class PendingChildExecutionInfo:
     workflow_id: str = None
@@ -1725,6 +1930,7 @@ class PendingChildExecutionInfo:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DescribeWorkflowExecutionResponse:
     execution_configuration: WorkflowExecutionConfiguration = None
@@ -1734,6 +1940,7 @@ class DescribeWorkflowExecutionResponse:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DescribeTaskListRequest:
     domain: str = None
@@ -1743,6 +1950,7 @@ class DescribeTaskListRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DescribeTaskListResponse:
     pollers: List[PollerInfo] = field(default_factory=list)
@@ -1750,6 +1958,7 @@ class DescribeTaskListResponse:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class TaskListStatus:
     backlog_count_hint: int = None
@@ -1760,6 +1969,7 @@ class TaskListStatus:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class TaskIDBlock:
     start_id: int = None
@@ -1767,6 +1977,7 @@ class TaskIDBlock:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DescribeHistoryHostRequest:
     host_address: str = None
@@ -1775,6 +1986,7 @@ class DescribeHistoryHostRequest:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DescribeHistoryHostResponse:
     number_of_shards: int = None
@@ -1785,6 +1997,7 @@ class DescribeHistoryHostResponse:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class DomainCacheInfo:
     num_of_items_in_cache_by_id: int = None
@@ -1792,6 +2005,7 @@ class DomainCacheInfo:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class PollerInfo:
     last_access_time: int = None
@@ -1800,6 +2014,7 @@ class PollerInfo:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class RetryPolicy:
     initial_interval_in_seconds: int = None
@@ -1811,6 +2026,7 @@ class RetryPolicy:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class HistoryBranchRange:
     branch_id: str = None
@@ -1819,6 +2035,7 @@ class HistoryBranchRange:
     
 
 # noinspection PyPep8
+@slots
 @dataclass
 class HistoryBranch:
     tree_id: str = None
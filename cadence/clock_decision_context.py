@@ -2,11 +2,8 @@ import logging
 from dataclasses import dataclass, field
 from typing import Callable, Dict, Any, Union
 
-import json
-
 from cadence.cadence_types import StartTimerDecisionAttributes, TimerFiredEventAttributes, HistoryEvent, \
     TimerCanceledEventAttributes
-from cadence.conversions import args_to_json
 from cadence.decision_loop import ReplayDecider, DecisionContext
 from cadence.exceptions import CancellationException
 from cadence.marker import MarkerHandler, MarkerInterface, MarkerResult
@@ -86,16 +83,18 @@ class ClockDecisionContext:
             self.timer_cancelled(started_event_id, None)
 
     def get_version(self, change_id: str, min_supported: int, max_supported) -> int:
+        data_converter = self.decision_context.data_converter
+
         def func():
-            return json.dumps(max_supported)
+            return data_converter.to_payload(max_supported)
 
         result: bytes = self.version_handler.handle(change_id, func)
         if result is None:
-            result = json.dumps(DEFAULT_VERSION)
+            result = data_converter.to_payload(DEFAULT_VERSION)
             self.version_handler.set_data(change_id, result)
             self.version_handler.mark_replayed(change_id)  # so that we don't ever emit a MarkerRecorded for this
 
-        version: int = json.loads(result)
+        version: int = data_converter.from_payload(result)
         self.validate_version(change_id, version, min_supported, max_supported)
         return version
 
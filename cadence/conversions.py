@@ -1,3 +1,4 @@
+import functools
 import json
 import typing
 import inspect
@@ -33,14 +34,9 @@ def copy_thrift_to_py(thrift_object, field_type=None):
         for key, value in thrift_object.items():
             obj[key] = copy_thrift_to_py(value, field_type=field_type.__args__[1])
     else:
-        python_cls = get_python_type(type(thrift_object))
-        hints = typing.get_type_hints(python_cls)
-        obj = python_cls()
-        for thrift_field in dir(thrift_object):
-            python_field = camel_to_snake(thrift_field)
-            if python_field not in hints:
-                continue
-            field_type = hints[python_field]
+        thrift_cls = type(thrift_object)
+        obj = get_python_type(thrift_cls)()
+        for thrift_field, python_field, field_type in get_field_mapping(thrift_cls):
             value = getattr(thrift_object, thrift_field)
             python_value = copy_thrift_to_py(value, field_type)
             if python_value is not None:  # retain default value in object in the case of list and dict
@@ -101,6 +97,25 @@ def snake_to_camel(snake_str):
     return components[0] + ''.join(x.title() for x in components[1:])
 
 
+@functools.lru_cache(maxsize=None)
+def get_field_mapping(thrift_cls: type) -> typing.List[typing.Tuple[str, str, type]]:
+    """
+    (thrift field, python field, python type) of the fields of thrift_cls that exist in its python
+    type. Resolving the type hints of the generated classes is slow, they are resolved once per class.
+    """
+    hints = typing.get_type_hints(get_python_type(thrift_cls))
+    mapping = []
+    for thrift_field in dir(thrift_cls):
+        python_field = camel_to_snake(thrift_field)
+        if python_field in hints:
+            mapping.append((thrift_field, python_field, hints[python_field]))
+    return mapping
+
+
+def is_thrift_object(obj) -> bool:
+    return type(obj) is getattr(cadence_thrift.shared, type(obj).__name__, None)
+
+
 def get_thrift_type(python_cls: type) -> type:
     thrift_cls = getattr(cadence_thrift.shared, python_cls.__name__, None)
     assert thrift_cls, "Thrift class not found: " + python_cls.__name__
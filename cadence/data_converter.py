@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+import pickle
+from typing import List, Optional, Sequence
+
+
+class DataConverter:
+    """
+    Converts workflow and activity inputs and results, signals, queries and version markers to the
+    payload bytes sent to the server and stored in history.
+
+    Workers and clients talking to the same workflows must use the same converter: payloads already
+    in history are not converted when it changes. The JSON default is understood by the Java and Go
+    clients.
+    """
+
+    def to_payload(self, value: object) -> bytes:
+        raise NotImplementedError()
+
+    def from_payload(self, payload: bytes) -> object:
+        raise NotImplementedError()
+
+    def args_to_payload(self, args: Optional[Sequence]) -> bytes:
+        # A single argument is not wrapped in a list, see conversions.args_to_json
+        if not args:
+            return self.to_payload(None)
+        elif len(args) == 1:
+            return self.to_payload(args[0])
+        else:
+            return self.to_payload(list(args))
+
+    def payload_to_args(self, payload: bytes) -> List:
+        parsed = self.from_payload(payload)
+        if parsed is None:
+            return []
+        elif isinstance(parsed, list):
+            return parsed
+        else:
+            return [parsed]
+
+
+class JSONDataConverter(DataConverter):
+
+    def to_payload(self, value: object) -> bytes:
+        return json.dumps(value).encode("utf-8")
+
+    def from_payload(self, payload: bytes) -> object:
+        if not payload:
+            return None
+        return json.loads(payload)
+
+
+class OrjsonDataConverter(DataConverter):
+    """
+    JSON encoded with orjson (pip install orjson), several times faster than the json module and
+    interoperable with JSONDataConverter. Unlike json.dumps, orjson rejects integers wider than 64 bits.
+    """
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError as ex:
+            raise ImportError("OrjsonDataConverter requires orjson: pip install orjson") from ex
+        self.orjson = orjson
+
+    def to_payload(self, value: object) -> bytes:
+        return self.orjson.dumps(value)
+
+    def from_payload(self, payload: bytes) -> object:
+        if not payload:
+            return None
+        return self.orjson.loads(payload)
+
+
+class MsgpackDataConverter(DataConverter):
+    """
+    MessagePack (pip install msgpack): smaller payloads and supports bytes values, but payloads are
+    not readable in the Cadence UI or by clients in other languages.
+    """
+
+    def __init__(self):
+        try:
+            import msgpack
+        except ImportError as ex:
+            raise ImportError("MsgpackDataConverter requires msgpack: pip install msgpack") from ex
+        self.msgpack = msgpack
+
+    def to_payload(self, value: object) -> bytes:
+        return self.msgpack.packb(value, use_bin_type=True)
+
+    def from_payload(self, payload: bytes) -> object:
+        if not payload:
+            return None
+        return self.msgpack.unpackb(payload, raw=False)
+
+
+class PickleDataConverter(DataConverter):
+    """
+    Supports any picklable Python object. Only use it when every worker and client is trusted:
+    unpickling a payload can execute arbitrary code.
+    """
+
+    def __init__(self, protocol: int = pickle.DEFAULT_PROTOCOL):
+        self.protocol = protocol
+
+    def to_payload(self, value: object) -> bytes:
+        return pickle.dumps(value, protocol=self.protocol)
+
+    def from_payload(self, payload: bytes) -> object:
+        if not payload:
+            return None
+        return pickle.loads(payload)
+
+
+DEFAULT_DATA_CONVERTER = JSONDataConverter()
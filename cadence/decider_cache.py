@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import logging
+import threading
+from asyncio import AbstractEventLoop
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple, TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+if TYPE_CHECKING:
+    from cadence.decision_loop import ReplayDecider
+
+logger = logging.getLogger(__name__)
+
+# (workflow_id, run_id)
+RunKey = Tuple[str, str]
+
+
+@dataclass
+class CachedDecider:
+    decider: ReplayDecider
+    # Id of the last event the decider processed: DecisionTaskStarted of its last decision task
+    last_event_id: int
+
+
+class DeciderCache:
+    """
+    LRU cache of the deciders of the last decision task of each run, kept after the decision task
+    completes so that queries can run against the workflow instance without replaying its history.
+
+    Deciders run their workflow code on the event loop of the thread that created them, and that
+    loop is shared by every decider the thread creates. Code running a decider must hold
+    loop_lock(decider.event_loop.event_loop).
+    """
+
+    def __init__(self, max_size: int):
+        assert max_size > 0
+        self.max_size = max_size
+        self.deciders: OrderedDict[RunKey, CachedDecider] = OrderedDict()
+        self.loop_locks: WeakKeyDictionary[AbstractEventLoop, threading.Lock] = WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def loop_lock(self, loop: AbstractEventLoop) -> threading.Lock:
+        with self.lock:
+            lock = self.loop_locks.get(loop)
+            if not lock:
+                lock = self.loop_locks[loop] = threading.Lock()
+            return lock
+
+    def get(self, key: RunKey) -> Optional[CachedDecider]:
+        with self.lock:
+            cached = self.deciders.get(key)
+            if cached:
+                self.deciders.move_to_end(key)
+            return cached
+
+    def put(self, key: RunKey, decider: ReplayDecider, last_event_id: int):
+        evicted = []
+        with self.lock:
+            previous = self.deciders.pop(key, None)
+            if previous:
+                evicted.append(previous.decider)
+            self.deciders[key] = CachedDecider(decider, last_event_id)
+            while len(self.deciders) > self.max_size:
+                _, cached = self.deciders.popitem(last=False)
+                evicted.append(cached.decider)
+        for decider in evicted:
+            destroy(decider)
+
+    def record(self, hit: bool):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def size(self) -> int:
+        with self.lock:
+            return len(self.deciders)
+
+
+def destroy(decider: ReplayDecider):
+    # The loop may be running in another thread, the workflow coroutines are cancelled the next
+    # time it runs
+    try:
+        decider.event_loop.event_loop.call_soon_threadsafe(decider.destroy)
+    except RuntimeError:
+        # Loop closed with its thread
+        pass
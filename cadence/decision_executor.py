@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import threading
+from collections import deque
+from concurrent.futures.thread import ThreadPoolExecutor
+from typing import Callable, Dict, Tuple, Deque
+
+from cadence.cadence_types import PollForDecisionTaskResponse
+
+logger = logging.getLogger(__name__)
+
+
+def init_event_loop():
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
+class DecisionTaskExecutor:
+    """
+    Runs up to `max_concurrent` decision tasks at the same time. Decision tasks belonging to the same
+    workflow run are never executed concurrently, they are queued and executed in the order they
+    were submitted.
+
+    The poller is expected to call acquire_slot() before polling and submit() (or release_slot() if
+    nothing was polled) afterwards, this caps the number of decision tasks held by the worker.
+    """
+
+    def __init__(self, handler: Callable[[PollForDecisionTaskResponse], None], max_concurrent: int):
+        self.handler = handler
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="decision-task",
+                                           initializer=init_event_loop)
+        self.lock = threading.Lock()
+        self.pending: Dict[Tuple[str, str], Deque[PollForDecisionTaskResponse]] = {}
+
+    def acquire_slot(self, timeout: float = None) -> bool:
+        return self.slots.acquire(timeout=timeout)
+
+    def release_slot(self):
+        self.slots.release()
+
+    def submit(self, decision_task: PollForDecisionTaskResponse):
+        execution = decision_task.workflow_execution
+        key = (execution.workflow_id, execution.run_id)
+        with self.lock:
+            if key in self.pending:
+                self.pending[key].append(decision_task)
+                return
+            self.pending[key] = deque()
+        self.executor.submit(self.run, key, decision_task)
+
+    def run(self, key: Tuple[str, str], decision_task: PollForDecisionTaskResponse):
+        while decision_task:
+            try:
+                self.handler(decision_task)
+            except Exception as ex:
+                logger.error("Decision task for %s failed: %s", key, ex, exc_info=1)
+            finally:
+                self.release_slot()
+            with self.lock:
+                queued = self.pending[key]
+                if queued:
+                    decision_task = queued.popleft()
+                else:
+                    del self.pending[key]
+                    decision_task = None
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
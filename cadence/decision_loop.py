@@ -2,46 +2,67 @@ from __future__ import annotations
 
 import asyncio
 import contextvars
-import datetime
-import json
 import socket
 import uuid
 import random
 import logging
 import threading
+import time
 from asyncio import CancelledError
 from asyncio.events import AbstractEventLoop
 from asyncio.futures import Future
 from asyncio.tasks import Task
 from collections import OrderedDict
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Dict, Optional, Any, Callable
+from typing import List, Dict, Optional, Any, Callable, Awaitable
 
 from more_itertools import peekable
 
 from cadence.activity_method import ExecuteActivityParameters
+from cadence.backoff import Backoff
 from cadence.cadence_types import PollForDecisionTaskRequest, TaskList, PollForDecisionTaskResponse, \
     RespondDecisionTaskCompletedRequest, \
     CompleteWorkflowExecutionDecisionAttributes, Decision, DecisionType, RespondDecisionTaskCompletedResponse, \
     HistoryEvent, EventType, WorkflowType, ScheduleActivityTaskDecisionAttributes, \
     CancelWorkflowExecutionDecisionAttributes, StartTimerDecisionAttributes, TimerFiredEventAttributes, \
     FailWorkflowExecutionDecisionAttributes, RecordMarkerDecisionAttributes, Header, WorkflowQuery, \
-    RespondQueryTaskCompletedRequest, QueryTaskCompletedType, QueryWorkflowResponse, DecisionTaskFailedCause
-from cadence.conversions import json_to_args, args_to_json
+    RespondQueryTaskCompletedRequest, QueryTaskCompletedType, QueryWorkflowResponse, DecisionTaskFailedCause, \
+    TaskListType, GetWorkflowExecutionHistoryRequest, History
+from cadence.data_converter import DataConverter, DEFAULT_DATA_CONVERTER
+from cadence.decision_executor import DecisionTaskExecutor
+from cadence.conversions import copy_py_to_thrift, copy_thrift_to_py
+from cadence.decision_profiler import DecisionProfile, PHASE_HISTORY, PHASE_EVENT_LOOP, PHASE_DECISIONS, \
+    PHASE_EVENT_HANDLERS, PHASE_RESPOND, PHASE_SERIALIZE, PHASE_CONVERT_TASK
+from cadence.decider_cache import DeciderCache
 from cadence.decisions import DecisionId, DecisionTarget
+from cadence.interceptors import WorkflowInvocation
 from cadence.exception_handling import serialize_exception, deserialize_exception
+from cadence.metrics import DECISION_POLL_LATENCY, DECISION_POLL_FAILED, DECISION_POLL_NO_TASK, DECISION_POLL_SUCCEED, \
+    DECISION_TASK_REPLAY_LATENCY, DECISION_TASK_EVENTS, DECISION_TASK_DECISIONS, DECISION_TASK_FAILED, \
+    QUERY_TASK_LATENCY, DECIDER_CACHE_HIT, DECIDER_CACHE_MISS, DECIDER_CACHE_SIZE, QUERY_RESULT_CACHE_HIT, \
+    QUERY_RESULT_CACHE_MISS
+from cadence.pagination import iterate_pages, check_response
+from cadence.poller_autoscaler import PollerAutoScaler, TaskListBacklogSampler, create_autoscaler
+from cadence.query_cache import QueryResultCache, QueryKey
 from cadence.exceptions import WorkflowTypeNotFound, NonDeterministicWorkflowException, ActivityTaskFailedException, \
     ActivityTaskTimeoutException, SignalNotFound, ActivityFailureException, QueryNotFound, QueryDidNotComplete
 from cadence.state_machines import ActivityDecisionStateMachine, DecisionStateMachine, CompleteWorkflowStateMachine, \
     TimerDecisionStateMachine, MarkerDecisionStateMachine
 from cadence.tchannel import TChannelException
+from cadence.tracing import SpanContext, Tracer, SPAN_KIND_CONSUMER
 from cadence.worker import Worker, StopRequestedException
 from cadence.workflow import QueryMethod
-from cadence.workflowservice import WorkflowService
+from cadence.workflowservice import WorkflowService, WorkflowServicePool
 
 logger = logging.getLogger(__name__)
 
+# How long the poller waits for a free decision task slot (or to be activated by the poller autoscaler)
+# before checking whether stop was requested
+SLOT_WAIT_SECONDS = 1
+HISTORY_PAGE_SIZE = 1000
+
 
 def is_decision_event(event: HistoryEvent) -> bool:
     decision_event_types = (EventType.ActivityTaskScheduled,
@@ -61,6 +82,32 @@ def is_decision_event(event: HistoryEvent) -> bool:
     return event.event_type in decision_event_types
 
 
+def is_decider_current(last_event_id: int, events: List[HistoryEvent]) -> bool:
+    """
+    Whether a decider that processed the events up to last_event_id has the state it would have
+    after replaying `events`: every event that followed was recorded for the decision task itself
+    or for the decisions it made.
+    """
+    if not events or events[-1].event_id < last_event_id:
+        return False
+    for event in reversed(events):
+        if event.event_id <= last_event_id:
+            return True
+        if not is_decision_event(event) and event.event_type not in (EventType.DecisionTaskCompleted,
+                                                                     EventType.DecisionTaskScheduled,
+                                                                     EventType.DecisionTaskStarted):
+            return False
+    return True
+
+
+def get_current_event_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_event_loop()
+    except RuntimeError:
+        # Thread that hasn't set one
+        return None
+
+
 def nano_to_milli(nano):
     return nano/(1000 * 1000)
 
@@ -246,7 +293,12 @@ class WorkflowMethodTask(ITask):
         self.status = Status.RUNNING
         try:
             logger.info(f"Invoking workflow {self.workflow_type.name}({str(self.workflow_input)[1:-1]})")
-            self.ret_value = await workflow_proc(self.workflow_instance, *self.workflow_input)
+            chain = self.worker.interceptor_chains.workflow
+            if chain:
+                self.ret_value = await chain(WorkflowInvocation(self.workflow_type.name, self.workflow_instance,
+                                                                workflow_proc, self.workflow_input))
+            else:
+                self.ret_value = await workflow_proc(self.workflow_instance, *self.workflow_input)
             logger.info(
                 f"Workflow {self.workflow_type.name}({str(self.workflow_input)[1:-1]}) returned {self.ret_value}")
             self.decider.complete_workflow_execution(self.ret_value)
@@ -271,6 +323,7 @@ class QueryMethodTask(ITask):
     query_input: List = None
     exception_thrown: BaseException = None
     ret_value: object = None
+    interceptor_chain: Callable[[WorkflowInvocation], Awaitable] = None
 
     def start(self):
         logger.debug(f"[query-task-{self.task_id}-{self.query_name}] Created")
@@ -291,7 +344,12 @@ class QueryMethodTask(ITask):
 
         try:
             logger.info(f"Invoking query {self.query_name}({str(self.query_input)[1:-1]})")
-            self.ret_value = await query_proc(self.workflow_instance, *self.query_input)
+            chain = self.interceptor_chain
+            if chain:
+                self.ret_value = await chain(WorkflowInvocation(self.query_name, self.workflow_instance, query_proc,
+                                                                self.query_input))
+            else:
+                self.ret_value = await query_proc(self.workflow_instance, *self.query_input)
             logger.info(
                 f"Query {self.query_name}({str(self.query_input)[1:-1]}) returned {self.ret_value}")
         except CancelledError:
@@ -312,6 +370,7 @@ class SignalMethodTask(ITask):
     signal_input: List = None
     exception_thrown: BaseException = None
     ret_value: object = None
+    interceptor_chain: Callable[[WorkflowInvocation], Awaitable] = None
 
     def start(self):
         logger.debug(f"[signal-task-{self.task_id}-{self.signal_name}] Created")
@@ -332,7 +391,12 @@ class SignalMethodTask(ITask):
 
         try:
             logger.info(f"Invoking signal {self.signal_name}({str(self.signal_input)[1:-1]})")
-            self.ret_value = await signal_proc(self.workflow_instance, *self.signal_input)
+            chain = self.interceptor_chain
+            if chain:
+                self.ret_value = await chain(WorkflowInvocation(self.signal_name, self.workflow_instance, signal_proc,
+                                                                self.signal_input))
+            else:
+                self.ret_value = await signal_proc(self.workflow_instance, *self.signal_input)
             logger.info(
                 f"Signal {self.signal_name}({str(self.signal_input)[1:-1]}) returned {self.ret_value}")
             self.decider.complete_signal_execution(self)
@@ -367,6 +431,7 @@ class DecisionContext:
     scheduled_activities: Dict[int, Future[bytes]] = field(default_factory=dict)
     workflow_clock: ClockDecisionContext = None
     current_run_id: str = None
+    data_converter: DataConverter = DEFAULT_DATA_CONVERTER
 
     def __post_init__(self):
         if not self.workflow_clock:
@@ -390,6 +455,8 @@ class DecisionContext:
         if parameters.retry_parameters:
             attr.retry_policy = parameters.retry_parameters.to_retry_policy()
 
+        attr.header = self.decider.worker.options.tracer.inject(attr.header, self.decider.span_context)
+
         scheduled_event_id = self.decider.schedule_activity_task(schedule=attr)
         future = self.decider.event_loop.create_future()
         self.scheduled_activities[scheduled_event_id] = future
@@ -408,8 +475,7 @@ class DecisionContext:
                                                         serialize_exception(ex))
             raise activity_failure
         assert future.done()
-        raw_bytes = future.result()
-        return json.loads(str(raw_bytes, "utf-8"))
+        return self.data_converter.from_payload(future.result())
 
     async def schedule_timer(self, seconds: int):
         future = self.decider.event_loop.create_future()
@@ -540,17 +606,34 @@ class ReplayDecider:
     workflow_id: str = None
 
     activity_id_to_scheduled_event_id: Dict[str, int] = field(default_factory=dict)
+    # Set when WorkerOptions.decision_profiler is enabled
+    profile: DecisionProfile = None
+    # Span of the decision task, propagated to the activities it schedules
+    span_context: SpanContext = None
+    data_converter: DataConverter = DEFAULT_DATA_CONVERTER
 
     def __post_init__(self):
-        self.decision_context = DecisionContext(decider=self)
+        self.decision_context = DecisionContext(decider=self, data_converter=self.data_converter)
 
     def decide(self, events: List[HistoryEvent]):
+        if self.profile:
+            return self.decide_profiled(events)
         helper = HistoryHelper(events)
         while helper.has_next():
             decision_events = helper.next()
             self.process_decision_events(decision_events)
         return self.get_decisions()
 
+    def decide_profiled(self, events: List[HistoryEvent]):
+        profile = self.profile
+        helper = HistoryHelper(events)
+        while helper.has_next():
+            with profile.phase(PHASE_HISTORY):
+                decision_events = helper.next()
+            self.process_decision_events(decision_events)
+        with profile.phase(PHASE_DECISIONS):
+            return self.get_decisions()
+
     def process_decision_events(self, decision_events: DecisionEvents):
         self.decision_context.set_replaying(decision_events.replay)
         self.decision_context.set_replay_current_time_milliseconds(decision_events.replay_current_time_milliseconds)
@@ -564,7 +647,7 @@ class ReplayDecider:
         if self.completed:
             return
         self.unblock_all()
-        self.event_loop.run_event_loop_once()
+        self.run_event_loop_once()
         if decision_events.replay:
             self.notify_decision_sent()
         for event in decision_events.decision_events:
@@ -574,11 +657,30 @@ class ReplayDecider:
         for t in self.tasks:
             t.unblock()
 
+    def run_event_loop_once(self):
+        if self.profile:
+            with self.profile.phase(PHASE_EVENT_LOOP):
+                self.event_loop.run_event_loop_once()
+        else:
+            self.event_loop.run_event_loop_once()
+
     def process_event(self, event: HistoryEvent):
         event_handler = event_handlers.get(event.event_type)
         if not event_handler:
             raise Exception(f"No event handler for event type {event.event_type.name}")
-        event_handler(self, event)
+        if not self.profile:
+            event_handler(self, event)
+            return
+        start = time.perf_counter()
+        event_loop_seconds = self.profile.phases.get(PHASE_EVENT_LOOP, 0)
+        try:
+            with self.profile.phase(PHASE_EVENT_HANDLERS):
+                event_handler(self, event)
+        finally:
+            # Workflow code the handler runs (e.g. the workflow method started by WorkflowExecutionStarted)
+            # counts for the event loop, not for the event
+            seconds = time.perf_counter() - start - (self.profile.phases.get(PHASE_EVENT_LOOP, 0) - event_loop_seconds)
+            self.profile.record_event(EventType(event.event_type).name, seconds)
 
     def handle_workflow_execution_started(self, event: HistoryEvent):
         start_event_attributes = event.workflow_execution_started_event_attributes
@@ -586,10 +688,10 @@ class ReplayDecider:
         if start_event_attributes.input is None or start_event_attributes.input == b'':
             workflow_input = []
         else:
-            workflow_input = json_to_args(start_event_attributes.input)
+            workflow_input = self.data_converter.payload_to_args(start_event_attributes.input)
         self.workflow_task = WorkflowMethodTask(task_id=self.execution_id, workflow_input=workflow_input,
                                                 worker=self.worker, workflow_type=self.workflow_type, decider=self)
-        self.event_loop.run_event_loop_once()
+        self.run_event_loop_once()
         assert self.workflow_task.workflow_instance
         self.tasks.append(self.workflow_task)
 
@@ -609,7 +711,7 @@ class ReplayDecider:
         # PORT: addAllMissingVersionMarker(false, Optional.empty());
         decision = Decision()
         attr = CompleteWorkflowExecutionDecisionAttributes()
-        attr.result = json.dumps(ret_value)
+        attr.result = self.data_converter.to_payload(ret_value)
         decision.complete_workflow_execution_decision_attributes = attr
         decision.decision_type = DecisionType.CompleteWorkflowExecution
         decision_id = DecisionId(DecisionTarget.SELF, 0)
@@ -686,13 +788,14 @@ class ReplayDecider:
         if not signal_input:
             signal_input = []
         else:
-            signal_input = json_to_args(signal_input)
+            signal_input = self.data_converter.payload_to_args(signal_input)
 
         task = SignalMethodTask(task_id=self.execution_id,
                                 workflow_instance=self.workflow_task.workflow_instance,
                                 signal_name=signaled_event_attributes.signal_name,
                                 signal_input=signal_input,
-                                decider=self)
+                                decider=self,
+                                interceptor_chain=self.worker.interceptor_chains.signal)
         self.tasks.append(task)
         task.start()
 
@@ -788,12 +891,13 @@ class ReplayDecider:
         if query_args is None:
             args = []
         else:
-            args = json_to_args(query_args)
+            args = self.data_converter.payload_to_args(query_args)
         task = QueryMethodTask(task_id=self.execution_id,
                                workflow_instance=self.workflow_task.workflow_instance,
                                query_name=query.query_type,
                                query_input=args,
-                               decider=self)
+                               decider=self,
+                               interceptor_chain=self.worker.interceptor_chains.query)
         self.tasks.append(task)
         task.start()
         self.event_loop.run_event_loop_once()
@@ -837,11 +941,30 @@ event_handlers = {
 }
 
 
+def get_workflow_span_context(tracer: Tracer, decision_task: PollForDecisionTaskResponse) -> Optional[SpanContext]:
+    """
+    Span context propagated by the client in the header of StartWorkflowExecutionRequest.
+    """
+    events = decision_task.history.events
+    if not events or not events[0].workflow_execution_started_event_attributes:
+        return None
+    return tracer.extract(events[0].workflow_execution_started_event_attributes.header)
+
+
 @dataclass
 class DecisionTaskLoop:
     worker: Worker
     service: WorkflowService = None
+    pool: WorkflowServicePool = None
+    scaler: PollerAutoScaler = None
     deciders: Dict[str, ReplayDecider] = field(default_factory=dict)
+    # Set when WorkerOptions.decider_cache_size is, shared by the threads of the loop
+    decider_cache: DeciderCache = None
+    # Set when WorkerOptions.query_cache_size is
+    query_cache: QueryResultCache = None
+    # Seconds the conversion of polled tasks took by task token, while WorkerOptions.decision_profiler
+    # is set, until the task is profiled
+    task_conversion_seconds: Dict[bytes, float] = field(default_factory=dict)
 
     def __post_init__(self):
         pass
@@ -851,33 +974,26 @@ class DecisionTaskLoop:
         thread.start()
 
     def run(self):
+        executor: Optional[DecisionTaskExecutor] = None
         try:
             logger.info(f"Decision task worker started: {WorkflowService.get_identity()}")
             event_loop = asyncio.new_event_loop()
             asyncio.set_event_loop(event_loop)
-            self.service = WorkflowService.create(self.worker.host, self.worker.port, timeout=self.worker.get_timeout())
-            self.worker.manage_service(self.service)
-            while True:
-                try:
-                    if self.worker.is_stop_requested():
-                        return
-                    self.service.set_next_timeout_cb(self.worker.raise_if_stop_requested)
-                    decision_task: PollForDecisionTaskResponse = self.poll()
-                    if not decision_task:
-                        continue
-                    if decision_task.query:
-                        try:
-                            result = self.process_query(decision_task)
-                            self.respond_query(decision_task.task_token, result, None)
-                        except Exception as ex:
-                            logger.error("Error")
-                            self.respond_query(decision_task.task_token, None, serialize_exception(ex))
-                    else:
-                        decisions = self.process_task(decision_task)
-                        self.respond_decisions(decision_task.task_token, decisions)
-                except StopRequestedException:
-                    return
+            self.service = self.worker.create_service()
+            executor = self.create_executor()
+            self.scaler = create_autoscaler(self.worker.options.decision_pollers_min,
+                                            self.worker.options.decision_pollers_max)
+            pollers = []
+            for poller_index in range(1, self.scaler.max_pollers if self.scaler else 1):
+                thread = threading.Thread(target=self.run_poller, args=(poller_index, executor))
+                thread.start()
+                pollers.append(thread)
+            self.poll_loop(self.service, executor, 0)
+            for thread in pollers:
+                thread.join()
         finally:
+            if executor:
+                executor.shutdown()
         # noinspection PyPep8,PyBroadException
             try:
                 self.service.close()
@@ -885,51 +1001,296 @@ class DecisionTaskLoop:
                 logger.warning("service.close() failed", exc_info=1)
             self.worker.notify_thread_stopped()
 
-    def poll(self) -> Optional[PollForDecisionTaskResponse]:
+    def run_poller(self, poller_index: int, executor: Optional[DecisionTaskExecutor]):
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        service = self.worker.create_service()
         try:
-            polling_start = datetime.datetime.now()
+            self.poll_loop(service, executor, poller_index)
+        finally:
+            # noinspection PyBroadException
+            try:
+                service.close()
+            except:
+                logger.warning("service.close() failed", exc_info=1)
+
+    def poll_loop(self, service: WorkflowService, executor: Optional[DecisionTaskExecutor], poller_index: int):
+        sampler = self.create_backlog_sampler() if poller_index == 0 else None
+        backoff = self.worker.create_poll_backoff()
+        while True:
+            try:
+                if self.worker.is_stop_requested():
+                    return
+                if self.scaler and not self.scaler.wait_until_active(poller_index, timeout=SLOT_WAIT_SECONDS):
+                    continue
+                if executor and not executor.acquire_slot(timeout=SLOT_WAIT_SECONDS):
+                    continue
+                try:
+                    backoff.wait(self.worker.interruptible_sleep)
+                except StopRequestedException:
+                    if executor:
+                        executor.release_slot()
+                    raise
+                if sampler:
+                    sampler.maybe_sample(service)
+                service.set_next_timeout_cb(self.worker.raise_if_stop_requested)
+                decision_task: PollForDecisionTaskResponse = self.poll(service, backoff)
+                if executor:
+                    if decision_task:
+                        executor.submit(decision_task)
+                    else:
+                        executor.release_slot()
+                    continue
+                while decision_task:
+                    decision_task = self.handle_decision_task(decision_task, service)
+            except StopRequestedException:
+                return
+
+    def create_backlog_sampler(self) -> Optional[TaskListBacklogSampler]:
+        interval = self.worker.options.poller_backlog_sample_interval_seconds
+        if not self.scaler or not interval:
+            return None
+        return TaskListBacklogSampler(self.scaler, self.worker.domain, self.worker.task_list, TaskListType.Decision,
+                                      interval)
+
+    def create_executor(self) -> Optional[DecisionTaskExecutor]:
+        max_concurrent = self.worker.options.max_concurrent_decision_tasks
+        if max_concurrent <= 1:
+            return None
+        self.pool = self.worker.create_service_pool(max_concurrent)
+        return DecisionTaskExecutor(self.execute_decision_task, max_concurrent)
+
+    def execute_decision_task(self, decision_task: PollForDecisionTaskResponse):
+        with self.pool.acquire() as service:
+            while decision_task:
+                decision_task = self.handle_decision_task(decision_task, service)
+
+    def handle_decision_task(self, decision_task: PollForDecisionTaskResponse, service: WorkflowService = None) -> \
+            Optional[PollForDecisionTaskResponse]:
+        """
+        Returns the next decision task if the server handed one back inline in
+        RespondDecisionTaskCompletedResponse.
+        """
+        self.load_full_history(decision_task, service)
+        if decision_task.query:
+            try:
+                result = self.process_query(decision_task)
+                self.respond_query(decision_task.task_token, result, None, service=service)
+            except Exception as ex:
+                logger.error("Error")
+                self.respond_query(decision_task.task_token, None, serialize_exception(ex), service=service)
+            return None
+        profiler = self.worker.options.decision_profiler
+        if not profiler:
+            return self.complete_decision_task(decision_task, service)
+        execution = decision_task.workflow_execution
+        conversion_seconds = self.task_conversion_seconds.pop(decision_task.task_token, None)
+        phases = {PHASE_CONVERT_TASK: conversion_seconds} if conversion_seconds is not None else None
+        with profiler.profile(decision_task.workflow_type.name, execution.workflow_id, execution.run_id,
+                              phases) as profile:
+            return self.complete_decision_task(decision_task, service, profile)
+
+    def load_full_history(self, decision_task: PollForDecisionTaskResponse, service: WorkflowService = None):
+        """
+        Replaces a partial history with the full one. Decision tasks returned inline by
+        RespondDecisionTaskCompleted are sticky: they only carry the events added since the previous
+        decision task, which a new ReplayDecider can't replay.
+        """
+        events = decision_task.history.events if decision_task.history else []
+        if events and events[0].event_id == 1:
+            return
+        service = service if service else self.service
+
+        def fetch_page(next_page_token):
+            request = GetWorkflowExecutionHistoryRequest(domain=self.worker.domain,
+                                                         execution=decision_task.workflow_execution,
+                                                         maximum_page_size=HISTORY_PAGE_SIZE,
+                                                         next_page_token=next_page_token)
+            response = check_response(*service.get_workflow_execution_history(request))
+            return response.history.events, response.next_page_token
+
+        started_event_id = decision_task.started_event_id
+        decision_task.history = History(events=[e for e in iterate_pages(fetch_page, prefetch=False)
+                                                if not started_event_id or e.event_id <= started_event_id])
+
+    def complete_decision_task(self, decision_task: PollForDecisionTaskResponse, service: WorkflowService = None,
+                               profile: DecisionProfile = None) -> Optional[PollForDecisionTaskResponse]:
+        metrics_scope = self.worker.metrics_scope
+        tracer = self.worker.options.tracer
+        workflow_type = decision_task.workflow_type.name
+        tags = {"workflow_type": workflow_type}
+        execution = decision_task.workflow_execution
+        with tracer.span("DecisionTask:" + workflow_type, parent=get_workflow_span_context(tracer, decision_task),
+                         kind=SPAN_KIND_CONSUMER,
+                         attributes={"workflow_id": execution.workflow_id, "run_id": execution.run_id}) as span:
+            start = time.perf_counter()
+            try:
+                decisions = self.process_task(decision_task, profile, span.context if span else None)
+            except Exception:
+                metrics_scope.counter(DECISION_TASK_FAILED, tags=tags)
+                raise
+            metrics_scope.histogram(DECISION_TASK_REPLAY_LATENCY, time.perf_counter() - start, tags=tags)
+            metrics_scope.counter(DECISION_TASK_EVENTS, len(decision_task.history.events), tags=tags)
+            metrics_scope.counter(DECISION_TASK_DECISIONS, len(decisions), tags=tags)
+            return self.respond_decisions(decision_task.task_token, decisions, service=service, profile=profile)
+
+    def poll(self, service: WorkflowService = None, backoff: Backoff = None) -> Optional[PollForDecisionTaskResponse]:
+        service = service if service else self.service
+        metrics_scope = self.worker.metrics_scope
+        try:
+            polling_start = time.perf_counter()
             poll_decision_request = PollForDecisionTaskRequest()
             poll_decision_request.identity = WorkflowService.get_identity()
             poll_decision_request.task_list = TaskList()
             poll_decision_request.task_list.name = self.worker.task_list
             poll_decision_request.domain = self.worker.domain
+            profiling = self.worker.options.decision_profiler is not None
             # noinspection PyUnusedLocal
             task: PollForDecisionTaskResponse
-            task, err = self.service.poll_for_decision_task(poll_decision_request)
-            polling_end = datetime.datetime.now()
-            logger.debug("PollForDecisionTask: %dms", (polling_end - polling_start).total_seconds() * 1000)
+            task, err = service.poll_for_decision_task(poll_decision_request, convert=not profiling)
+            polling_latency = time.perf_counter() - polling_start
+            metrics_scope.histogram(DECISION_POLL_LATENCY, polling_latency)
+            logger.debug("PollForDecisionTask: %dms", polling_latency * 1000)
+            if profiling and task:
+                conversion_start = time.perf_counter()
+                task = copy_thrift_to_py(task)
+                if task.task_token:
+                    self.task_conversion_seconds[task.task_token] = time.perf_counter() - conversion_start
         except TChannelException as ex:
             logger.error("PollForDecisionTask error: %s", ex)
+            metrics_scope.counter(DECISION_POLL_FAILED)
+            if backoff:
+                backoff.failure()
             return None
         if err:
             logger.error("PollForDecisionTask failed: %s", err)
+            metrics_scope.counter(DECISION_POLL_FAILED)
+            if backoff:
+                backoff.failure()
             return None
+        if backoff:
+            backoff.success()
+        if self.scaler:
+            self.scaler.record_poll(bool(task.task_token), task.backlog_count_hint)
         if not task.task_token:
             logger.debug("PollForActivityTask has no task token (expected): %s", task)
+            metrics_scope.counter(DECISION_POLL_NO_TASK)
             return None
+        metrics_scope.counter(DECISION_POLL_SUCCEED)
         return task
 
-    def process_task(self, decision_task: PollForDecisionTaskResponse) -> List[Decision]:
+    def process_task(self, decision_task: PollForDecisionTaskResponse, profile: DecisionProfile = None,
+                     span_context: SpanContext = None) -> List[Decision]:
         execution_id = str(decision_task.workflow_execution)
-        decider = ReplayDecider(execution_id, decision_task.workflow_type, self.worker,
-                                workflow_id=decision_task.workflow_execution.workflow_id)
-        decisions: List[Decision] = decider.decide(decision_task.history.events)
-        decider.destroy()
+        events = decision_task.history.events
+        with self.loop_lock():
+            decider = ReplayDecider(execution_id, decision_task.workflow_type, self.worker,
+                                    workflow_id=decision_task.workflow_execution.workflow_id, profile=profile,
+                                    span_context=span_context, data_converter=self.worker.data_converter)
+            if profile:
+                previous_started_event_id = decision_task.previous_started_event_id or 0
+                profile.replayed_events = sum(1 for e in events if e.event_id <= previous_started_event_id)
+                profile.new_events = len(events) - profile.replayed_events
+            decisions: List[Decision] = decider.decide(events)
+        # A decider that didn't replay from the first event (e.g. a sticky task with partial history)
+        # doesn't have the state of the workflow, queries can't use it
+        if self.decider_cache and events and events[0].event_id == 1:
+            execution = decision_task.workflow_execution
+            decider.profile = None
+            self.decider_cache.put((execution.workflow_id, execution.run_id), decider, events[-1].event_id)
+            self.worker.metrics_scope.gauge(DECIDER_CACHE_SIZE, self.decider_cache.size())
+        else:
+            decider.destroy()
         return decisions
 
     def process_query(self, decision_task: PollForDecisionTaskResponse) -> bytes:
-        execution_id = str(decision_task.workflow_execution)
-        decider = ReplayDecider(execution_id, decision_task.workflow_type, self.worker,
-                                workflow_id=decision_task.workflow_execution.workflow_id)
-        decider.decide(decision_task.history.events)
-        try:
-            result = decider.query(decision_task, decision_task.query)
-            return json.dumps(result)
-        finally:
-            decider.destroy()
+        """
+        Answers the query with the result memoized for the same history position when there is one,
+        otherwise runs it (see run_query).
+        """
+        key = self.get_query_key(decision_task)
+        if not key:
+            return self.run_query(decision_task)
+        tags = {"workflow_type": decision_task.workflow_type.name}
+        result = self.query_cache.get(key)
+        if result is not None:
+            self.worker.metrics_scope.counter(QUERY_RESULT_CACHE_HIT, tags=tags)
+            return result
+        self.worker.metrics_scope.counter(QUERY_RESULT_CACHE_MISS, tags=tags)
+        result = self.run_query(decision_task)
+        self.query_cache.put(key, result)
+        return result
 
-    def respond_query(self, task_token: bytes, result: bytes = None, error_message: str = None):
-        service = self.service
+    def get_query_key(self, decision_task: PollForDecisionTaskResponse) -> Optional[QueryKey]:
+        if not self.query_cache or not decision_task.history.events:
+            return None
+        query = decision_task.query
+        workflow_class, _ = self.worker.workflow_methods.get(decision_task.workflow_type.name, (None, None))
+        if query.query_type in getattr(workflow_class, "_non_memoized_query_methods", ()):
+            return None
+        return (decision_task.workflow_execution.run_id, decision_task.history.events[-1].event_id,
+                query.query_type, query.query_args)
+
+    def run_query(self, decision_task: PollForDecisionTaskResponse) -> bytes:
+        """
+        Runs the query on the cached decider of the run when its state is current (see
+        is_decider_current), otherwise by replaying the history of the query task.
+        """
+        cached = None
+        if self.decider_cache:
+            execution = decision_task.workflow_execution
+            cached = self.decider_cache.get((execution.workflow_id, execution.run_id))
+            if cached and not is_decider_current(cached.last_event_id, decision_task.history.events):
+                cached = None
+            self.decider_cache.record(bool(cached))
+        metrics_scope = self.worker.metrics_scope
+        tags = {"workflow_type": decision_task.workflow_type.name}
+        if self.decider_cache:
+            metrics_scope.counter(DECIDER_CACHE_HIT if cached else DECIDER_CACHE_MISS, tags=tags)
+        with metrics_scope.timer(QUERY_TASK_LATENCY, tags={**tags, "cached": "true" if cached else "false"}):
+            if cached:
+                return self.query_cached_decider(cached.decider, decision_task)
+            return self.replay_query(decision_task)
+
+    def replay_query(self, decision_task: PollForDecisionTaskResponse) -> bytes:
+        execution_id = str(decision_task.workflow_execution)
+        with self.loop_lock():
+            decider = ReplayDecider(execution_id, decision_task.workflow_type, self.worker,
+                                    workflow_id=decision_task.workflow_execution.workflow_id,
+                                    data_converter=self.worker.data_converter)
+            decider.decide(decision_task.history.events)
+            try:
+                result = decider.query(decision_task, decision_task.query)
+                return decider.data_converter.to_payload(result)
+            finally:
+                decider.destroy()
+
+    def query_cached_decider(self, decider: ReplayDecider, decision_task: PollForDecisionTaskResponse) -> bytes:
+        # The decider may belong to the event loop of another thread of this loop, the query task
+        # has to be created on it
+        decider_loop = decider.event_loop.event_loop
+        current_loop = get_current_event_loop()
+        tasks = len(decider.tasks)
+        with self.decider_cache.loop_lock(decider_loop):
+            asyncio.set_event_loop(decider_loop)
+            try:
+                result = decider.query(decision_task, decision_task.query)
+                return decider.data_converter.to_payload(result)
+            finally:
+                del decider.tasks[tasks:]
+                asyncio.set_event_loop(current_loop)
+
+    def loop_lock(self):
+        """
+        Held while deciders run on the event loop of the current thread, when cached deciders can
+        be queried from other threads.
+        """
+        if not self.decider_cache:
+            return nullcontext()
+        return self.decider_cache.loop_lock(asyncio.get_event_loop())
+
+    def respond_query(self, task_token: bytes, result: bytes = None, error_message: str = None,
+                      service: WorkflowService = None):
+        service = service if service else self.service
         request = RespondQueryTaskCompletedRequest()
         request.task_token = task_token
         if result:
@@ -944,19 +1305,31 @@ class DecisionTaskLoop:
         else:
             logger.debug("RespondQueryTaskCompleted successful")
 
-    def respond_decisions(self, task_token: bytes, decisions: List[Decision]):
-        service = self.service
+    def respond_decisions(self, task_token: bytes, decisions: List[Decision], service: WorkflowService = None,
+                          profile: DecisionProfile = None) -> Optional[PollForDecisionTaskResponse]:
+        service = service if service else self.service
         request = RespondDecisionTaskCompletedRequest()
         request.task_token = task_token
         request.decisions.extend(decisions)
         request.identity = WorkflowService.get_identity()
+        if self.worker.options.return_new_decision_task:
+            request.return_new_decision_task = True
         # noinspection PyUnusedLocal
         response: RespondDecisionTaskCompletedResponse
-        response, err = service.respond_decision_task_completed(request)
+        if profile:
+            with profile.phase(PHASE_SERIALIZE):
+                request = copy_py_to_thrift(request)
+            with profile.phase(PHASE_RESPOND):
+                response, err = service.respond_decision_task_completed(request)
+        else:
+            response, err = service.respond_decision_task_completed(request)
         if err:
             logger.error("Error invoking RespondDecisionTaskCompleted: %s", err)
-        else:
-            logger.debug("RespondDecisionTaskCompleted: %s", response)
+            return None
+        logger.debug("RespondDecisionTaskCompleted: %s", response)
+        if response.decision_task and response.decision_task.task_token:
+            return response.decision_task
+        return None
 
 
 from cadence.clock_decision_context import ClockDecisionContext, TimerCancellationHandler, LOCAL_ACTIVITY_MARKER_NAME
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import cProfile
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Phases of a decision task, in the order they happen
+# Conversion of the PollForDecisionTask response from thrift, timed when it is polled
+PHASE_CONVERT_TASK = "convert_task"
+PHASE_HISTORY = "history_grouping"
+PHASE_EVENT_HANDLERS = "event_handlers"
+# Runs the workflow coroutines, i.e. user workflow code
+PHASE_EVENT_LOOP = "event_loop"
+PHASE_DECISIONS = "get_decisions"
+# Conversion of the RespondDecisionTaskCompleted request to thrift, before PHASE_RESPOND sends it
+PHASE_SERIALIZE = "serialize_request"
+PHASE_RESPOND = "respond"
+
+
+@dataclass
+class EventTypeStats:
+    count: int = 0
+    seconds: float = 0
+
+    def add(self, other: EventTypeStats):
+        self.count += other.count
+        self.seconds += other.seconds
+
+
+@dataclass
+class DecisionProfile:
+    """
+    Timings of a single decision task, filled in by ReplayDecider and DecisionTaskLoop.
+    """
+    workflow_type: str
+    workflow_id: str = None
+    run_id: str = None
+    total_seconds: float = 0
+    phases: Dict[str, float] = field(default_factory=dict)
+    event_types: Dict[str, EventTypeStats] = field(default_factory=dict)
+    replayed_events: int = 0
+    new_events: int = 0
+    # Seconds spent in the phases nested in each of the phases in progress
+    nested_seconds: List[float] = field(default_factory=list, repr=False)
+
+    @contextmanager
+    def phase(self, name: str):
+        # The time of a nested phase only counts for the nested phase
+        start = time.perf_counter()
+        self.nested_seconds.append(0)
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0) + seconds - self.nested_seconds.pop()
+            if self.nested_seconds:
+                self.nested_seconds[-1] += seconds
+
+    def record_event(self, event_type: str, seconds: float):
+        stats = self.event_types.get(event_type)
+        if not stats:
+            stats = self.event_types[event_type] = EventTypeStats()
+        stats.count += 1
+        stats.seconds += seconds
+
+
+@dataclass
+class WorkflowTypeProfile:
+    """
+    Sum of the DecisionProfiles of a workflow type.
+    """
+    workflow_type: str
+    decision_tasks: int = 0
+    total_seconds: float = 0
+    max_seconds: float = 0
+    phases: Dict[str, float] = field(default_factory=dict)
+    event_types: Dict[str, EventTypeStats] = field(default_factory=dict)
+    replayed_events: int = 0
+    new_events: int = 0
+
+    def add(self, profile: DecisionProfile):
+        self.decision_tasks += 1
+        self.total_seconds += profile.total_seconds
+        self.max_seconds = max(self.max_seconds, profile.total_seconds)
+        for name, seconds in profile.phases.items():
+            self.phases[name] = self.phases.get(name, 0) + seconds
+        for event_type, stats in profile.event_types.items():
+            self.event_types.setdefault(event_type, EventTypeStats()).add(stats)
+        self.replayed_events += profile.replayed_events
+        self.new_events += profile.new_events
+
+    def format(self) -> str:
+        lines = [f"{self.workflow_type}: {self.decision_tasks} decision tasks, "
+                 f"{self.total_seconds * 1000:.1f}ms total, {self.max_seconds * 1000:.1f}ms max, "
+                 f"{self.replayed_events} events replayed, {self.new_events} new"]
+        for name, seconds in sorted(self.phases.items(), key=lambda item: -item[1]):
+            lines.append(f"  {name}: {seconds * 1000:.1f}ms")
+        for event_type, stats in sorted(self.event_types.items(), key=lambda item: -item[1].seconds):
+            lines.append(f"  {event_type}: {stats.count} events, {stats.seconds * 1000:.1f}ms")
+        return "\n".join(lines)
+
+
+class DecisionProfiler:
+    """
+    Opt-in profiler for decision tasks (see WorkerOptions.decision_profiler). Times the phases of
+    every decision task and every history event handler, aggregated by workflow type.
+
+    When dump_threshold_seconds is set every decision task also runs under cProfile, and the stats
+    of the ones slower than the threshold are written to dump_dir as <workflow type>-<run id>-<time>.prof
+    (readable with pstats). cProfile has a significant overhead, only enable it while investigating.
+    """
+
+    def __init__(self, dump_threshold_seconds: float = None, dump_dir: str = "."):
+        self.dump_threshold_seconds = dump_threshold_seconds
+        self.dump_dir = dump_dir
+        self.workflow_types: Dict[str, WorkflowTypeProfile] = {}
+        self.dumps: List[str] = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def profile(self, workflow_type: str, workflow_id: str = None, run_id: str = None,
+                phases: Dict[str, float] = None):
+        """
+        phases are the phases timed before the decision task is profiled, e.g. PHASE_CONVERT_TASK.
+        They are counted in its total.
+        """
+        profile = DecisionProfile(workflow_type, workflow_id, run_id)
+        if phases:
+            profile.phases.update(phases)
+        profiler: Optional[cProfile.Profile] = cProfile.Profile() if self.dump_threshold_seconds else None
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            yield profile
+        finally:
+            if profiler:
+                profiler.disable()
+            profile.total_seconds = time.perf_counter() - start + sum(phases.values() if phases else [])
+            self.record(profile)
+            if profiler and profile.total_seconds >= self.dump_threshold_seconds:
+                self.dump(profile, profiler)
+
+    def record(self, profile: DecisionProfile):
+        with self.lock:
+            workflow_type_profile = self.workflow_types.get(profile.workflow_type)
+            if not workflow_type_profile:
+                workflow_type_profile = self.workflow_types[profile.workflow_type] = WorkflowTypeProfile(profile.workflow_type)
+            workflow_type_profile.add(profile)
+
+    def dump(self, profile: DecisionProfile, profiler: cProfile.Profile):
+        file_name = "%s-%s-%d.prof" % (profile.workflow_type.replace(os.sep, "_"), profile.run_id,
+                                       time.time() * 1000)
+        path = os.path.join(self.dump_dir, file_name)
+        try:
+            profiler.dump_stats(path)
+        except OSError as ex:
+            logger.warning("Failed to write decision task profile %s: %s", path, ex)
+            return
+        logger.warning("Decision task for %s (%s) took %dms, profile written to %s", profile.workflow_type,
+                       profile.workflow_id, profile.total_seconds * 1000, path)
+        with self.lock:
+            self.dumps.append(path)
+
+    def get_workflow_type_profiles(self) -> Dict[str, WorkflowTypeProfile]:
+        with self.lock:
+            return dict(self.workflow_types)
+
+    def report(self) -> str:
+        return "\n".join(p.format() for _, p in sorted(self.get_workflow_type_profiles().items()))
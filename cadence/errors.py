@@ -121,6 +121,9 @@ CADENCE_ERROR_FIELDS = {
     "clientVersionNotSupportedError": ClientVersionNotSupportedError
 }
 
+# Errors from CADENCE_ERROR_FIELDS that indicate a transient condition on the server, the request can be retried
+TRANSIENT_ERRORS = (InternalServiceError, ServiceBusyError)
+
 IGNORE_FIELDS_IN_ERRORS = ("args", "type_spec", "from_primitive", "to_primitive", "with_traceback")
 
 
@@ -12,6 +12,13 @@ class IllegalArgumentException(BaseException):
     pass
 
 
+class StopRequestedException(Exception):
+    """
+    Raised in worker threads, e.g. from a long poll, once Worker.stop has been called.
+    """
+    pass
+
+
 class WorkflowTypeNotFound(Exception):
     pass
 
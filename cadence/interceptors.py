@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Awaitable, TypeVar
+
+from cadence.cadence_types import PollForActivityTaskResponse
+
+T = TypeVar("T")
+
+
+@dataclass
+class ActivityInvocation:
+    activity_type: str
+    fn: Callable
+    args: List
+    task: PollForActivityTaskResponse = None
+
+
+@dataclass
+class WorkflowInvocation:
+    """
+    Invocation of a workflow, signal or query method. `fn` is unbound, it is called with `instance`
+    followed by `args`.
+    """
+    name: str
+    instance: object
+    fn: Callable
+    args: List
+
+
+@dataclass
+class ServiceCall:
+    method_name: str
+    request: object
+
+
+class ActivityInterceptor:
+    """
+    Wraps activity invocations in activity_task_loop. Implementations call next_fn to proceed and
+    may change the invocation, the return value or the exception raised.
+    """
+
+    def intercept_activity(self, invocation: ActivityInvocation, next_fn: Callable[[ActivityInvocation], object]) -> object:
+        return next_fn(invocation)
+
+
+class WorkflowInterceptor:
+    """
+    Wraps workflow, signal and query method invocations. They run inside the workflow event loop: the
+    same rules as for workflow code apply (deterministic, no blocking calls).
+    """
+
+    async def intercept_workflow(self, invocation: WorkflowInvocation,
+                                 next_fn: Callable[[WorkflowInvocation], Awaitable]) -> object:
+        return await next_fn(invocation)
+
+    async def intercept_signal(self, invocation: WorkflowInvocation,
+                               next_fn: Callable[[WorkflowInvocation], Awaitable]) -> object:
+        return await next_fn(invocation)
+
+    async def intercept_query(self, invocation: WorkflowInvocation,
+                              next_fn: Callable[[WorkflowInvocation], Awaitable]) -> object:
+        return await next_fn(invocation)
+
+
+class ServiceInterceptor:
+    """
+    Wraps WorkflowService.thrift_call. next_fn returns the thrift response object.
+    """
+
+    def intercept_call(self, call: ServiceCall, next_fn: Callable[[ServiceCall], object]) -> object:
+        return next_fn(call)
+
+
+def build_chain(handlers: List[Callable[[T, Callable[[T], object]], object]],
+                terminal: Callable[[T], object]) -> Optional[Callable[[T], object]]:
+    """
+    Returns None when there are no handlers so that callers can skip building the invocation
+    object altogether.
+    """
+    if not handlers:
+        return None
+    chain = terminal
+    for handler in reversed(handlers):
+        chain = bind(handler, chain)
+    return chain
+
+
+def bind(handler, next_fn):
+    return lambda invocation: handler(invocation, next_fn)
+
+
+def invoke_activity(invocation: ActivityInvocation) -> object:
+    return invocation.fn(*invocation.args)
+
+
+async def invoke_workflow_method(invocation: WorkflowInvocation) -> object:
+    return await invocation.fn(invocation.instance, *invocation.args)
+
+
+class InterceptorChains:
+    """
+    Chains built once from the interceptors registered in WorkerOptions.interceptors. An interceptor
+    joins every chain whose base class it extends.
+    """
+
+    def __init__(self, interceptors: List[object]):
+        activity = [i for i in interceptors if isinstance(i, ActivityInterceptor)]
+        workflow = [i for i in interceptors if isinstance(i, WorkflowInterceptor)]
+        self.service_interceptors: List[ServiceInterceptor] = [i for i in interceptors if isinstance(i, ServiceInterceptor)]
+        self.activity = build_chain([i.intercept_activity for i in activity], invoke_activity)
+        self.workflow = build_chain([i.intercept_workflow for i in workflow], invoke_workflow_method)
+        self.signal = build_chain([i.intercept_signal for i in workflow], invoke_workflow_method)
+        self.query = build_chain([i.intercept_query for i in workflow], invoke_workflow_method)
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple, List, Optional
+
+# WorkflowService, tagged with operation
+CADENCE_REQUEST = "cadence_request"
+CADENCE_REQUEST_LATENCY = "cadence_request_latency"
+CADENCE_ERROR = "cadence_error"
+CADENCE_TRANSPORT_ERROR = "cadence_transport_error"
+
+# WorkflowClient queries sharing a call to the server, tagged with domain and query_type
+CLIENT_QUERY_CACHE_HIT = "client_query_cache_hit"
+CLIENT_QUERY_COALESCED = "client_query_coalesced"
+
+# Pollers, tagged with task_list
+DECISION_POLL_LATENCY = "decision_poll_latency"
+DECISION_POLL_SUCCEED = "decision_poll_succeed"
+DECISION_POLL_NO_TASK = "decision_poll_no_task"
+DECISION_POLL_FAILED = "decision_poll_failed"
+ACTIVITY_POLL_LATENCY = "activity_poll_latency"
+ACTIVITY_POLL_SUCCEED = "activity_poll_succeed"
+ACTIVITY_POLL_NO_TASK = "activity_poll_no_task"
+ACTIVITY_POLL_FAILED = "activity_poll_failed"
+
+# Decision tasks, tagged with task_list and workflow_type
+DECISION_TASK_REPLAY_LATENCY = "decision_task_replay_latency"
+DECISION_TASK_EVENTS = "decision_task_events"
+DECISION_TASK_DECISIONS = "decision_task_decisions"
+DECISION_TASK_FAILED = "decision_task_failed"
+
+# Query tasks, tagged with task_list and workflow_type. QUERY_TASK_LATENCY is also tagged with cached.
+QUERY_TASK_LATENCY = "query_task_latency"
+DECIDER_CACHE_HIT = "decider_cache_hit"
+DECIDER_CACHE_MISS = "decider_cache_miss"
+QUERY_RESULT_CACHE_HIT = "query_result_cache_hit"
+QUERY_RESULT_CACHE_MISS = "query_result_cache_miss"
+# Tagged with task_list
+DECIDER_CACHE_SIZE = "decider_cache_size"
+
+# Activity tasks, tagged with task_list and activity_type
+ACTIVITY_SCHEDULE_TO_START_LATENCY = "activity_schedule_to_start_latency"
+ACTIVITY_EXECUTION_LATENCY = "activity_execution_latency"
+ACTIVITY_TASK_COMPLETED = "activity_task_completed"
+ACTIVITY_TASK_FAILED = "activity_task_failed"
+
+# Payloads written through a PayloadCodec, tagged with codec
+PAYLOAD_ENCODED = "payload_encoded"
+PAYLOAD_ENCODED_BYTES = "payload_encoded_bytes"
+PAYLOAD_CODEC_SAVED_BYTES = "payload_codec_saved_bytes"
+
+# Upper bounds (in seconds for latencies) of the histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+Tags = Dict[str, str]
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class MetricsScope:
+    """
+    Counters, gauges and histograms with tags. This base class discards everything so instrumented
+    code doesn't need to check whether metrics are enabled.
+    """
+
+    def tagged(self, tags: Tags) -> MetricsScope:
+        return self
+
+    def counter(self, name: str, value: int = 1, tags: Tags = None):
+        pass
+
+    def gauge(self, name: str, value: float, tags: Tags = None):
+        pass
+
+    def histogram(self, name: str, value: float, tags: Tags = None):
+        pass
+
+    @contextmanager
+    def timer(self, name: str, tags: Tags = None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram(name, time.perf_counter() - start, tags)
+
+
+NOOP_SCOPE = MetricsScope()
+
+
+class Histogram:
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # The last bucket counts values above the largest bound (+Inf)
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def record(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+class InMemoryMetricsScope(MetricsScope):
+    """
+    Keeps the metrics in memory, e.g. to be exposed on an HTTP endpoint with to_prometheus(). Scopes
+    returned by tagged() share the same storage.
+    """
+
+    def __init__(self, tags: Tags = None, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, storage: InMemoryMetricsScope = None):
+        self.tags = tags or {}
+        self.buckets = buckets
+        self.storage = storage if storage else self
+        if not storage:
+            self.lock = threading.Lock()
+            self.counters: Dict[MetricKey, int] = {}
+            self.gauges: Dict[MetricKey, float] = {}
+            self.histograms: Dict[MetricKey, Histogram] = {}
+
+    def tagged(self, tags: Tags) -> InMemoryMetricsScope:
+        return InMemoryMetricsScope({**self.tags, **tags}, self.buckets, self.storage)
+
+    def key(self, name: str, tags: Optional[Tags]) -> MetricKey:
+        merged = {**self.tags, **tags} if tags else self.tags
+        return name, tuple(sorted(merged.items()))
+
+    def counter(self, name: str, value: int = 1, tags: Tags = None):
+        key = self.key(name, tags)
+        storage = self.storage
+        with storage.lock:
+            storage.counters[key] = storage.counters.get(key, 0) + value
+
+    def gauge(self, name: str, value: float, tags: Tags = None):
+        key = self.key(name, tags)
+        storage = self.storage
+        with storage.lock:
+            storage.gauges[key] = value
+
+    def histogram(self, name: str, value: float, tags: Tags = None):
+        key = self.key(name, tags)
+        storage = self.storage
+        with storage.lock:
+            histogram = storage.histograms.get(key)
+            if not histogram:
+                histogram = storage.histograms[key] = Histogram(self.buckets)
+            histogram.record(value)
+
+    def get_counter(self, name: str, tags: Tags = None) -> int:
+        return self.storage.counters.get(self.key(name, tags), 0)
+
+    def get_gauge(self, name: str, tags: Tags = None) -> Optional[float]:
+        return self.storage.gauges.get(self.key(name, tags))
+
+    def get_histogram(self, name: str, tags: Tags = None) -> Optional[Histogram]:
+        return self.storage.histograms.get(self.key(name, tags))
+
+    def to_prometheus(self) -> str:
+        """
+        Renders the metrics in the Prometheus text exposition format.
+        """
+        storage = self.storage
+        lines: List[str] = []
+        with storage.lock:
+            for metric_type, metrics in (("counter", storage.counters), ("gauge", storage.gauges)):
+                for name in sorted({name for name, _ in metrics}):
+                    lines.append(f"# TYPE {name} {metric_type}")
+                    for (metric_name, tags), value in sorted(metrics.items()):
+                        if metric_name == name:
+                            lines.append(f"{name}{format_labels(tags)} {value}")
+            for name in sorted({name for name, _ in storage.histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (metric_name, tags), histogram in sorted(storage.histograms.items(), key=lambda item: item[0]):
+                    if metric_name != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{format_labels(tags + (('le', str(bound)),))} {cumulative}")
+                    lines.append(f"{name}_sum{format_labels(tags)} {histogram.sum}")
+                    lines.append(f"{name}_count{format_labels(tags)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def format_labels(tags: Tuple[Tuple[str, str], ...]) -> str:
+    if not tags:
+        return ""
+    labels = ",".join('%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in tags)
+    return "{" + labels + "}"
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# fetch_page(next_page_token) returns the items of the page and the token of the next page, which
+# is empty on the last page. It is called with None for the first page.
+FetchPage = Callable[[Optional[bytes]], Tuple[List[T], Optional[bytes]]]
+
+
+def iterate_pages(fetch_page: FetchPage, prefetch: bool = True) -> Iterator[T]:
+    """
+    Yields the items of every page, following next_page_token.
+
+    With prefetch, the next page is fetched in a background thread while the items of the current
+    one are consumed, so at most two pages are held in memory. Errors from fetch_page are raised
+    when the caller reaches the page that failed.
+
+    A prefetch that has started runs to completion even when the caller stops iterating, so
+    fetch_page must not use a connection the caller needs meanwhile (WorkflowClient prefetches on a
+    connection of its own). Callers that may stop early should close the iterator, e.g. with
+    contextlib.closing, rather than leave it to the garbage collector.
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cadence-prefetch") if prefetch else None
+    next_page: Optional[Future] = None
+    try:
+        items, next_page_token = fetch_page(None)
+        while True:
+            if next_page_token and executor:
+                next_page = executor.submit(fetch_page, next_page_token)
+            yield from items
+            # Drop the consumed page before the next one is taken
+            items = None
+            if not next_page_token:
+                return
+            if next_page:
+                items, next_page_token = next_page.result()
+                next_page = None
+            else:
+                items, next_page_token = fetch_page(next_page_token)
+    finally:
+        if executor:
+            # The caller stopped iterating: don't wait for a page nobody will read. A fetch that has
+            # started can't be cancelled, it finishes in the background
+            if next_page:
+                next_page.cancel()
+            executor.shutdown(wait=False)
+
+
+def check_response(response, err):
+    """
+    Raises err of a (response, err) tuple returned by WorkflowService.
+    """
+    if err:
+        raise err if isinstance(err, Exception) else Exception(err)
+    return response
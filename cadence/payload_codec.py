@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import zlib
+from typing import Dict, List, Optional
+
+from cadence.data_converter import DataConverter
+from cadence.metrics import MetricsScope, NOOP_SCOPE, PAYLOAD_ENCODED, PAYLOAD_ENCODED_BYTES, \
+    PAYLOAD_CODEC_SAVED_BYTES
+
+# Compressed payloads start with MAGIC followed by the compressor name and ":". No JSON, msgpack
+# or pickle payload starts with it, so uncompressed payloads are decoded unchanged.
+COMPRESSED_PAYLOAD_MAGIC = b"\x00cz"
+DEFAULT_COMPRESSION_THRESHOLD_BYTES = 4096
+
+
+class PayloadCodec:
+    """
+    Transforms the payload bytes produced by the DataConverter before they are sent to the server,
+    see WorkerOptions.payload_codec and WorkflowClientOptions.payload_codec.
+    """
+    name: str = "identity"
+
+    def encode(self, payload: bytes) -> bytes:
+        return payload
+
+    def decode(self, payload: bytes) -> bytes:
+        return payload
+
+
+class Compressor:
+    name: str = None
+
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError()
+
+    def decompress(self, data: bytes) -> bytes:
+        raise NotImplementedError()
+
+
+class ZlibCompressor(Compressor):
+    name = "zlib"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class CompressionCodec(PayloadCodec):
+    """
+    Compresses payloads of at least threshold_bytes with `compressor`, unless that doesn't make them
+    smaller. Decodes payloads compressed by any of `compressor` and `decompressors`, so that the
+    compressor can be changed while older payloads are still in history.
+    """
+    def __init__(self, compressor: Compressor = None, threshold_bytes: int = DEFAULT_COMPRESSION_THRESHOLD_BYTES,
+                 decompressors: List[Compressor] = None):
+        self.compressor = compressor if compressor else ZlibCompressor()
+        self.name = self.compressor.name
+        self.threshold_bytes = threshold_bytes
+        self.prefix = COMPRESSED_PAYLOAD_MAGIC + self.compressor.name.encode("ascii") + b":"
+        self.compressors: Dict[str, Compressor] = {c.name: c for c in (decompressors or [])}
+        self.compressors.setdefault(ZlibCompressor.name, ZlibCompressor())
+        self.compressors[self.compressor.name] = self.compressor
+
+    def encode(self, payload: bytes) -> bytes:
+        if not payload or len(payload) < self.threshold_bytes:
+            return payload
+        compressed = self.prefix + self.compressor.compress(payload)
+        return compressed if len(compressed) < len(payload) else payload
+
+    def decode(self, payload: bytes) -> bytes:
+        if not isinstance(payload, bytes) or not payload.startswith(COMPRESSED_PAYLOAD_MAGIC):
+            return payload
+        separator = payload.find(b":", len(COMPRESSED_PAYLOAD_MAGIC))
+        name = payload[len(COMPRESSED_PAYLOAD_MAGIC):separator].decode("ascii", errors="replace")
+        compressor = self.compressors.get(name) if separator > 0 else None
+        if not compressor:
+            raise ValueError(f"Payload compressed with unknown compressor: {name}")
+        return compressor.decompress(payload[separator + 1:])
+
+
+class ChainedCodec(PayloadCodec):
+    """
+    Encodes with each codec in order and decodes in reverse order, e.g. [CompressionCodec(),
+    BlobStoreCodec(store)] offloads the payloads that are still large once compressed.
+    """
+
+    def __init__(self, codecs: List[PayloadCodec]):
+        self.codecs = list(codecs)
+        self.name = "+".join(c.name for c in self.codecs)
+
+    def encode(self, payload: bytes) -> bytes:
+        for codec in self.codecs:
+            payload = codec.encode(payload)
+        return payload
+
+    def decode(self, payload: bytes) -> bytes:
+        for codec in reversed(self.codecs):
+            payload = codec.decode(payload)
+        return payload
+
+
+class CodecDataConverter(DataConverter):
+    """
+    Applies `codec` to the payloads of `converter` and records how many bytes it saved.
+    """
+
+    def __init__(self, converter: DataConverter, codec: PayloadCodec, metrics_scope: MetricsScope = NOOP_SCOPE):
+        self.converter = converter
+        self.codec = codec
+        self.metrics_scope = metrics_scope.tagged({"codec": codec.name})
+
+    def to_payload(self, value: object) -> bytes:
+        payload = self.converter.to_payload(value)
+        encoded = self.codec.encode(payload)
+        if encoded is not payload:
+            self.metrics_scope.counter(PAYLOAD_ENCODED)
+            self.metrics_scope.counter(PAYLOAD_ENCODED_BYTES, len(payload))
+            self.metrics_scope.counter(PAYLOAD_CODEC_SAVED_BYTES, len(payload) - len(encoded))
+        return encoded
+
+    def from_payload(self, payload: bytes) -> object:
+        return self.converter.from_payload(self.codec.decode(payload))
+
+
+def create_data_converter(converter: DataConverter, codec: Optional[PayloadCodec],
+                          metrics_scope: MetricsScope = NOOP_SCOPE) -> DataConverter:
+    if not codec:
+        return converter
+    return CodecDataConverter(converter, codec, metrics_scope)
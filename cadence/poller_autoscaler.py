@@ -0,0 +1,119 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+from cadence.cadence_types import DescribeTaskListRequest, TaskList, TaskListType, DescribeTaskListResponse
+
+logger = logging.getLogger(__name__)
+
+# Number of polls between two scaling decisions
+SCALE_WINDOW = 10
+# Scale down when at least this fraction of the polls in a window came back empty
+SCALE_DOWN_EMPTY_RATIO = 0.8
+# Scale up when at most this fraction of the polls in a window came back empty
+SCALE_UP_EMPTY_RATIO = 0.2
+
+
+class PollerAutoScaler:
+    """
+    Decides how many of the pollers of a task list should be polling. Pollers are numbered from 0 to
+    max_pollers - 1 and the ones with an index above the current target wait in wait_until_active().
+
+    The target goes up when polls keep returning tasks or when the backlog reported by the server
+    (backlog_count_hint or DescribeTaskList) grows, and down when most long polls return empty.
+    """
+
+    def __init__(self, min_pollers: int, max_pollers: int, window: int = SCALE_WINDOW):
+        assert 1 <= min_pollers <= max_pollers
+        self.min_pollers = min_pollers
+        self.max_pollers = max_pollers
+        self.window = window
+        self.target = min_pollers
+        self.polls = 0
+        self.empty_polls = 0
+        self.backlog: Optional[int] = None
+        self.previous_backlog: Optional[int] = None
+        self.condition = threading.Condition()
+
+    def wait_until_active(self, index: int, timeout: float = None) -> bool:
+        with self.condition:
+            return self.condition.wait_for(lambda: index < self.target, timeout=timeout)
+
+    def get_target(self) -> int:
+        return self.target
+
+    def record_poll(self, got_task: bool, backlog_count_hint: Optional[int] = None):
+        with self.condition:
+            self.polls += 1
+            if not got_task:
+                self.empty_polls += 1
+            if backlog_count_hint is not None:
+                self.backlog = backlog_count_hint
+            if self.polls >= self.window:
+                self.rescale()
+
+    def record_backlog(self, backlog_count_hint: int):
+        with self.condition:
+            self.backlog = backlog_count_hint
+
+    def rescale(self):
+        empty_ratio = self.empty_polls / self.polls
+        backlog_growing = self.backlog is not None and self.backlog > (self.previous_backlog or 0)
+        target = self.target
+        if backlog_growing or empty_ratio <= SCALE_UP_EMPTY_RATIO:
+            target = min(target + 1, self.max_pollers)
+        elif empty_ratio >= SCALE_DOWN_EMPTY_RATIO:
+            target = max(target - 1, self.min_pollers)
+        self.previous_backlog = self.backlog
+        self.polls = 0
+        self.empty_polls = 0
+        if target != self.target:
+            logger.debug("Scaling pollers from %d to %d (empty ratio %.2f, backlog %s)", self.target, target,
+                         empty_ratio, self.backlog)
+            self.target = target
+            self.condition.notify_all()
+
+
+class TaskListBacklogSampler:
+    """
+    Periodically reads the backlog of a task list with DescribeTaskList and feeds it to the scaler.
+    """
+
+    def __init__(self, scaler: PollerAutoScaler, domain: str, task_list: str, task_list_type: TaskListType,
+                 interval_seconds: float):
+        self.scaler = scaler
+        self.domain = domain
+        self.task_list = task_list
+        self.task_list_type = task_list_type
+        self.interval_seconds = interval_seconds
+        self.last_sample = 0
+
+    def maybe_sample(self, service):
+        now = time.time()
+        if now - self.last_sample < self.interval_seconds:
+            return
+        self.last_sample = now
+        request = DescribeTaskListRequest()
+        request.domain = self.domain
+        request.task_list = TaskList()
+        request.task_list.name = self.task_list
+        request.task_list_type = self.task_list_type
+        request.include_task_list_status = True
+        response: DescribeTaskListResponse
+        try:
+            response, err = service.describe_task_list(request)
+        except Exception as ex:
+            logger.warning("DescribeTaskList error: %s", ex)
+            return
+        if err:
+            logger.warning("DescribeTaskList failed: %s", err)
+            return
+        if response.task_list_status and response.task_list_status.backlog_count_hint is not None:
+            self.scaler.record_backlog(response.task_list_status.backlog_count_hint)
+
+
+def create_autoscaler(min_pollers: int, max_pollers: int) -> Optional[PollerAutoScaler]:
+    if max_pollers <= 1:
+        return None
+    return PollerAutoScaler(min_pollers, max_pollers)
@@ -0,0 +1,49 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+# (run_id, last event id of the history, query_type, serialized query_args)
+QueryKey = Tuple[str, int, str, Optional[bytes]]
+
+
+class QueryResultCache:
+    """
+    LRU cache of serialized query results. A history position identifies the state of the workflow
+    instance, so the result of a query without side effects is the same for the same key; ttl_seconds
+    bounds how long results are kept for queries that also depend on something else.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        assert max_size > 0
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.results: OrderedDict[QueryKey, Tuple[float, bytes]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key: QueryKey) -> Optional[bytes]:
+        with self.lock:
+            entry = self.results.get(key)
+            if entry and entry[0] <= self.clock():
+                del self.results[key]
+                entry = None
+            if entry:
+                self.results.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, key: QueryKey, result: bytes):
+        with self.lock:
+            self.results[key] = (self.clock() + self.ttl_seconds, result)
+            self.results.move_to_end(key)
+            while len(self.results) > self.max_size:
+                self.results.popitem(last=False)
+
+    def size(self) -> int:
+        with self.lock:
+            return len(self.results)
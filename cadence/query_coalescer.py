@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Optional, Tuple
+
+from cadence.cadence_types import QueryWorkflowRequest, QueryWorkflowResponse
+from cadence.metrics import MetricsScope, NOOP_SCOPE, CLIENT_QUERY_CACHE_HIT, CLIENT_QUERY_COALESCED
+
+DEFAULT_QUERY_CACHE_SIZE = 1000
+
+# (domain, workflow_id, run_id, query_type, serialized query_args)
+QueryKey = Tuple[str, str, Optional[str], str, Optional[bytes]]
+
+
+@dataclass
+class QueryCoalescerStats:
+    # Queries sent to the server
+    calls: int = 0
+    # Queries answered from the result cache
+    hits: int = 0
+    # Queries that waited for an identical query already in flight instead of calling the server
+    coalesced: int = 0
+
+
+class InFlightQuery:
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.done = threading.Event()
+        self.result: Tuple[Optional[QueryWorkflowResponse], object] = (None, None)
+
+
+class QueryCoalescer:
+    """
+    Shares the response of a QueryWorkflow call between the identical queries made while it is in
+    flight and, when ttl_seconds is set, with the identical queries made during the next ttl_seconds.
+    Errors are shared with the queries waiting for the call but aren't kept.
+    """
+
+    def __init__(self, ttl_seconds: float = 0, max_size: int = DEFAULT_QUERY_CACHE_SIZE,
+                 metrics_scope: MetricsScope = NOOP_SCOPE, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.metrics_scope = metrics_scope
+        self.clock = clock
+        self.results: OrderedDict[QueryKey, Tuple[float, QueryWorkflowResponse]] = OrderedDict()
+        self.in_flight: Dict[QueryKey, InFlightQuery] = {}
+        # Incremented by invalidate so that calls started before don't store their result
+        self.generation = 0
+        self.stats = QueryCoalescerStats()
+        self.lock = threading.Lock()
+
+    def query(self, request: QueryWorkflowRequest,
+              query_fn: Callable[[QueryWorkflowRequest], Tuple[QueryWorkflowResponse, object]]):
+        key = get_key(request)
+        tags = {"query_type": request.query.query_type}
+        with self.lock:
+            entry = self.results.get(key)
+            if entry and entry[0] <= self.clock():
+                del self.results[key]
+                entry = None
+            if entry:
+                self.results.move_to_end(key)
+                self.stats.hits += 1
+                self.metrics_scope.counter(CLIENT_QUERY_CACHE_HIT, tags=tags)
+                return entry[1], None
+            in_flight = self.in_flight.get(key)
+            leader = in_flight is None
+            if leader:
+                in_flight = self.in_flight[key] = InFlightQuery(self.generation)
+                self.stats.calls += 1
+            else:
+                self.stats.coalesced += 1
+                self.metrics_scope.counter(CLIENT_QUERY_COALESCED, tags=tags)
+        if not leader:
+            in_flight.done.wait()
+            return in_flight.result
+
+        try:
+            try:
+                in_flight.result = query_fn(request)
+            except BaseException as ex:
+                in_flight.result = (None, ex)
+                raise
+            finally:
+                response, err = in_flight.result
+                with self.lock:
+                    if self.in_flight.get(key) is in_flight:
+                        del self.in_flight[key]
+                    if self.ttl_seconds and response is not None and not err and not response.query_rejected \
+                            and in_flight.generation == self.generation:
+                        self.results[key] = (self.clock() + self.ttl_seconds, response)
+                        while len(self.results) > self.max_size:
+                            self.results.popitem(last=False)
+        finally:
+            # Followers must not wait forever, whatever happened to the call
+            in_flight.done.set()
+        return in_flight.result
+
+    def invalidate(self, workflow_id: str = None, run_id: str = None):
+        """
+        Drops the results of the queries on workflow_id (and run_id when given), or all of them.
+        Queries in flight when called don't share their response with later queries.
+        """
+        with self.lock:
+            self.generation += 1
+            for store in (self.results, self.in_flight):
+                for key in [k for k in store if matches(k, workflow_id, run_id)]:
+                    del store[key]
+
+    def get_stats(self) -> QueryCoalescerStats:
+        with self.lock:
+            return replace(self.stats)
+
+
+def get_key(request: QueryWorkflowRequest) -> QueryKey:
+    return (request.domain, request.execution.workflow_id, request.execution.run_id, request.query.query_type,
+            request.query.query_args)
+
+
+def matches(key: QueryKey, workflow_id: Optional[str], run_id: Optional[str]) -> bool:
+    _, key_workflow_id, key_run_id, _, _ = key
+    if workflow_id is not None and key_workflow_id != workflow_id:
+        return False
+    # Queries without run_id are on the current run, which may be run_id
+    return run_id is None or key_run_id in (None, run_id)
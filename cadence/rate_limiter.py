@@ -0,0 +1,68 @@
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Callable
+
+
+@dataclass
+class RateLimiterStats:
+    # Number of permits handed out
+    acquired: int = 0
+    # Number of permits that had to wait for the bucket to refill, i.e. how often the limit engaged
+    throttled: int = 0
+    throttled_seconds: float = 0
+
+
+class TokenBucket:
+    """
+    Hands out up to `rate` permits per second with bursts of up to `burst` permits. Thread safe, shared
+    by all the pollers of a worker.
+    """
+
+    def __init__(self, rate: float, burst: float = None, clock: Callable[[], float] = time.monotonic):
+        assert rate > 0
+        self.rate = rate
+        self.burst = burst if burst else max(rate, 1)
+        self.clock = clock
+        self.tokens = self.burst
+        self.last_refill = clock()
+        self.stats = RateLimiterStats()
+        self.lock = threading.Lock()
+
+    def refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def try_acquire(self) -> bool:
+        with self.lock:
+            self.refill()
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            self.stats.acquired += 1
+            return True
+
+    def reserve(self) -> float:
+        """
+        Takes a permit and returns how long the caller has to wait before using it.
+        """
+        with self.lock:
+            self.refill()
+            self.tokens -= 1
+            self.stats.acquired += 1
+            if self.tokens >= 0:
+                return 0
+            delay = -self.tokens / self.rate
+            self.stats.throttled += 1
+            self.stats.throttled_seconds += delay
+            return delay
+
+    def acquire(self, sleep: Callable[[float], None] = time.sleep):
+        delay = self.reserve()
+        if delay:
+            sleep(delay)
+
+    def get_stats(self) -> RateLimiterStats:
+        with self.lock:
+            return replace(self.stats)
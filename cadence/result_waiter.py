@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple, Optional
+
+from cadence.async_client import AsyncWorkflowClient
+from cadence.backoff import BackoffPolicy, is_retryable
+from cadence.workflow import WorkflowExecutionContext, create_close_history_event_request, get_workflow_result
+
+logger = logging.getLogger(__name__)
+
+
+def default_poll_backoff() -> BackoffPolicy:
+    # Interval between polls of an execution that hasn't closed yet, and between retries of failed polls
+    return BackoffPolicy(initial_interval_seconds=0.5, maximum_interval_seconds=10)
+
+
+@dataclass
+class TrackedExecution:
+    workflow_id: str
+    run_id: Optional[str]
+    workflow_type: Optional[str]
+    future: asyncio.Future
+    empty_polls: int = 0
+    failed_polls: int = 0
+
+
+@dataclass
+class WorkflowResultWaiter:
+    """
+    Waits for the results of many workflow executions with a fixed number of connections.
+
+    `concurrency` polls run at a time, by default one per connection of client.long_poll_pool. While
+    there are fewer tracked executions than that, each one has a long poll waiting for its close
+    event. Long polls are kept off one of the connections so that executions tracked meanwhile are
+    polled without waiting for a long poll to return. Beyond that, executions are polled without
+    waiting in order of their next poll time, an execution that hasn't closed is polled again after
+    an interval growing up to poll_backoff.maximum_interval_seconds.
+    """
+    client: AsyncWorkflowClient
+    poll_backoff: BackoffPolicy = field(default_factory=default_poll_backoff)
+    concurrency: int = None
+    tracked: Dict[Tuple[str, Optional[str]], TrackedExecution] = field(default_factory=dict)
+    schedule: List[Tuple[float, int, TrackedExecution]] = field(default_factory=list)
+    workers: List[asyncio.Task] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.concurrency:
+            self.concurrency = self.client.long_poll_pool.size
+        self.sequence = itertools.count()
+        self.long_polls = 0
+        # Created on the loop: before Python 3.10 an Event binds to the current loop when created
+        self.changed: Optional[asyncio.Event] = None
+
+    def wait(self, workflow_id: str, run_id: str = None, workflow_type: str = None,
+             callback: Callable[[asyncio.Future], None] = None) -> asyncio.Future:
+        """
+        Returns a future resolved with the result of the workflow, or the exception it failed with
+        as raised by WorkflowClient.wait_for_close. callback is called with the future when it
+        is resolved. Cancelling the future stops the polling of the execution.
+        """
+        key = (workflow_id, run_id)
+        execution = self.tracked.get(key)
+        if not execution:
+            future = asyncio.get_running_loop().create_future()
+            execution = TrackedExecution(workflow_id=workflow_id, run_id=run_id, workflow_type=workflow_type,
+                                         future=future)
+            self.tracked[key] = execution
+            future.add_done_callback(lambda f: self.tracked.pop(key, None))
+            self.schedule_poll(execution, 0)
+            self.start_workers()
+        if callback:
+            execution.future.add_done_callback(callback)
+        return execution.future
+
+    def wait_for_close(self, context: WorkflowExecutionContext,
+                       callback: Callable[[asyncio.Future], None] = None) -> asyncio.Future:
+        return self.wait(context.workflow_execution.workflow_id, context.workflow_execution.run_id,
+                         context.workflow_type, callback)
+
+    def start_workers(self):
+        while len(self.workers) < self.concurrency:
+            self.workers.append(asyncio.ensure_future(self.run_worker()))
+
+    def schedule_poll(self, execution: TrackedExecution, delay: float):
+        poll_at = asyncio.get_running_loop().time() + delay
+        heapq.heappush(self.schedule, (poll_at, next(self.sequence), execution))
+        self.get_changed().set()
+
+    def get_changed(self) -> asyncio.Event:
+        if not self.changed:
+            self.changed = asyncio.Event()
+        return self.changed
+
+    async def next_execution(self) -> TrackedExecution:
+        loop = asyncio.get_running_loop()
+        while True:
+            timeout = None
+            while self.schedule:
+                poll_at, _, execution = self.schedule[0]
+                if execution.future.done():
+                    heapq.heappop(self.schedule)
+                    continue
+                timeout = poll_at - loop.time()
+                if timeout <= 0:
+                    heapq.heappop(self.schedule)
+                    return execution
+                break
+            changed = self.get_changed()
+            changed.clear()
+            try:
+                await asyncio.wait_for(changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_worker(self):
+        while True:
+            execution = await self.next_execution()
+            await self.poll(execution)
+
+    async def poll(self, execution: TrackedExecution):
+        request = create_close_history_event_request(self.client, execution.workflow_id, execution.run_id)
+        # A long poll holds a connection until the workflow closes or the server gives up, only
+        # afford one per execution when every execution can have one
+        long_poll = len(self.tracked) < self.concurrency and self.long_polls < self.concurrency - 1
+        request.wait_for_new_event = long_poll
+        if long_poll:
+            self.long_polls += 1
+        try:
+            response, err = await self.client.call("get_workflow_execution_history", request, long_poll=True)
+        except Exception as ex:
+            response, err = None, ex
+        finally:
+            if long_poll:
+                self.long_polls -= 1
+        if execution.future.done():
+            return
+        if err:
+            if is_retryable(err):
+                execution.failed_polls += 1
+                logger.warning("Polling for the result of %s failed, retrying: %s", execution.workflow_id, err)
+                self.schedule_poll(execution, self.poll_backoff.get_interval(execution.failed_polls))
+            else:
+                execution.future.set_exception(err if isinstance(err, Exception) else Exception(err))
+            return
+        execution.failed_polls = 0
+        if not response.history.events:
+            execution.empty_polls += 1
+            self.schedule_poll(execution, self.poll_backoff.get_interval(execution.empty_polls))
+            return
+        try:
+            result = get_workflow_result(self.client.data_converter, response.history.events[0],
+                                         execution.workflow_id, execution.run_id, execution.workflow_type)
+        except Exception as ex:
+            execution.future.set_exception(ex)
+        else:
+            execution.future.set_result(result)
+
+    async def close(self):
+        """
+        Stops polling and cancels the futures of executions that haven't closed.
+        """
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        for execution in list(self.tracked.values()):
+            execution.future.cancel()
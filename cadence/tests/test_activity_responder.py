@@ -0,0 +1,102 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from cadence.activity_responder import ActivityCompletionResponder, ActivityCompletion
+from cadence.cadence_types import RespondActivityTaskCompletedRequest, RespondActivityTaskFailedRequest
+from cadence.errors import ServiceBusyError, BadRequestError
+from cadence.worker import Worker, WorkerOptions
+from cadence.workflowservice import WorkflowServicePool
+
+
+@pytest.fixture
+def service():
+    service = Mock()
+    service.respond_activity_task_completed = Mock(return_value=(None, None))
+    service.respond_activity_task_failed = Mock(return_value=(None, None))
+    return service
+
+
+@pytest.fixture
+def responder(service):
+    pool = WorkflowServicePool(lambda: service, 2)
+    return ActivityCompletionResponder(pool, responders=2, queue_size=10, max_attempts=3)
+
+
+def test_complete(responder, service):
+    responder.start()
+    responder.submit(ActivityCompletion(b"task-token", "Activities::greet", return_value="hello"))
+    responder.stop()
+    service.respond_activity_task_completed.assert_called_once()
+    request: RespondActivityTaskCompletedRequest = service.respond_activity_task_completed.call_args[0][0]
+    assert request.task_token == b"task-token"
+    assert request.result == b'"hello"'
+
+
+def test_complete_exceptionally(responder, service):
+    responder.start()
+    responder.submit(ActivityCompletion(b"task-token", "Activities::greet", exception=Exception("failed")))
+    responder.stop()
+    service.respond_activity_task_failed.assert_called_once()
+    request: RespondActivityTaskFailedRequest = service.respond_activity_task_failed.call_args[0][0]
+    assert request.reason == "Exception"
+
+
+def test_stop_drains_queue(responder, service):
+    for i in range(5):
+        responder.submit(ActivityCompletion(b"task-token", "Activities::greet", return_value=i))
+    responder.start()
+    responder.stop()
+    assert service.respond_activity_task_completed.call_count == 5
+
+
+@patch("cadence.activity_responder.time.sleep")
+def test_retry_transient_error(sleep, responder, service):
+    service.respond_activity_task_completed = Mock(side_effect=[(None, ServiceBusyError("busy")), (None, None)])
+    responder.send(ActivityCompletion(b"task-token", "Activities::greet", return_value="hello"))
+    assert service.respond_activity_task_completed.call_count == 2
+    sleep.assert_called_once()
+
+
+@patch("cadence.activity_responder.time.sleep")
+def test_retry_gives_up(sleep, responder, service):
+    service.respond_activity_task_completed = Mock(return_value=(None, ServiceBusyError("busy")))
+    responder.send(ActivityCompletion(b"task-token", "Activities::greet", return_value="hello"))
+    assert service.respond_activity_task_completed.call_count == 3
+
+
+@patch("cadence.activity_responder.time.sleep")
+def test_no_retry_non_transient_error(sleep, responder, service):
+    service.respond_activity_task_completed = Mock(return_value=(None, BadRequestError("bad request")))
+    responder.send(ActivityCompletion(b"task-token", "Activities::greet", return_value="hello"))
+    assert service.respond_activity_task_completed.call_count == 1
+    sleep.assert_not_called()
+
+
+def test_stopped_by_last_poller(service):
+    responder = ActivityCompletionResponder(WorkflowServicePool(lambda: service, 2), responders=2, queue_size=10,
+                                            max_attempts=3, pollers=2)
+    responder.start()
+    responder.submit(ActivityCompletion(b"task-token", "Activities::greet", return_value="hello"))
+    responder.release()
+    assert len(responder.threads) == 2
+    responder.release()
+    assert responder.threads == []
+    service.respond_activity_task_completed.assert_called_once()
+
+
+@patch("cadence.activity_loop.activity_task_loop")
+def test_worker_pollers_share_responder(activity_task_loop, service):
+    worker = Worker(options=WorkerOptions(activity_pollers_min=1, activity_pollers_max=4,
+                                          activity_completion_responders=2))
+    worker.create_service_pool = Mock(return_value=WorkflowServicePool(lambda: service, 2))
+    worker.activities["Activities::greet"] = Mock()
+    worker.start()
+    responders = {c.args[3] for c in activity_task_loop.call_args_list}
+    assert activity_task_loop.call_count == 4
+    assert len(responders) == 1
+    worker.create_service_pool.assert_called_once()
+    responder = responders.pop()
+    assert responder.pollers == 4
+    for _ in range(4):
+        responder.release()
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from cadence.async_client import AsyncWorkflowClient
+from cadence.cadence_types import StartWorkflowExecutionResponse, GetWorkflowExecutionHistoryResponse, History, \
+    HistoryEvent, EventType, WorkflowExecutionCompletedEventAttributes, QueryWorkflowResponse
+from cadence.workflow import workflow_method, signal_method, query_method, WorkflowExecutionTerminatedException
+from cadence.workflowservice import WorkflowServicePool
+
+
+class GreetingWorkflow:
+    @workflow_method(task_list="test-tasks")
+    async def get_greeting(self, name):
+        raise NotImplementedError
+
+    @signal_method
+    async def set_name(self, name):
+        raise NotImplementedError
+
+    @query_method
+    async def get_name(self):
+        raise NotImplementedError
+
+
+def close_event(event_type, **kwargs):
+    return GetWorkflowExecutionHistoryResponse(history=History(events=[HistoryEvent(event_type=event_type, **kwargs)]))
+
+
+class FakeService:
+    def __init__(self, start_delay: float = 0):
+        self.start_delay = start_delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.requests = []
+        self.history_responses = []
+
+    def start_workflow(self, request):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.requests.append(request)
+        time.sleep(self.start_delay)
+        with self.lock:
+            self.active -= 1
+        return StartWorkflowExecutionResponse(run_id="run-" + request.workflow_id), None
+
+    def get_workflow_execution_history(self, request):
+        if self.history_responses:
+            return self.history_responses.pop(0), None
+        return close_event(EventType.WorkflowExecutionCompleted,
+                           workflow_execution_completed_event_attributes=WorkflowExecutionCompletedEventAttributes(
+                               result=b'"hello"')), None
+
+    def signal_workflow_execution(self, request):
+        self.requests.append(request)
+        return None, None
+
+    def query_workflow(self, request):
+        self.requests.append(request)
+        return QueryWorkflowResponse(query_result=b'"bob"'), None
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def create_client(service, size=2):
+    return AsyncWorkflowClient(service_pool=WorkflowServicePool(lambda: service, size), domain="domain")
+
+
+def test_concurrent_starts_share_pool(loop):
+    service = FakeService(start_delay=0.02)
+    client = create_client(service, size=3)
+
+    async def start_all():
+        stubs = [client.new_workflow_stub(GreetingWorkflow) for _ in range(12)]
+        return await asyncio.gather(*[AsyncWorkflowClient.start(stub.get_greeting, "bob") for stub in stubs])
+
+    contexts = loop.run_until_complete(start_all())
+    client.close()
+    assert len(contexts) == 12
+    assert len({c.workflow_execution.workflow_id for c in contexts}) == 12
+    assert all(c.workflow_execution.run_id == "run-" + c.workflow_execution.workflow_id for c in contexts)
+    assert 1 < service.max_active <= 3
+    assert service.requests[0].domain == "domain"
+    assert service.requests[0].input == b'"bob"'
+
+
+def test_workflow_method_returns_result(loop):
+    service = FakeService()
+    service.history_responses.append(GetWorkflowExecutionHistoryResponse(history=History(events=[])))
+    client = create_client(service)
+    stub = client.new_workflow_stub(GreetingWorkflow)
+    assert loop.run_until_complete(stub.get_greeting("bob")) == "hello"
+    assert stub._execution.run_id
+
+
+def test_wait_for_close_raises(loop):
+    service = FakeService()
+    service.history_responses.append(close_event(EventType.WorkflowExecutionTerminated,
+                                                 workflow_execution_terminated_event_attributes=Mock(
+                                                     reason="r", details=b"", identity="i")))
+    client = create_client(service)
+    with pytest.raises(WorkflowExecutionTerminatedException):
+        loop.run_until_complete(client.wait_for_close_with_workflow_id("wid"))
+
+
+def test_signal_and_query(loop):
+    service = FakeService()
+    client = create_client(service)
+    stub = client.new_workflow_stub_from_workflow_id(GreetingWorkflow, "wid")
+    loop.run_until_complete(stub.set_name("bob"))
+    assert loop.run_until_complete(stub.get_name()) == "bob"
+    signal, query = service.requests
+    assert signal.workflow_execution.workflow_id == "wid"
+    assert signal.signal_name == "GreetingWorkflow::set_name"
+    assert signal.input == b'"bob"'
+    assert query.query.query_type == "GreetingWorkflow::get_name"
+
+
+def test_call_error(loop):
+    service = Mock()
+    service.signal_workflow_execution = Mock(return_value=(None, "boom"))
+    client = create_client(service)
+    stub = client.new_workflow_stub_from_workflow_id(GreetingWorkflow, "wid")
+    with pytest.raises(Exception, match="boom"):
+        loop.run_until_complete(stub.set_name("bob"))
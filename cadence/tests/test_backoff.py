@@ -0,0 +1,229 @@
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+from cadence.backoff import BackoffPolicy, CircuitBreaker, CircuitState, Backoff, CircuitOpenError, is_retryable
+from cadence.errors import ServiceBusyError, BadRequestError
+from cadence.tchannel import TChannelException
+from cadence.worker import Worker, WorkerOptions
+from cadence.workflow import WorkflowClient, WorkflowClientOptions
+from cadence.workflowservice import WorkflowService
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def busy_response():
+    return SimpleNamespace(success=None, serviceBusyError=SimpleNamespace(message="busy"))
+
+
+def bad_request_response():
+    return SimpleNamespace(success=None, badRequestError=SimpleNamespace(message="bad"))
+
+
+def success_response():
+    return SimpleNamespace(success=None)
+
+
+def test_backoff_policy_interval():
+    policy = BackoffPolicy(initial_interval_seconds=1, backoff_coefficient=2, maximum_interval_seconds=5, jitter=0)
+    assert [policy.get_interval(attempt) for attempt in range(1, 6)] == [1, 2, 4, 5, 5]
+
+
+def test_backoff_policy_jitter():
+    policy = BackoffPolicy(initial_interval_seconds=1, jitter=0.5)
+    for _ in range(100):
+        assert 0.5 <= policy.get_interval(1) <= 1
+
+
+def test_backoff_policy_should_retry():
+    assert BackoffPolicy().should_retry(1000)
+    policy = BackoffPolicy(maximum_attempts=3)
+    assert policy.should_retry(2)
+    assert not policy.should_retry(3)
+
+
+def test_is_retryable():
+    assert is_retryable(ServiceBusyError("busy"))
+    assert is_retryable(TChannelException())
+    assert is_retryable(ConnectionResetError())
+    assert not is_retryable(BadRequestError("bad"))
+    assert not is_retryable(None)
+
+
+def test_circuit_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, open_seconds=10, recovery_seconds=10, clock=clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.get_state() == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.get_state() == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+    clock.now = 10
+    assert breaker.get_state() == CircuitState.HALF_OPEN
+    # No request is let through at the beginning of the recovery period
+    assert not breaker.allow_request()
+    clock.now = 19.99
+    assert sum(breaker.allow_request() for _ in range(100)) > 90
+
+    clock.now = 20
+    assert breaker.get_state() == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+
+def test_circuit_breaker_reopens_on_half_open_failure():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, open_seconds=10, recovery_seconds=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 15
+    assert breaker.get_state() == CircuitState.HALF_OPEN
+    breaker.record_failure()
+    assert breaker.get_state() == CircuitState.OPEN
+    clock.now = 24
+    assert breaker.get_state() == CircuitState.OPEN
+
+
+def test_circuit_breaker_success_resets_failures():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.get_state() == CircuitState.CLOSED
+
+
+def test_backoff_wait():
+    sleep = Mock()
+    backoff = Backoff(BackoffPolicy(initial_interval_seconds=1, jitter=0))
+    backoff.wait(sleep)
+    sleep.assert_not_called()
+    backoff.failure()
+    backoff.failure()
+    backoff.wait(sleep)
+    sleep.assert_called_once_with(2)
+    backoff.success()
+    sleep.reset_mock()
+    backoff.wait(sleep)
+    sleep.assert_not_called()
+
+
+def test_backoff_wait_for_circuit_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, open_seconds=10, recovery_seconds=0.001, clock=clock)
+    backoff = Backoff(BackoffPolicy(initial_interval_seconds=1, jitter=0), breaker)
+    backoff.failure()
+
+    def sleep(seconds):
+        clock.now += seconds
+
+    backoff.wait(sleep)
+    assert clock.now >= 10
+    assert breaker.allow_request()
+
+
+@pytest.fixture
+def service():
+    return WorkflowService(Mock(), retry_policy=BackoffPolicy(maximum_attempts=3))
+
+
+@patch("cadence.workflowservice.time.sleep")
+def test_service_retries_transient_errors(sleep, service):
+    service.thrift_call = Mock(side_effect=[busy_response(), success_response()])
+    response, err = service.call_void("RespondActivityTaskCompleted", None)
+    assert err is None
+    assert service.thrift_call.call_count == 2
+    sleep.assert_called_once()
+
+
+@patch("cadence.workflowservice.time.sleep")
+def test_service_gives_up_after_maximum_attempts(sleep, service):
+    service.thrift_call = Mock(return_value=busy_response())
+    response, err = service.call_void("RespondActivityTaskCompleted", None)
+    assert isinstance(err, ServiceBusyError)
+    assert service.thrift_call.call_count == 3
+
+
+@patch("cadence.workflowservice.time.sleep")
+def test_service_does_not_retry_other_errors(sleep, service):
+    service.thrift_call = Mock(return_value=bad_request_response())
+    response, err = service.call_void("RespondActivityTaskCompleted", None)
+    assert isinstance(err, BadRequestError)
+    assert service.thrift_call.call_count == 1
+    sleep.assert_not_called()
+
+
+def test_service_circuit_breaker():
+    breaker = CircuitBreaker(failure_threshold=2)
+    service = WorkflowService(Mock(), circuit_breaker=breaker)
+    service.thrift_call = Mock(side_effect=TChannelException())
+    for _ in range(2):
+        with pytest.raises(TChannelException):
+            service.call_void("RespondActivityTaskCompleted", None)
+    response, err = service.call_void("RespondActivityTaskCompleted", None)
+    assert isinstance(err, CircuitOpenError)
+    assert service.thrift_call.call_count == 2
+
+
+@patch("cadence.workflowservice.time.sleep")
+def test_service_retries_transport_errors_on_new_connection(sleep):
+    connections = [Mock(), Mock()]
+    connect = Mock(side_effect=connections)
+    service = WorkflowService(Mock(), retry_policy=BackoffPolicy(maximum_attempts=3), connect=connect)
+    broken = service.connection
+    service.thrift_call = Mock(side_effect=[OSError("connection reset"), EOFError(), success_response()])
+    response, err = service.call_void("RespondActivityTaskCompleted", None)
+    assert err is None
+    assert service.thrift_call.call_count == 3
+    assert connect.call_count == 2
+    broken.close.assert_called_once()
+    assert service.connection is connections[1]
+
+
+def test_clone_service_on_new_connection():
+    retry_policy = BackoffPolicy(maximum_attempts=3)
+    connect = Mock()
+    service = WorkflowService(Mock(), retry_policy=retry_policy, connect=connect)
+    clone = service.clone()
+    assert clone.connection is connect.return_value
+    assert clone.retry_policy is retry_policy
+    assert WorkflowService(Mock()).clone() is None
+
+
+@patch("cadence.workflowservice.time.sleep")
+def test_service_gives_up_on_transport_errors(sleep, service):
+    service.thrift_call = Mock(side_effect=TChannelException())
+    with pytest.raises(TChannelException):
+        service.call_void("RespondActivityTaskCompleted", None)
+    assert service.thrift_call.call_count == 3
+
+
+@patch("cadence.workflowservice.WorkflowService.create")
+def test_worker_services_use_options(create):
+    retry_policy = BackoffPolicy(maximum_attempts=2)
+    worker = Worker(options=WorkerOptions(service_retry_policy=retry_policy,
+                                          service_circuit_breaker_failure_threshold=3))
+    worker.service_circuit_breaker = CircuitBreaker(failure_threshold=3)
+    worker.create_service()
+    with worker.create_service_pool(1).acquire():
+        pass
+    for c in create.call_args_list:
+        assert c.kwargs["retry_policy"] is retry_policy
+        assert c.kwargs["circuit_breaker"] is worker.service_circuit_breaker
+    assert create.call_count == 2
+
+
+@patch("cadence.workflowservice.WorkflowService.create")
+def test_client_services_use_options(create):
+    retry_policy = BackoffPolicy(maximum_attempts=2)
+    WorkflowClient.new_client(options=WorkflowClientOptions(service_retry_policy=retry_policy,
+                                                            service_circuit_breaker_failure_threshold=3))
+    assert create.call_args.kwargs["retry_policy"] is retry_policy
+    assert create.call_args.kwargs["circuit_breaker"].failure_threshold == 3
@@ -0,0 +1,104 @@
+import json
+import threading
+import time
+
+from cadence.batch import BatchRunner, SignalOperation, TerminateOperation, CancelOperation
+from cadence.cadence_types import WorkflowExecution, WorkflowExecutionInfo, ListWorkflowExecutionsResponse
+from cadence.errors import EntityNotExistsError
+from cadence.workflowservice import WorkflowServicePool
+
+
+class FakeService:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.lock = threading.Lock()
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+
+    def record(self, request):
+        with self.lock:
+            self.requests.append(request)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.002)
+        with self.lock:
+            self.active -= 1
+        if request.workflow_execution.workflow_id in self.failing:
+            return None, EntityNotExistsError(message="workflow execution already completed")
+        return None, None
+
+    def signal_workflow_execution(self, request):
+        return self.record(request)
+
+    def terminate_workflow_execution(self, request):
+        return self.record(request)
+
+    def request_cancel_workflow_execution(self, request):
+        return self.record(request)
+
+    def scan_workflow_executions(self, request):
+        if request.next_page_token:
+            return ListWorkflowExecutionsResponse(executions=[
+                WorkflowExecutionInfo(execution=WorkflowExecution(workflow_id="c", run_id="3"))]), None
+        return ListWorkflowExecutionsResponse(executions=[
+            WorkflowExecutionInfo(execution=WorkflowExecution(workflow_id=w, run_id=r)) for w, r in [("a", "1"),
+                                                                                                  ("b", "2")]],
+            next_page_token=b"next"), None
+
+    def close(self):
+        pass
+
+
+def test_signal_with_bounded_concurrency():
+    service = FakeService(failing=["wf-3"])
+    updates = []
+    runner = BatchRunner(WorkflowServicePool(lambda: service, 4), "domain", progress_callback=updates.append)
+    progress = runner.run(SignalOperation("Workflow::stop", ["now"]), ["wf-%d" % i for i in range(40)])
+    assert (progress.succeeded, progress.failed, progress.skipped) == (39, 1, 0)
+    assert progress.errors[0].workflow_id == "wf-3"
+    assert "already completed" in progress.errors[0].error
+    assert 1 < service.max_active <= 4
+    assert len(updates) == 40
+    assert max(u.processed for u in updates) == 40
+    request = service.requests[0]
+    assert (request.domain, request.signal_name, request.input) == ("domain", "Workflow::stop", b'"now"')
+
+
+def test_run_query():
+    service = FakeService()
+    runner = BatchRunner(WorkflowServicePool(lambda: service, 2), "domain")
+    progress = runner.run_query(TerminateOperation(reason="cleanup"), "WorkflowType = 'T'")
+    assert progress.succeeded == 3
+    assert sorted((r.workflow_execution.workflow_id, r.reason) for r in service.requests) == [
+        ("a", "cleanup"), ("b", "cleanup"), ("c", "cleanup")]
+
+
+def test_resume_from_checkpoint(tmp_path):
+    checkpoint_path = str(tmp_path / "batch.jsonl")
+    targets = [WorkflowExecution(workflow_id="wf-%d" % i, run_id="run") for i in range(10)]
+    service = FakeService(failing=["wf-1"])
+    runner = BatchRunner(WorkflowServicePool(lambda: service, 2), "domain", checkpoint_path=checkpoint_path)
+    first = runner.run(CancelOperation(), targets)
+    assert (first.succeeded, first.failed) == (9, 1)
+    first_request_ids = {r.workflow_execution.workflow_id: r.request_id for r in service.requests}
+
+    # Resumed by a new process: only the failed execution is sent again, with the same request id
+    service = FakeService()
+    runner = BatchRunner(WorkflowServicePool(lambda: service, 2), "domain", checkpoint_path=checkpoint_path)
+    second = runner.run(CancelOperation(), targets)
+    assert (second.succeeded, second.failed, second.skipped) == (1, 0, 9)
+    assert [r.workflow_execution.workflow_id for r in service.requests] == ["wf-1"]
+    assert service.requests[0].request_id == first_request_ids["wf-1"]
+    with open(checkpoint_path) as f:
+        lines = [json.loads(line) for line in f]
+    assert "batch_id" in lines[0]
+    assert len(lines) == 1 + 10 + 1
+
+
+def test_rate_limit():
+    service = FakeService()
+    runner = BatchRunner(WorkflowServicePool(lambda: service, 4), "domain", rate_limit=50)
+    runner.run(CancelOperation(), ["wf-%d" % i for i in range(60)])
+    # The burst covers 50 of them, refills while those run make the exact count vary
+    assert runner.rate_limiter.get_stats().throttled > 0
@@ -0,0 +1,115 @@
+import asyncio
+import os
+from unittest.mock import Mock
+
+import pytest
+
+from cadence.blob_store import FileSystemBlobStore, BlobStoreCodec, BlobCache, BlobNotFoundError, \
+    BlobIntegrityError, BLOB_REFERENCE_MAGIC
+from cadence.cadence_types import HistoryEvent, ActivityTaskCompletedEventAttributes
+from cadence.data_converter import JSONDataConverter
+from cadence.decision_loop import DecisionContext
+from cadence.payload_codec import ChainedCodec, CompressionCodec, CodecDataConverter
+
+LARGE_PAYLOAD = b'"' + b"x" * 2000 + b'"'
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FileSystemBlobStore(str(tmp_path / "blobs"))
+
+
+def test_file_system_store(store):
+    store.put("key", b"data")
+    store.put("key", b"data")
+    assert store.get("key") == b"data"
+    with pytest.raises(BlobNotFoundError):
+        store.get("missing")
+
+
+def test_cache_eviction():
+    cache = BlobCache(max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"
+    cache.put("c", b"cccc")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("c") == b"cccc"
+    cache.put("d", b"d" * 11)
+    assert cache.get("d") is None
+    assert cache.size_bytes == 8
+
+
+def test_offload(store):
+    codec = BlobStoreCodec(store, threshold_bytes=1000)
+    assert codec.encode(b'"small"') == b'"small"'
+    reference = codec.encode(LARGE_PAYLOAD)
+    assert reference.startswith(BLOB_REFERENCE_MAGIC)
+    assert len(reference) < 100
+    assert codec.encode(LARGE_PAYLOAD) == reference
+    # A different worker resolves the reference from the store, then from its cache
+    other = BlobStoreCodec(store)
+    assert other.decode(reference) == LARGE_PAYLOAD
+    assert other.decode(reference) == LARGE_PAYLOAD
+    assert (other.cache.hits, other.cache.misses) == (1, 1)
+    assert other.decode(b'"small"') == b'"small"'
+
+
+def test_reject_invalid_reference(store, tmp_path):
+    (tmp_path / "secret").write_bytes(b"secret")
+    codec = BlobStoreCodec(store)
+    for key in [b"../secret", b"sha256-" + b"0" * 63, b"sha256-" + b"A" * 64]:
+        with pytest.raises(ValueError):
+            codec.decode(BLOB_REFERENCE_MAGIC + key)
+    with pytest.raises(ValueError):
+        store.get("../secret")
+
+
+def test_reject_modified_blob(store):
+    reference = BlobStoreCodec(store, threshold_bytes=1000).encode(LARGE_PAYLOAD)
+    key = reference[len(BLOB_REFERENCE_MAGIC):].decode("ascii")
+    with open(os.path.join(store.directory, key), "wb") as f:
+        f.write(b'"tampered"')
+    with pytest.raises(BlobIntegrityError):
+        BlobStoreCodec(store).decode(reference)
+
+
+def test_chained_codec(store):
+    codec = ChainedCodec([CompressionCodec(threshold_bytes=100), BlobStoreCodec(store, threshold_bytes=1000)])
+    assert codec.name == "zlib+blob_store"
+    # Compressed below the offload threshold: kept in history
+    compressed = codec.encode(LARGE_PAYLOAD)
+    assert not compressed.startswith(BLOB_REFERENCE_MAGIC)
+    assert codec.decode(compressed) == LARGE_PAYLOAD
+    incompressible = os.urandom(2000)
+    reference = codec.encode(incompressible)
+    assert reference.startswith(BLOB_REFERENCE_MAGIC)
+    assert codec.decode(reference) == incompressible
+
+
+def test_activity_result_resolved_when_awaited(store):
+    converter = CodecDataConverter(JSONDataConverter(), BlobStoreCodec(store, threshold_bytes=1000))
+    reference = converter.to_payload("x" * 2000)
+    store.get = Mock(wraps=store.get)
+    converter.codec.cache = BlobCache()
+
+    loop = asyncio.new_event_loop()
+    try:
+        decider = Mock()
+        decider.schedule_activity_task = Mock(return_value=5)
+        decider.event_loop.create_future = loop.create_future
+        context = DecisionContext(decider=decider, data_converter=converter)
+        params = Mock(activity_id="1", heartbeat_timeout_seconds=0, retry_parameters=None)
+        task = loop.create_task(context.schedule_activity_task(params))
+        loop.call_soon(loop.stop)
+        loop.run_forever()
+
+        event = HistoryEvent(activity_task_completed_event_attributes=ActivityTaskCompletedEventAttributes(
+            scheduled_event_id=5, result=reference))
+        context.handle_activity_task_completed(event)
+        store.get.assert_not_called()
+        assert loop.run_until_complete(task) == "x" * 2000
+        store.get.assert_called_once()
+    finally:
+        loop.close()
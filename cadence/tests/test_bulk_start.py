@@ -0,0 +1,97 @@
+import asyncio
+import threading
+
+import pytest
+
+from cadence.async_client import AsyncWorkflowClient
+from cadence.backoff import BackoffPolicy
+from cadence.bulk_start import start_workflows
+from cadence.cadence_types import StartWorkflowExecutionResponse
+from cadence.errors import WorkflowExecutionAlreadyStartedError, ServiceBusyError, BadRequestError
+from cadence.workflow import workflow_method, WorkflowOptions
+from cadence.workflowservice import WorkflowServicePool
+
+NO_WAIT = BackoffPolicy(initial_interval_seconds=0.001, maximum_interval_seconds=0.001)
+
+
+class BackfillWorkflow:
+    @workflow_method(task_list="backfill")
+    async def backfill(self, day):
+        raise NotImplementedError
+
+
+class FakeService:
+    def __init__(self, busy_responses=0):
+        self.lock = threading.Lock()
+        self.requests = []
+        self.busy_responses = busy_responses
+
+    def start_workflow(self, request):
+        with self.lock:
+            self.requests.append(request)
+            if self.busy_responses:
+                self.busy_responses -= 1
+                return None, ServiceBusyError(message="busy")
+        if request.workflow_id == "existing":
+            return None, WorkflowExecutionAlreadyStartedError(message="started", startRequestId="r", runId="run-0")
+        if request.workflow_id == "bad":
+            return None, BadRequestError(message="bad request")
+        return StartWorkflowExecutionResponse(run_id="run-" + request.workflow_id), None
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def run_all(loop, client, items, **kwargs):
+    async def collect():
+        return [result async for result in start_workflows(client, items, **kwargs)]
+
+    return loop.run_until_complete(collect())
+
+
+def test_start_workflows(loop):
+    service = FakeService()
+    client = AsyncWorkflowClient(service_pool=WorkflowServicePool(lambda: service, 4), domain="domain")
+    stub = client.new_workflow_stub(BackfillWorkflow)
+    ids = ["day-%d" % i for i in range(50)] + ["existing", "bad"]
+    items = ((stub.backfill, [workflow_id], WorkflowOptions(workflow_id=workflow_id)) for workflow_id in ids)
+    results = sorted(run_all(loop, client, items), key=lambda r: r.index)
+    client.close()
+
+    assert [r.workflow_id for r in results] == ids
+    assert all(r.run_id == "run-" + r.workflow_id and not r.error for r in results[:50])
+    assert results[50].already_started and results[50].run_id == "run-0"
+    assert isinstance(results[51].error, BadRequestError)
+    assert {r.task_list.name for r in service.requests} == {"backfill"}
+    assert service.requests[0].input == b'"day-0"'
+
+
+def test_retry_service_busy(loop):
+    service = FakeService(busy_responses=3)
+    client = AsyncWorkflowClient(service_pool=WorkflowServicePool(lambda: service, 2), domain="domain")
+    stub = client.new_workflow_stub(BackfillWorkflow)
+    items = [(stub.backfill, [i], None) for i in range(10)]
+    results = run_all(loop, client, items, busy_backoff=NO_WAIT)
+    client.close()
+    assert all(r.run_id and not r.error for r in results)
+    assert len(service.requests) == 13
+    # A retried start keeps its request id
+    assert len({r.request_id for r in service.requests}) == 10
+
+
+def test_busy_retries_exhausted(loop):
+    service = FakeService(busy_responses=100)
+    client = AsyncWorkflowClient(service_pool=WorkflowServicePool(lambda: service, 2), domain="domain")
+    stub = client.new_workflow_stub(BackfillWorkflow)
+    policy = BackoffPolicy(initial_interval_seconds=0.001, maximum_interval_seconds=0.001, maximum_attempts=2)
+    results = run_all(loop, client, [(stub.backfill, [1], None)], busy_backoff=policy)
+    client.close()
+    assert isinstance(results[0].error, ServiceBusyError)
+    assert len(service.requests) == 2
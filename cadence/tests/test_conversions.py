@@ -111,3 +111,26 @@ class TestCopyPyToThrift(TestCase):
         thrift_object = copy_py_to_thrift(register_domain)
         self.assertIsInstance(thrift_object, cadence_thrift.shared.RegisterDomainRequest)
         self.assertEqual("test", thrift_object.data["name"])
+
+
+class TestGeneratedTypes(TestCase):
+
+    def test_slots(self):
+        event = HistoryEvent(event_id=1, event_type=EventType.WorkflowExecutionStarted)
+        self.assertFalse(hasattr(event, "__dict__"))
+        with self.assertRaises(AttributeError):
+            event.not_a_field = 1
+        self.assertEqual(HistoryEvent(event_id=1, event_type=EventType.WorkflowExecutionStarted), event)
+        self.assertEqual([], History().events)
+        self.assertIsNot(History().events, History().events)
+
+    def test_value_for(self):
+        self.assertIs(EventType.MarkerRecorded, EventType.value_for(26))
+        self.assertIsNone(EventType.value_for(1000))
+
+    def test_copy_thrift_to_py(self):
+        history = cadence_thrift.shared.History(events=[cadence_thrift.shared.HistoryEvent(eventId=i, eventType=0)
+                                                        for i in range(3)])
+        events = copy_thrift_to_py(history).events
+        self.assertEqual([0, 1, 2], [e.event_id for e in events])
+        self.assertEqual(EventType.WorkflowExecutionStarted, events[0].event_type)
@@ -0,0 +1,105 @@
+import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from cadence.activity import complete
+from cadence.cadence_types import RespondActivityTaskCompletedRequest, SignalWorkflowExecutionRequest, \
+    WorkflowExecution
+from cadence.conversions import args_to_json
+from cadence.data_converter import JSONDataConverter, OrjsonDataConverter, MsgpackDataConverter, \
+    PickleDataConverter, DEFAULT_DATA_CONVERTER
+from cadence.decision_loop import ReplayDecider
+from cadence.workflow import WorkflowClient, WorkflowClientOptions, signal_method
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+VALUES = [None, 1, "one", [1, "one"], {"name": "bob", "age": 25}]
+
+
+def converters():
+    converters = [JSONDataConverter(), PickleDataConverter()]
+    if orjson:
+        converters.append(OrjsonDataConverter())
+    if msgpack:
+        converters.append(MsgpackDataConverter())
+    return converters
+
+
+@pytest.mark.parametrize("converter", converters(), ids=lambda c: type(c).__name__)
+def test_round_trip(converter):
+    for value in VALUES:
+        payload = converter.to_payload(value)
+        assert isinstance(payload, bytes)
+        assert converter.from_payload(payload) == value
+    assert converter.from_payload(None) is None
+    assert converter.from_payload(b"") is None
+
+
+@pytest.mark.parametrize("converter", converters(), ids=lambda c: type(c).__name__)
+def test_args(converter):
+    assert converter.payload_to_args(converter.args_to_payload([])) == []
+    assert converter.payload_to_args(converter.args_to_payload(["bob"])) == ["bob"]
+    assert converter.payload_to_args(converter.args_to_payload(("bob", 25))) == ["bob", 25]
+
+
+def test_json_compatible_with_args_to_json():
+    for args in [[], ["bob"], ["bob", 25]]:
+        assert DEFAULT_DATA_CONVERTER.args_to_payload(args) == args_to_json(args).encode("utf-8")
+
+
+@pytest.mark.skipif(not orjson, reason="orjson is not installed")
+def test_orjson_interoperable_with_json():
+    value = {"name": "bob", "scores": [1, 2.5]}
+    assert JSONDataConverter().from_payload(OrjsonDataConverter().to_payload(value)) == value
+    assert OrjsonDataConverter().from_payload(JSONDataConverter().to_payload(value)) == value
+
+
+def test_pickle_python_objects():
+    value = datetime.datetime(2020, 1, 1)
+    converter = PickleDataConverter()
+    assert converter.from_payload(converter.to_payload(value)) == value
+
+
+def test_activity_complete():
+    service = Mock()
+    service.respond_activity_task_completed = Mock(return_value=(None, None))
+    converter = PickleDataConverter()
+    complete(service, b"task-token", {"a": 1}, converter)
+    request: RespondActivityTaskCompletedRequest = service.respond_activity_task_completed.call_args[0][0]
+    assert converter.from_payload(request.result) == {"a": 1}
+
+
+def test_client_signal():
+    class DummyWorkflow:
+        @signal_method
+        def greet(self, name, age):
+            pass
+
+    converter = PickleDataConverter()
+    service = Mock()
+    service.signal_workflow_execution = Mock(return_value=(None, None))
+    client = WorkflowClient(service=service, domain="domain", options=WorkflowClientOptions(data_converter=converter))
+    stub = client.new_workflow_stub(DummyWorkflow)
+    stub._execution = WorkflowExecution(workflow_id="workflow-id", run_id="run-id")
+    stub.greet("bob", 25)
+    request: SignalWorkflowExecutionRequest = service.signal_workflow_execution.call_args[0][0]
+    assert converter.payload_to_args(request.input) == ["bob", 25]
+
+
+def test_decider_result():
+    converter = PickleDataConverter()
+    decider = ReplayDecider(execution_id="execution-id", workflow_type=Mock(), worker=Mock(), data_converter=converter)
+    assert decider.decision_context.data_converter is converter
+    decider.complete_workflow_execution(datetime.date(2020, 1, 1))
+    decision = list(decider.decisions.values())[0].get_decision()
+    assert converter.from_payload(decision.complete_workflow_execution_decision_attributes.result) == \
+        datetime.date(2020, 1, 1)
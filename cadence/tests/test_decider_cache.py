@@ -0,0 +1,159 @@
+import json
+import os
+import threading
+from copy import deepcopy
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from cadence.cadence_types import EventType, HistoryEvent, PollForDecisionTaskResponse, WorkflowQuery, History, \
+    GetWorkflowExecutionHistoryResponse, RespondDecisionTaskCompletedResponse, WorkflowExecutionSignaledEventAttributes
+from cadence.decider_cache import DeciderCache
+from cadence.decision_loop import DecisionTaskLoop, is_decider_current
+from cadence.metrics import InMemoryMetricsScope, DECIDER_CACHE_HIT, DECIDER_CACHE_MISS, DECIDER_CACHE_SIZE
+from cadence.tests.test_decision_loop import make_history
+from cadence.tests.utils import json_to_data_class
+from cadence.worker import Worker, WorkerOptions
+from cadence.workflow import workflow_method, query_method, Workflow
+
+__location__ = os.path.dirname(__file__)
+
+
+class TestIsDeciderCurrent(TestCase):
+
+    def test_no_new_events(self):
+        events = make_history([EventType.WorkflowExecutionStarted, EventType.DecisionTaskScheduled,
+                               EventType.DecisionTaskStarted])
+        self.assertTrue(is_decider_current(3, events))
+
+    def test_decision_events(self):
+        events = make_history([EventType.WorkflowExecutionStarted, EventType.DecisionTaskScheduled,
+                               EventType.DecisionTaskStarted, EventType.DecisionTaskCompleted,
+                               EventType.ActivityTaskScheduled, EventType.TimerStarted])
+        self.assertTrue(is_decider_current(3, events))
+
+    def test_new_external_event(self):
+        events = make_history([EventType.WorkflowExecutionStarted, EventType.DecisionTaskScheduled,
+                               EventType.DecisionTaskStarted, EventType.DecisionTaskCompleted,
+                               EventType.ActivityTaskScheduled, EventType.ActivityTaskStarted])
+        self.assertFalse(is_decider_current(3, events))
+
+    def test_history_older_than_decider(self):
+        events = make_history([EventType.WorkflowExecutionStarted, EventType.DecisionTaskScheduled,
+                               EventType.DecisionTaskStarted])
+        self.assertFalse(is_decider_current(6, events))
+
+
+class TestDeciderCache(TestCase):
+
+    def setUp(self) -> None:
+        with open(os.path.join(__location__, "workflow_started_decision_task_response.json")) as fp:
+            self.decision_task: PollForDecisionTaskResponse = json_to_data_class(json.loads(fp.read()),
+                                                                                 PollForDecisionTaskResponse)
+        self.metrics_scope = InMemoryMetricsScope()
+        self.worker = Worker(options=WorkerOptions(decider_cache_size=2))
+        self.worker.metrics_scope = self.metrics_scope
+        self.loop = DecisionTaskLoop(worker=self.worker, decider_cache=DeciderCache(2))
+        self.instances = []
+        instances = self.instances
+
+        class DummyWorkflow:
+            def __init__(self):
+                self.status = "started"
+                instances.append(self)
+
+            @workflow_method()
+            async def dummy(self):
+                await Workflow.await_till(lambda: self.status == "done")
+
+            @query_method(name="DummyWorkflow::get_status")
+            async def get_status(self, suffix=""):
+                return self.status + suffix
+
+        self.worker.register_workflow_implementation_type(DummyWorkflow)
+
+    def query_task(self, extra_event_types=(EventType.DecisionTaskCompleted,), workflow_id=None):
+        query_task = deepcopy(self.decision_task)
+        events = query_task.history.events
+        for event_type in extra_event_types:
+            events.append(HistoryEvent(event_id=len(events) + 1, event_type=event_type,
+                                       timestamp=events[-1].timestamp))
+        if workflow_id:
+            query_task.workflow_execution.workflow_id = workflow_id
+        query_task.query = WorkflowQuery(query_type="DummyWorkflow::get_status", query_args=b'["!"]')
+        return query_task
+
+    def test_query_cached_decider(self):
+        self.loop.process_task(self.decision_task)
+        self.assertEqual(1, len(self.instances))
+        self.instances[0].status = "running"
+        self.assertEqual(b'"running!"', self.loop.process_query(self.query_task()))
+        self.assertEqual(1, len(self.instances))
+        self.assertEqual(1, self.metrics_scope.get_counter(DECIDER_CACHE_HIT,
+                                                           {"workflow_type": "DummyWorkflow::dummy"}))
+        self.assertEqual(1, self.loop.decider_cache.hits)
+
+    def test_replay_when_history_has_new_events(self):
+        self.loop.process_task(self.decision_task)
+        self.instances[0].status = "running"
+        query_task = self.query_task([EventType.DecisionTaskCompleted, EventType.WorkflowExecutionSignaled])
+        self.assertEqual(b'"started!"', self.loop.process_query(query_task))
+        self.assertEqual(2, len(self.instances))
+        self.assertEqual(1, self.metrics_scope.get_counter(DECIDER_CACHE_MISS,
+                                                           {"workflow_type": "DummyWorkflow::dummy"}))
+
+    def test_replay_without_cached_decider(self):
+        self.assertEqual(b'"started!"', self.loop.process_query(self.query_task()))
+        self.assertEqual(1, self.loop.decider_cache.misses)
+        self.assertEqual(0, self.loop.decider_cache.size())
+
+    def inline_task(self):
+        # Sticky task returned inline: only the events since the previous decision task
+        timestamp = self.decision_task.history.events[-1].timestamp
+        events = [HistoryEvent(event_id=4, event_type=EventType.DecisionTaskCompleted, timestamp=timestamp),
+                  HistoryEvent(event_id=5, event_type=EventType.WorkflowExecutionSignaled, timestamp=timestamp,
+                               workflow_execution_signaled_event_attributes=WorkflowExecutionSignaledEventAttributes(
+                                   signal_name="DummyWorkflow::unknown", input=b"[]")),
+                  HistoryEvent(event_id=6, event_type=EventType.DecisionTaskScheduled, timestamp=timestamp),
+                  HistoryEvent(event_id=7, event_type=EventType.DecisionTaskStarted, timestamp=timestamp)]
+        return PollForDecisionTaskResponse(task_token=b"next-task-token",
+                                           workflow_execution=self.decision_task.workflow_execution,
+                                           workflow_type=self.decision_task.workflow_type,
+                                           previous_started_event_id=3, started_event_id=7,
+                                           history=History(events=events))
+
+    def test_partial_history_not_cached(self):
+        with patch("cadence.decision_loop.ReplayDecider.decide", Mock(return_value=[])):
+            self.loop.process_task(self.inline_task())
+        self.assertEqual(0, self.loop.decider_cache.size())
+
+    def test_cache_inline_task_replayed_from_full_history(self):
+        inline_task = self.inline_task()
+        full_history = self.decision_task.history.events + inline_task.history.events
+        self.loop.service = Mock()
+        self.loop.service.get_workflow_execution_history = Mock(return_value=(
+            GetWorkflowExecutionHistoryResponse(history=History(events=full_history)), None))
+        self.loop.service.respond_decision_task_completed = Mock(
+            return_value=(RespondDecisionTaskCompletedResponse(), None))
+        self.loop.handle_decision_task(inline_task)
+        run_key = (inline_task.workflow_execution.workflow_id, inline_task.workflow_execution.run_id)
+        self.assertEqual(7, self.loop.decider_cache.get(run_key).last_event_id)
+        self.assertEqual(1, len(self.instances))
+
+    def test_evict_least_recently_used(self):
+        for workflow_id in ["a", "b", "c"]:
+            decision_task = deepcopy(self.decision_task)
+            decision_task.workflow_execution.workflow_id = workflow_id
+            self.loop.process_task(decision_task)
+        run_id = self.decision_task.workflow_execution.run_id
+        self.assertEqual(list(self.loop.decider_cache.deciders), [("b", run_id), ("c", run_id)])
+        self.assertEqual(2, self.metrics_scope.get_gauge(DECIDER_CACHE_SIZE))
+
+    def test_query_from_another_thread(self):
+        self.loop.process_task(self.decision_task)
+        self.instances[0].status = "running"
+        results = []
+        thread = threading.Thread(target=lambda: results.append(self.loop.process_query(self.query_task())))
+        thread.start()
+        thread.join()
+        self.assertEqual([b'"running!"'], results)
+        self.assertEqual(1, len(self.instances))
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+from typing import List
+
+from cadence.cadence_types import PollForDecisionTaskResponse, WorkflowExecution
+from cadence.decision_executor import DecisionTaskExecutor
+
+
+def make_task(workflow_id: str, run_id: str = "run-id", token: bytes = b"") -> PollForDecisionTaskResponse:
+    return PollForDecisionTaskResponse(task_token=token,
+                                       workflow_execution=WorkflowExecution(workflow_id=workflow_id, run_id=run_id))
+
+
+def submit(executor: DecisionTaskExecutor, task: PollForDecisionTaskResponse):
+    assert executor.acquire_slot(timeout=1)
+    executor.submit(task)
+
+
+def test_same_workflow_serialized():
+    running = 0
+    max_running = 0
+    order: List[bytes] = []
+    lock = threading.Lock()
+
+    def handler(task: PollForDecisionTaskResponse):
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+            order.append(task.task_token)
+
+    executor = DecisionTaskExecutor(handler, 4)
+    for i in range(4):
+        submit(executor, make_task("workflow-1", token=bytes([i])))
+    executor.shutdown()
+    assert max_running == 1
+    assert order == [bytes([i]) for i in range(4)]
+
+
+def test_different_workflows_concurrent():
+    barrier = threading.Barrier(3, timeout=2)
+
+    def handler(task: PollForDecisionTaskResponse):
+        barrier.wait()
+
+    executor = DecisionTaskExecutor(handler, 3)
+    for i in range(3):
+        submit(executor, make_task(f"workflow-{i}"))
+    executor.shutdown()
+    assert not barrier.broken
+
+
+def test_slots_limit_in_flight_tasks():
+    release = threading.Event()
+    executor = DecisionTaskExecutor(lambda task: release.wait(), 2)
+    submit(executor, make_task("workflow-1"))
+    submit(executor, make_task("workflow-2"))
+    assert not executor.acquire_slot(timeout=0.05)
+    release.set()
+    assert executor.acquire_slot(timeout=1)
+    executor.release_slot()
+    executor.shutdown()
+
+
+def test_handler_exception_releases_slot():
+    def handler(task):
+        raise Exception("handler failed")
+
+    executor = DecisionTaskExecutor(handler, 1)
+    submit(executor, make_task("workflow-1"))
+    assert executor.acquire_slot(timeout=1)
+    executor.release_slot()
+    executor.shutdown()
+
+
+def test_event_loop_per_thread():
+    loops = []
+
+    def handler(task):
+        loops.append(asyncio.get_event_loop())
+
+    executor = DecisionTaskExecutor(handler, 2)
+    submit(executor, make_task("workflow-1"))
+    executor.shutdown()
+    assert loops[0] is not None
@@ -1,5 +1,6 @@
 import json
 import os
+import time
 from typing import List
 from unittest import TestCase
 from unittest.mock import Mock, MagicMock
@@ -7,17 +8,26 @@ from unittest.mock import Mock, MagicMock
 from cadence.cadence_types import HistoryEvent, EventType, PollForDecisionTaskResponse, \
     ScheduleActivityTaskDecisionAttributes, WorkflowExecutionStartedEventAttributes, Decision, \
     ActivityTaskStartedEventAttributes, MarkerRecordedEventAttributes, DecisionTaskFailedEventAttributes, \
-    DecisionTaskFailedCause
+    DecisionTaskFailedCause, RespondDecisionTaskCompletedResponse, RespondDecisionTaskCompletedRequest, History, \
+    WorkflowExecutionSignaledEventAttributes, GetWorkflowExecutionHistoryResponse
 from cadence.clock_decision_context import VERSION_MARKER_NAME
+from cadence.conversions import copy_py_to_thrift, is_thrift_object
 from cadence.decision_loop import HistoryHelper, is_decision_event, DecisionTaskLoop, ReplayDecider, DecisionEvents, \
     nano_to_milli
 from cadence.decisions import DecisionId, DecisionTarget
 from cadence.exceptions import NonDeterministicWorkflowException
+from cadence.decision_profiler import DecisionProfiler, PHASE_HISTORY, PHASE_EVENT_HANDLERS, PHASE_EVENT_LOOP, \
+    PHASE_DECISIONS, PHASE_RESPOND, PHASE_SERIALIZE, PHASE_CONVERT_TASK
+from cadence.metrics import InMemoryMetricsScope, DECISION_POLL_NO_TASK, DECISION_POLL_LATENCY, \
+    DECISION_TASK_REPLAY_LATENCY, DECISION_TASK_EVENTS, DECISION_TASK_DECISIONS
+from cadence.poller_autoscaler import PollerAutoScaler
 from cadence.state_machines import ActivityDecisionStateMachine, DecisionStateMachine
 from cadence.tests import init_test_logging
 from cadence.tests.utils import json_to_data_class
+from cadence.tracing import InMemorySpanExporter, RecordingTracer, SpanContext
 from cadence.worker import Worker
-from cadence.workflow import workflow_method
+from cadence.workflow import workflow_method, signal_method, Workflow
+from cadence.workflowservice import WorkflowServicePool
 
 __location__ = os.path.dirname(__file__)
 
@@ -141,7 +151,7 @@ class TestDecisionTaskLoop(TestCase):
         self.worker.register_workflow_implementation_type(DummyWorkflow)
         decisions = self.loop.process_task(self.poll_response)
         complete_workflow = decisions[0].complete_workflow_execution_decision_attributes
-        self.assertEqual("null", complete_workflow.result)
+        self.assertEqual(b"null", complete_workflow.result)
 
     def test_one_arg(self):
         class DummyWorkflow:
@@ -196,7 +206,179 @@ class TestDecisionTaskLoop(TestCase):
         self.worker.register_workflow_implementation_type(DummyWorkflow)
         decisions = self.loop.process_task(self.poll_response)
         complete_workflow = decisions[0].complete_workflow_execution_decision_attributes
-        self.assertEqual('"value"', complete_workflow.result)
+        self.assertEqual(b'"value"', complete_workflow.result)
+
+
+class TestRespondDecisions(TestCase):
+    def setUp(self) -> None:
+        fp = open(os.path.join(__location__, "workflow_started_decision_task_response.json"))
+        self.poll_response: PollForDecisionTaskResponse = json_to_data_class(json.loads(fp.read()),
+                                                                             PollForDecisionTaskResponse)
+        fp.close()
+        self.worker = Worker()
+        self.loop = DecisionTaskLoop(worker=self.worker)
+        self.loop.service = Mock()
+        self.loop.service.respond_decision_task_completed = Mock(
+            return_value=(RespondDecisionTaskCompletedResponse(), None))
+
+        class DummyWorkflow:
+            @workflow_method()
+            async def dummy(self):
+                return "value"
+
+        self.worker.register_workflow_implementation_type(DummyWorkflow)
+
+    def get_respond_request(self, n=0) -> RespondDecisionTaskCompletedRequest:
+        args, kwargs = self.loop.service.respond_decision_task_completed.call_args_list[n]
+        return args[0]
+
+    def test_return_new_decision_task_disabled(self):
+        next_task = self.loop.handle_decision_task(self.poll_response)
+        self.assertIsNone(next_task)
+        self.assertFalse(self.get_respond_request().return_new_decision_task)
+
+    def test_return_new_decision_task(self):
+        self.worker.options.return_new_decision_task = True
+        inline_task = PollForDecisionTaskResponse(task_token=b"next-task-token")
+        self.loop.service.respond_decision_task_completed = Mock(
+            return_value=(RespondDecisionTaskCompletedResponse(decision_task=inline_task), None))
+        next_task = self.loop.handle_decision_task(self.poll_response)
+        self.assertIs(inline_task, next_task)
+        self.assertTrue(self.get_respond_request().return_new_decision_task)
+
+    def test_process_partial_inline_task(self):
+        class DummyWorkflow:
+            def __init__(self):
+                self.name = None
+
+            @workflow_method()
+            async def dummy(self):
+                await Workflow.await_till(lambda: self.name)
+                return "hello " + self.name
+
+            @signal_method
+            async def set_name(self, name):
+                self.name = name
+
+        self.worker.register_workflow_implementation_type(DummyWorkflow)
+        started = self.poll_response.history.events
+        timestamp = started[-1].timestamp
+        new_events = [
+            HistoryEvent(event_id=4, event_type=EventType.DecisionTaskCompleted, timestamp=timestamp),
+            HistoryEvent(event_id=5, event_type=EventType.WorkflowExecutionSignaled, timestamp=timestamp,
+                         workflow_execution_signaled_event_attributes=WorkflowExecutionSignaledEventAttributes(
+                             signal_name="DummyWorkflow::set_name", input=b'["world"]')),
+            HistoryEvent(event_id=6, event_type=EventType.DecisionTaskScheduled, timestamp=timestamp),
+            HistoryEvent(event_id=7, event_type=EventType.DecisionTaskStarted, timestamp=timestamp),
+        ]
+        # Sticky task returned inline: only the events since the previous decision task
+        inline_task = PollForDecisionTaskResponse(task_token=b"next-task-token",
+                                                  workflow_execution=self.poll_response.workflow_execution,
+                                                  workflow_type=self.poll_response.workflow_type,
+                                                  previous_started_event_id=3, started_event_id=7,
+                                                  history=History(events=list(new_events)))
+        self.loop.service.get_workflow_execution_history = Mock(return_value=(
+            GetWorkflowExecutionHistoryResponse(history=History(events=started + new_events)), None))
+        self.assertIsNone(self.loop.handle_decision_task(inline_task))
+        request = self.loop.service.get_workflow_execution_history.call_args.args[0]
+        self.assertEqual(self.poll_response.workflow_execution, request.execution)
+        self.assertEqual(list(range(1, 8)), [e.event_id for e in inline_task.history.events])
+        decisions = self.get_respond_request().decisions
+        self.assertEqual(b'"hello world"', decisions[0].complete_workflow_execution_decision_attributes.result)
+
+    def test_return_new_decision_task_empty(self):
+        self.worker.options.return_new_decision_task = True
+        self.loop.service.respond_decision_task_completed = Mock(
+            return_value=(RespondDecisionTaskCompletedResponse(decision_task=PollForDecisionTaskResponse()), None))
+        self.assertIsNone(self.loop.handle_decision_task(self.poll_response))
+
+    def test_execute_decision_task_uses_pool(self):
+        pooled_service = Mock()
+        pooled_service.respond_decision_task_completed = Mock(
+            return_value=(RespondDecisionTaskCompletedResponse(), None))
+        self.loop.pool = WorkflowServicePool(lambda: pooled_service, 1)
+        self.loop.execute_decision_task(self.poll_response)
+        pooled_service.respond_decision_task_completed.assert_called_once()
+        self.loop.service.respond_decision_task_completed.assert_not_called()
+
+    def test_poll_records_autoscaler(self):
+        self.loop.scaler = PollerAutoScaler(1, 2, window=1)
+        self.loop.service.poll_for_decision_task = Mock(
+            return_value=(PollForDecisionTaskResponse(task_token=b"task-token", backlog_count_hint=3), None))
+        self.assertIsNotNone(self.loop.poll())
+        self.assertEqual(2, self.loop.scaler.get_target())
+
+    def test_metrics(self):
+        scope = InMemoryMetricsScope()
+        self.worker.metrics_scope = scope
+        self.loop.service.poll_for_decision_task = Mock(return_value=(PollForDecisionTaskResponse(), None))
+        self.assertIsNone(self.loop.poll())
+        self.loop.handle_decision_task(self.poll_response)
+        tags = {"workflow_type": self.poll_response.workflow_type.name}
+        self.assertEqual(1, scope.get_counter(DECISION_POLL_NO_TASK))
+        self.assertEqual(1, scope.get_histogram(DECISION_POLL_LATENCY).count)
+        self.assertEqual(1, scope.get_histogram(DECISION_TASK_REPLAY_LATENCY, tags).count)
+        self.assertEqual(len(self.poll_response.history.events), scope.get_counter(DECISION_TASK_EVENTS, tags))
+        self.assertEqual(1, scope.get_counter(DECISION_TASK_DECISIONS, tags))
+
+    def test_profiler(self):
+        profiler = DecisionProfiler()
+        self.worker.options.decision_profiler = profiler
+        self.loop.handle_decision_task(self.poll_response)
+        workflow_type = self.poll_response.workflow_type.name
+        profile = profiler.get_workflow_type_profiles()[workflow_type]
+        self.assertEqual(1, profile.decision_tasks)
+        self.assertEqual(len(self.poll_response.history.events), profile.replayed_events + profile.new_events)
+        self.assertEqual({PHASE_HISTORY, PHASE_EVENT_HANDLERS, PHASE_EVENT_LOOP, PHASE_DECISIONS, PHASE_SERIALIZE,
+                          PHASE_RESPOND}, set(profile.phases))
+        self.assertEqual(1, profile.event_types["WorkflowExecutionStarted"].count)
+        self.assertTrue(is_thrift_object(self.get_respond_request()))
+
+    def test_profile_workflow_code_before_first_await(self):
+        class SlowStartWorkflow:
+            @workflow_method()
+            async def dummy(self):
+                time.sleep(0.05)
+                return "value"
+
+        self.worker.register_workflow_implementation_type(SlowStartWorkflow, "DummyWorkflow")
+        profiler = DecisionProfiler()
+        self.worker.options.decision_profiler = profiler
+        self.loop.handle_decision_task(self.poll_response)
+        profile = profiler.get_workflow_type_profiles()[self.poll_response.workflow_type.name]
+        self.assertGreaterEqual(profile.phases[PHASE_EVENT_LOOP], 0.05)
+        self.assertLess(profile.phases[PHASE_EVENT_HANDLERS], 0.05)
+        self.assertLess(profile.event_types["WorkflowExecutionStarted"].seconds, 0.05)
+
+    def test_profile_task_conversion(self):
+        profiler = DecisionProfiler()
+        self.worker.options.decision_profiler = profiler
+        polled = PollForDecisionTaskResponse(task_token=self.poll_response.task_token,
+                                             workflow_type=self.poll_response.workflow_type)
+        self.loop.service.poll_for_decision_task = Mock(return_value=(copy_py_to_thrift(polled), None))
+        self.assertEqual(polled, self.loop.poll())
+        self.assertFalse(self.loop.service.poll_for_decision_task.call_args.kwargs["convert"])
+        self.loop.handle_decision_task(self.poll_response)
+        profile = profiler.get_workflow_type_profiles()[self.poll_response.workflow_type.name]
+        self.assertIn(PHASE_CONVERT_TASK, profile.phases)
+        self.assertEqual({}, self.loop.task_conversion_seconds)
+
+    def test_tracing(self):
+        exporter = InMemorySpanExporter()
+        self.worker.options.tracer = RecordingTracer(exporter)
+        client_span_context = SpanContext(trace_id=1, span_id=2)
+        start_attributes = self.poll_response.history.events[0].workflow_execution_started_event_attributes
+        start_attributes.header = self.worker.options.tracer.inject(None, client_span_context)
+        self.loop.handle_decision_task(self.poll_response)
+        span = exporter.get_finished_spans()[0]
+        self.assertEqual("DecisionTask:" + self.poll_response.workflow_type.name, span.name)
+        self.assertEqual(client_span_context, span.parent)
+        self.assertEqual(self.poll_response.workflow_execution.run_id, span.attributes["run_id"])
+
+    def test_respond_error(self):
+        self.worker.options.return_new_decision_task = True
+        self.loop.service.respond_decision_task_completed = Mock(return_value=(None, Exception("error")))
+        self.assertIsNone(self.loop.handle_decision_task(self.poll_response))
 
 
 class TestScheduleActivityTask(TestCase):
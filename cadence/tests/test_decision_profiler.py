@@ -0,0 +1,60 @@
+import os
+import pstats
+import time
+
+from cadence.decision_profiler import DecisionProfiler, PHASE_EVENT_LOOP, PHASE_RESPOND, PHASE_SERIALIZE, \
+    PHASE_CONVERT_TASK
+
+
+def test_aggregate_by_workflow_type():
+    profiler = DecisionProfiler()
+    for _ in range(2):
+        with profiler.profile("GreetingWorkflow::get_greeting", "workflow-id", "run-id") as profile:
+            with profile.phase(PHASE_EVENT_LOOP):
+                pass
+            profile.record_event("WorkflowExecutionStarted", 0.5)
+            profile.replayed_events += 3
+            profile.new_events += 1
+    with profiler.profile("OtherWorkflow::run"):
+        pass
+    profiles = profiler.get_workflow_type_profiles()
+    assert set(profiles) == {"GreetingWorkflow::get_greeting", "OtherWorkflow::run"}
+    profile = profiles["GreetingWorkflow::get_greeting"]
+    assert profile.decision_tasks == 2
+    assert profile.replayed_events == 6
+    assert profile.new_events == 2
+    assert profile.event_types["WorkflowExecutionStarted"].count == 2
+    assert profile.event_types["WorkflowExecutionStarted"].seconds == 1
+    assert PHASE_EVENT_LOOP in profile.phases
+    assert "GreetingWorkflow::get_greeting: 2 decision tasks" in profiler.report()
+
+
+def test_dump_slow_decision_tasks(tmp_path):
+    profiler = DecisionProfiler(dump_threshold_seconds=0.05, dump_dir=str(tmp_path))
+    with profiler.profile("GreetingWorkflow::get_greeting", "workflow-id", "fast-run"):
+        pass
+    with profiler.profile("GreetingWorkflow::get_greeting", "workflow-id", "slow-run"):
+        time.sleep(0.06)
+    assert len(profiler.dumps) == 1
+    path = profiler.dumps[0]
+    assert os.path.basename(path).startswith("GreetingWorkflow::get_greeting-slow-run-")
+    pstats.Stats(path)
+
+
+def test_nested_phase_not_counted_twice():
+    profiler = DecisionProfiler()
+    with profiler.profile("GreetingWorkflow::get_greeting") as profile:
+        with profile.phase(PHASE_RESPOND):
+            with profile.phase(PHASE_SERIALIZE):
+                time.sleep(0.05)
+    assert profile.phases[PHASE_SERIALIZE] >= 0.05
+    assert profile.phases[PHASE_RESPOND] < 0.05
+
+
+
+def test_phases_timed_before_profiling():
+    profiler = DecisionProfiler()
+    with profiler.profile("GreetingWorkflow::get_greeting", phases={PHASE_CONVERT_TASK: 0.5}) as profile:
+        pass
+    assert profile.phases[PHASE_CONVERT_TASK] == 0.5
+    assert profile.total_seconds >= 0.5
@@ -0,0 +1,103 @@
+import asyncio
+from unittest.mock import Mock
+
+from cadence.decision_loop import SignalMethodTask
+from cadence.interceptors import build_chain, InterceptorChains, ActivityInterceptor, ActivityInvocation, \
+    WorkflowInterceptor, WorkflowInvocation, ServiceInterceptor, ServiceCall
+from cadence.workflowservice import WorkflowService
+
+
+class RecordingActivityInterceptor(ActivityInterceptor):
+
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+
+    def intercept_activity(self, invocation, next_fn):
+        self.calls.append(self.name)
+        return next_fn(invocation)
+
+
+class UpperCaseInterceptor(ActivityInterceptor, WorkflowInterceptor, ServiceInterceptor):
+
+    def intercept_activity(self, invocation, next_fn):
+        return next_fn(invocation).upper()
+
+    async def intercept_signal(self, invocation, next_fn):
+        invocation.args = [a.upper() for a in invocation.args]
+        return await next_fn(invocation)
+
+
+def test_empty_chain():
+    assert build_chain([], lambda invocation: invocation) is None
+    chains = InterceptorChains([])
+    assert chains.activity is None
+    assert chains.workflow is None
+    assert chains.service_interceptors == []
+
+
+def test_chain_order():
+    calls = []
+    chains = InterceptorChains([RecordingActivityInterceptor("outer", calls),
+                                RecordingActivityInterceptor("inner", calls)])
+    result = chains.activity(ActivityInvocation("Activities::greet", lambda name: "hello " + name, ["bob"]))
+    assert result == "hello bob"
+    assert calls == ["outer", "inner"]
+
+
+def test_interceptor_joins_every_chain():
+    chains = InterceptorChains([UpperCaseInterceptor()])
+    assert chains.activity(ActivityInvocation("Activities::greet", lambda: "hello", [])) == "HELLO"
+    assert chains.workflow and chains.signal and chains.query
+    assert len(chains.service_interceptors) == 1
+
+
+def run(coroutine):
+    # A private loop: the current event loop is used by other tests
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_signal_interceptor():
+    received = []
+
+    async def signal_proc(self, value):
+        received.append(value)
+
+    workflow_instance = Mock()
+    workflow_instance._signal_methods = {"Workflow::signal": signal_proc}
+    task = SignalMethodTask(task_id="task-id", workflow_instance=workflow_instance, signal_name="Workflow::signal",
+                            signal_input=["value"], decider=Mock(),
+                            interceptor_chain=InterceptorChains([UpperCaseInterceptor()]).signal)
+    run(task.signal_main())
+    assert received == ["VALUE"]
+
+
+def test_workflow_chain():
+    class Interceptor(WorkflowInterceptor):
+        async def intercept_workflow(self, invocation: WorkflowInvocation, next_fn):
+            return "intercepted " + await next_fn(invocation)
+
+    async def workflow_proc(self, name):
+        return "hello " + name
+
+    chain = InterceptorChains([Interceptor()]).workflow
+    assert run(chain(WorkflowInvocation("Workflow::run", object(), workflow_proc, ["bob"]))) == "intercepted hello bob"
+
+
+def test_service_interceptor():
+    calls = []
+
+    class Interceptor(ServiceInterceptor):
+        def intercept_call(self, call: ServiceCall, next_fn):
+            calls.append(call.method_name)
+            return next_fn(call)
+
+    service = WorkflowService(Mock(), interceptors=[Interceptor()])
+    service.send_thrift_call = Mock(return_value="response")
+    assert service.thrift_call("DescribeDomain", "request") == "response"
+    assert calls == ["DescribeDomain"]
+    service.send_thrift_call.assert_called_once_with("DescribeDomain", "request")
@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from cadence.exceptions import StopRequestedException
+from cadence.metrics import InMemoryMetricsScope, NOOP_SCOPE, CADENCE_REQUEST, CADENCE_REQUEST_LATENCY, \
+    CADENCE_ERROR, CADENCE_TRANSPORT_ERROR
+from cadence.tchannel import TChannelException
+from cadence.workflowservice import WorkflowService
+
+import pytest
+
+
+def test_noop_scope():
+    scope = NOOP_SCOPE.tagged({"domain": "sample"})
+    scope.counter("requests")
+    scope.gauge("pollers", 2)
+    with scope.timer("latency"):
+        pass
+
+
+def test_counter_and_gauge():
+    scope = InMemoryMetricsScope()
+    scope.counter("requests", tags={"operation": "Poll"})
+    scope.counter("requests", 2, tags={"operation": "Poll"})
+    scope.gauge("pollers", 3)
+    assert scope.get_counter("requests", {"operation": "Poll"}) == 3
+    assert scope.get_counter("requests", {"operation": "Start"}) == 0
+    assert scope.get_gauge("pollers") == 3
+
+
+def test_tagged_scopes_share_storage():
+    scope = InMemoryMetricsScope()
+    child = scope.tagged({"domain": "sample"}).tagged({"task_list": "tasks"})
+    child.counter("requests")
+    assert scope.get_counter("requests", {"domain": "sample", "task_list": "tasks"}) == 1
+    assert child.get_counter("requests") == 1
+
+
+def test_histogram():
+    scope = InMemoryMetricsScope(buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 5):
+        scope.histogram("latency", value)
+    histogram = scope.get_histogram("latency")
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(5.65)
+
+
+def test_timer():
+    scope = InMemoryMetricsScope()
+    with scope.timer("latency"):
+        pass
+    assert scope.get_histogram("latency").count == 1
+
+
+def test_to_prometheus():
+    scope = InMemoryMetricsScope(buckets=(0.1, 1)).tagged({"domain": "sample"})
+    scope.counter("requests", tags={"operation": "Poll"})
+    scope.gauge("pollers", 2)
+    scope.histogram("latency", 0.5)
+    assert scope.to_prometheus() == "\n".join([
+        '# TYPE requests counter',
+        'requests{domain="sample",operation="Poll"} 1',
+        '# TYPE pollers gauge',
+        'pollers{domain="sample"} 2',
+        '# TYPE latency histogram',
+        'latency_bucket{domain="sample",le="0.1"} 0',
+        'latency_bucket{domain="sample",le="1"} 1',
+        'latency_bucket{domain="sample",le="+Inf"} 1',
+        'latency_sum{domain="sample"} 0.5',
+        'latency_count{domain="sample"} 1',
+    ]) + "\n"
+
+
+def test_prometheus_escapes_label_values():
+    scope = InMemoryMetricsScope()
+    scope.counter("requests", tags={"workflow_type": 'Greeting"Workflow'})
+    assert 'workflow_type="Greeting\\"Workflow"' in scope.to_prometheus()
+
+
+def test_service_metrics():
+    scope = InMemoryMetricsScope()
+    service = WorkflowService(Mock(), metrics_scope=scope)
+    service.connection.call_function = Mock(side_effect=TChannelException())
+    with pytest.raises(TChannelException):
+        service.thrift_call("DescribeDomain", None)
+    tags = {"operation": "DescribeDomain"}
+    assert scope.get_counter(CADENCE_REQUEST, tags) == 1
+    assert scope.get_counter(CADENCE_TRANSPORT_ERROR, tags) == 1
+    assert scope.get_histogram(CADENCE_REQUEST_LATENCY, tags).count == 1
+
+
+def test_stop_requested_not_transport_error():
+    scope = InMemoryMetricsScope()
+    service = WorkflowService(Mock(), metrics_scope=scope)
+    service.connection.call_function = Mock(side_effect=StopRequestedException())
+    with pytest.raises(StopRequestedException):
+        service.thrift_call("PollForDecisionTask", None)
+    assert scope.get_counter(CADENCE_TRANSPORT_ERROR, {"operation": "PollForDecisionTask"}) == 0
+
+
+def test_service_error_metrics():
+    scope = InMemoryMetricsScope()
+    service = WorkflowService(Mock(), metrics_scope=scope)
+    service.thrift_call = Mock(return_value=SimpleNamespace(success=None, badRequestError=SimpleNamespace(message="")))
+    service.call_void("DescribeDomain", None)
+    assert scope.get_counter(CADENCE_ERROR, {"operation": "DescribeDomain", "error": "BadRequestError"}) == 1
@@ -0,0 +1,116 @@
+import threading
+from contextlib import closing
+from unittest.mock import Mock
+
+import pytest
+
+from cadence.cadence_types import ListOpenWorkflowExecutionsResponse, WorkflowExecutionInfo, WorkflowExecution, \
+    StartTimeFilter, GetWorkflowExecutionHistoryResponse, History, HistoryEvent, ListWorkflowExecutionsResponse
+from cadence.errors import EntityNotExistsError
+from cadence.pagination import iterate_pages
+from cadence.workflow import WorkflowClient
+
+PAGES = {None: ([1, 2], b"2"), b"2": ([3, 4], b"3"), b"3": ([5], None)}
+
+
+def test_iterate_pages_without_prefetch():
+    fetch_page = Mock(side_effect=PAGES.get)
+    assert list(iterate_pages(fetch_page, prefetch=False)) == [1, 2, 3, 4, 5]
+    assert [c.args[0] for c in fetch_page.call_args_list] == [None, b"2", b"3"]
+
+
+def test_prefetch_next_page_while_consuming():
+    fetched = {token: threading.Event() for token in PAGES}
+
+    def fetch_page(token):
+        fetched[token].set()
+        return PAGES[token]
+
+    iterator = iterate_pages(fetch_page)
+    assert next(iterator) == 1
+    # The second page is fetched while the first one is consumed, the third one isn't
+    assert fetched[b"2"].wait(5)
+    assert not fetched[b"3"].is_set()
+    assert list(iterator) == [2, 3, 4, 5]
+
+
+def test_error_raised_at_failed_page():
+    def fetch_page(token):
+        if token == b"3":
+            raise EntityNotExistsError(message="gone")
+        return PAGES[token]
+
+    iterator = iterate_pages(fetch_page)
+    assert [next(iterator) for _ in range(4)] == [1, 2, 3, 4]
+    with pytest.raises(EntityNotExistsError):
+        next(iterator)
+
+
+def test_stop_iterating():
+    fetch_page = Mock(side_effect=PAGES.get)
+    iterator = iterate_pages(fetch_page)
+    assert next(iterator) == 1
+    iterator.close()
+    assert fetch_page.call_count <= 2
+
+
+def execution_info(workflow_id):
+    return WorkflowExecutionInfo(execution=WorkflowExecution(workflow_id=workflow_id, run_id="run"))
+
+
+def test_list_open_workflows():
+    service = Mock()
+    service.list_open_workflow_executions = Mock(side_effect=[
+        (ListOpenWorkflowExecutionsResponse(executions=[execution_info("a"), execution_info("b")],
+                                            next_page_token=b"next"), None),
+        (ListOpenWorkflowExecutionsResponse(executions=[execution_info("c")]), None),
+    ])
+    service.clone = Mock(return_value=None)
+    client = WorkflowClient(service=service, domain="domain", options=None)
+    executions = client.list_open_workflows(StartTimeFilter(earliest_time=0, latest_time=1), workflow_type="T",
+                                            page_size=2)
+    assert [e.execution.workflow_id for e in executions] == ["a", "b", "c"]
+    first, second = [c.args[0] for c in service.list_open_workflow_executions.call_args_list]
+    assert (first.domain, first.maximum_page_size, first.next_page_token) == ("domain", 2, None)
+    assert first.type_filter.name == "T"
+    assert first.execution_filter is None
+    assert second.next_page_token == b"next"
+
+
+def test_list_workflows_scan():
+    service = Mock()
+    service.scan_workflow_executions = Mock(return_value=(
+        ListWorkflowExecutionsResponse(executions=[execution_info("a")]), None))
+    client = WorkflowClient(service=service, domain="domain", options=None)
+    assert len(list(client.list_workflows("WorkflowType = 'T'", scan=True, prefetch=False))) == 1
+    assert service.scan_workflow_executions.call_args.args[0].query == "WorkflowType = 'T'"
+    service.list_workflow_executions.assert_not_called()
+
+
+def test_get_workflow_history():
+    service = Mock()
+    service.get_workflow_execution_history = Mock(side_effect=[
+        (GetWorkflowExecutionHistoryResponse(history=History(events=[HistoryEvent(event_id=1)]),
+                                             next_page_token=b"next"), None),
+        (None, EntityNotExistsError(message="gone")),
+    ])
+    client = WorkflowClient(service=service, domain="domain", options=None)
+    events = client.get_workflow_history("wid", prefetch=False)
+    assert next(events).event_id == 1
+    with pytest.raises(EntityNotExistsError):
+        next(events)
+
+
+def test_prefetch_on_own_connection():
+    service = Mock()
+    prefetch_service = service.clone.return_value = Mock()
+    prefetch_service.list_workflow_executions = Mock(side_effect=[
+        (ListWorkflowExecutionsResponse(executions=[execution_info("a")], next_page_token=b"next"), None),
+        (ListWorkflowExecutionsResponse(executions=[execution_info("b")]), None),
+    ])
+    client = WorkflowClient(service=service, domain="domain", options=None)
+    with closing(client.list_workflows("WorkflowType = 'T'")) as executions:
+        assert next(executions).execution.workflow_id == "a"
+    prefetch_service.close.assert_called_once()
+    service.list_workflow_executions.assert_not_called()
+    service.close.assert_not_called()
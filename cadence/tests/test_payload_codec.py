@@ -0,0 +1,108 @@
+import bz2
+from unittest.mock import Mock
+
+import pytest
+
+from cadence.cadence_types import StartWorkflowExecutionResponse
+from cadence.data_converter import JSONDataConverter, PickleDataConverter
+from cadence.metrics import InMemoryMetricsScope, PAYLOAD_ENCODED, PAYLOAD_ENCODED_BYTES, PAYLOAD_CODEC_SAVED_BYTES
+from cadence.payload_codec import CompressionCodec, CodecDataConverter, Compressor, COMPRESSED_PAYLOAD_MAGIC, \
+    create_data_converter
+from cadence.worker import Worker, WorkerOptions
+from cadence.workflow import WorkflowClient, WorkflowClientOptions, workflow_method
+
+LARGE_VALUE = {"items": ["item-%d" % i for i in range(1000)]}
+
+
+class Bz2Compressor(Compressor):
+    name = "bz2"
+
+    def compress(self, data: bytes) -> bytes:
+        return bz2.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return bz2.decompress(data)
+
+
+def test_small_payloads_not_compressed():
+    codec = CompressionCodec(threshold_bytes=100)
+    assert codec.encode(b'"small"') == b'"small"'
+    assert codec.encode(b"") == b""
+
+
+def test_incompressible_payloads_not_compressed():
+    codec = CompressionCodec(threshold_bytes=10)
+    payload = bytes(range(256))
+    assert codec.encode(payload) == payload
+
+
+def test_round_trip():
+    codec = CompressionCodec(threshold_bytes=100)
+    payload = JSONDataConverter().to_payload(LARGE_VALUE)
+    encoded = codec.encode(payload)
+    assert encoded.startswith(COMPRESSED_PAYLOAD_MAGIC + b"zlib:")
+    assert len(encoded) < len(payload)
+    assert codec.decode(encoded) == payload
+
+
+def test_uncompressed_payloads_decoded():
+    codec = CompressionCodec()
+    assert codec.decode(b'{"a": 1}') == b'{"a": 1}'
+    assert codec.decode(None) is None
+    pickled = PickleDataConverter().to_payload(LARGE_VALUE)
+    assert codec.decode(pickled) == pickled
+
+
+def test_pluggable_compressor():
+    payload = JSONDataConverter().to_payload(LARGE_VALUE)
+    encoded = CompressionCodec(Bz2Compressor(), threshold_bytes=100).encode(payload)
+    assert encoded.startswith(COMPRESSED_PAYLOAD_MAGIC + b"bz2:")
+    with pytest.raises(ValueError, match="unknown compressor: bz2"):
+        CompressionCodec().decode(encoded)
+    assert CompressionCodec(decompressors=[Bz2Compressor()]).decode(encoded) == payload
+    # Payloads compressed before switching compressors
+    zlib_encoded = CompressionCodec(threshold_bytes=100).encode(payload)
+    assert CompressionCodec(Bz2Compressor()).decode(zlib_encoded) == payload
+
+
+def test_converter_metrics():
+    scope = InMemoryMetricsScope()
+    converter = CodecDataConverter(JSONDataConverter(), CompressionCodec(threshold_bytes=100), scope)
+    payload = converter.to_payload(LARGE_VALUE)
+    assert converter.from_payload(payload) == LARGE_VALUE
+    assert converter.from_payload(converter.to_payload("small")) == "small"
+    tags = {"codec": "zlib"}
+    assert scope.get_counter(PAYLOAD_ENCODED, tags) == 1
+    original = len(JSONDataConverter().to_payload(LARGE_VALUE))
+    assert scope.get_counter(PAYLOAD_ENCODED_BYTES, tags) == original
+    assert scope.get_counter(PAYLOAD_CODEC_SAVED_BYTES, tags) == original - len(payload)
+
+
+def test_create_data_converter():
+    converter = JSONDataConverter()
+    assert create_data_converter(converter, None) is converter
+    assert isinstance(create_data_converter(converter, CompressionCodec()), CodecDataConverter)
+
+
+def test_worker_data_converter():
+    worker = Worker(domain="domain", task_list="task-list",
+                    options=WorkerOptions(payload_codec=CompressionCodec(threshold_bytes=100)))
+    assert worker.data_converter.from_payload(worker.data_converter.to_payload(LARGE_VALUE)) == LARGE_VALUE
+    assert isinstance(worker.data_converter, CodecDataConverter)
+    assert Worker().data_converter is WorkerOptions.data_converter
+
+
+def test_client_compresses_workflow_input():
+    class DummyWorkflow:
+        @workflow_method(task_list="tasks")
+        def dummy(self, value):
+            pass
+
+    service = Mock()
+    service.start_workflow = Mock(return_value=(StartWorkflowExecutionResponse(run_id="run-id"), None))
+    options = WorkflowClientOptions(payload_codec=CompressionCodec(threshold_bytes=100))
+    client = WorkflowClient(service=service, domain="sample", options=options)
+    WorkflowClient.start(client.new_workflow_stub(DummyWorkflow).dummy, LARGE_VALUE)
+    request = service.start_workflow.call_args[0][0]
+    assert request.input.startswith(COMPRESSED_PAYLOAD_MAGIC)
+    assert client.data_converter.payload_to_args(request.input) == [LARGE_VALUE]
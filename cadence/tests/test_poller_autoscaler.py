@@ -0,0 +1,88 @@
+import threading
+from unittest.mock import Mock
+
+from cadence.cadence_types import DescribeTaskListResponse, TaskListStatus, TaskListType, DescribeTaskListRequest
+from cadence.poller_autoscaler import PollerAutoScaler, TaskListBacklogSampler, create_autoscaler
+
+
+def record_polls(scaler: PollerAutoScaler, got_task: bool, n: int, backlog_count_hint: int = None):
+    for _ in range(n):
+        scaler.record_poll(got_task, backlog_count_hint)
+
+
+def test_starts_at_min():
+    scaler = PollerAutoScaler(2, 5)
+    assert scaler.get_target() == 2
+
+
+def test_scale_up_when_polls_return_tasks():
+    scaler = PollerAutoScaler(1, 3, window=10)
+    record_polls(scaler, True, 10)
+    assert scaler.get_target() == 2
+    record_polls(scaler, True, 10)
+    assert scaler.get_target() == 3
+    record_polls(scaler, True, 10)
+    assert scaler.get_target() == 3
+
+
+def test_scale_down_when_polls_are_empty():
+    scaler = PollerAutoScaler(1, 3, window=10)
+    record_polls(scaler, True, 20)
+    assert scaler.get_target() == 3
+    record_polls(scaler, False, 10)
+    assert scaler.get_target() == 2
+    record_polls(scaler, False, 20)
+    assert scaler.get_target() == 1
+
+
+def test_mixed_polls_keep_target():
+    scaler = PollerAutoScaler(1, 3, window=10)
+    record_polls(scaler, True, 5)
+    record_polls(scaler, False, 5)
+    assert scaler.get_target() == 1
+
+
+def test_scale_up_when_backlog_grows():
+    scaler = PollerAutoScaler(1, 3, window=10)
+    record_polls(scaler, False, 10, backlog_count_hint=5)
+    assert scaler.get_target() == 2
+    record_polls(scaler, False, 10, backlog_count_hint=5)
+    assert scaler.get_target() == 1
+
+
+def test_wait_until_active():
+    scaler = PollerAutoScaler(1, 2, window=1)
+    assert scaler.wait_until_active(0, timeout=0)
+    assert not scaler.wait_until_active(1, timeout=0)
+    activated = threading.Event()
+
+    def poller():
+        if scaler.wait_until_active(1, timeout=5):
+            activated.set()
+
+    thread = threading.Thread(target=poller)
+    thread.start()
+    scaler.record_poll(True)
+    thread.join()
+    assert activated.is_set()
+
+
+def test_create_autoscaler():
+    assert create_autoscaler(1, 1) is None
+    assert isinstance(create_autoscaler(1, 4), PollerAutoScaler)
+
+
+def test_backlog_sampler():
+    scaler = PollerAutoScaler(1, 3, window=10)
+    service = Mock()
+    response = DescribeTaskListResponse(task_list_status=TaskListStatus(backlog_count_hint=42))
+    service.describe_task_list = Mock(return_value=(response, None))
+    sampler = TaskListBacklogSampler(scaler, "domain", "task-list", TaskListType.Activity, interval_seconds=60)
+    sampler.maybe_sample(service)
+    sampler.maybe_sample(service)
+    service.describe_task_list.assert_called_once()
+    request: DescribeTaskListRequest = service.describe_task_list.call_args[0][0]
+    assert request.task_list.name == "task-list"
+    assert request.task_list_type == TaskListType.Activity
+    assert request.include_task_list_status
+    assert scaler.backlog == 42
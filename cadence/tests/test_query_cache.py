@@ -0,0 +1,109 @@
+import json
+import os
+from copy import deepcopy
+from unittest import TestCase
+
+from cadence.cadence_types import EventType, HistoryEvent, PollForDecisionTaskResponse, WorkflowQuery
+from cadence.decision_loop import DecisionTaskLoop
+from cadence.metrics import InMemoryMetricsScope, QUERY_RESULT_CACHE_HIT, QUERY_RESULT_CACHE_MISS
+from cadence.query_cache import QueryResultCache
+from cadence.tests.utils import json_to_data_class
+from cadence.worker import Worker
+from cadence.workflow import workflow_method, query_method, Workflow
+
+__location__ = os.path.dirname(__file__)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestQueryResultCache(TestCase):
+
+    def test_expire_after_ttl(self):
+        clock = FakeClock()
+        cache = QueryResultCache(10, ttl_seconds=5, clock=clock)
+        cache.put(("run", 3, "q", None), b"1")
+        clock.now = 4.9
+        self.assertEqual(b"1", cache.get(("run", 3, "q", None)))
+        clock.now = 5
+        self.assertIsNone(cache.get(("run", 3, "q", None)))
+        self.assertEqual(0, cache.size())
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_evict_least_recently_used(self):
+        cache = QueryResultCache(2, ttl_seconds=60)
+        cache.put(("run", 1, "q", None), b"1")
+        cache.put(("run", 2, "q", None), b"2")
+        cache.get(("run", 1, "q", None))
+        cache.put(("run", 3, "q", None), b"3")
+        self.assertEqual(b"1", cache.get(("run", 1, "q", None)))
+        self.assertIsNone(cache.get(("run", 2, "q", None)))
+
+
+class TestProcessQuery(TestCase):
+
+    def setUp(self) -> None:
+        with open(os.path.join(__location__, "workflow_started_decision_task_response.json")) as fp:
+            self.decision_task: PollForDecisionTaskResponse = json_to_data_class(json.loads(fp.read()),
+                                                                                 PollForDecisionTaskResponse)
+        self.metrics_scope = InMemoryMetricsScope()
+        self.worker = Worker()
+        self.worker.metrics_scope = self.metrics_scope
+        self.loop = DecisionTaskLoop(worker=self.worker, query_cache=QueryResultCache(10, ttl_seconds=60))
+        self.calls = []
+        calls = self.calls
+
+        class DummyWorkflow:
+            @workflow_method()
+            async def dummy(self):
+                await Workflow.await_till(lambda: False)
+
+            @query_method(name="DummyWorkflow::get_status")
+            async def get_status(self, suffix=""):
+                calls.append("get_status")
+                return "started" + suffix
+
+            @query_method(name="DummyWorkflow::get_time", memoize=False)
+            async def get_time(self):
+                calls.append("get_time")
+                return len(calls)
+
+        self.worker.register_workflow_implementation_type(DummyWorkflow)
+
+    def query_task(self, query_type="DummyWorkflow::get_status", query_args=b'["!"]', new_events=0):
+        query_task = deepcopy(self.decision_task)
+        events = query_task.history.events
+        for _ in range(new_events):
+            events.append(HistoryEvent(event_id=len(events) + 1, event_type=EventType.DecisionTaskCompleted,
+                                       timestamp=events[-1].timestamp))
+        query_task.query = WorkflowQuery(query_type=query_type, query_args=query_args)
+        return query_task
+
+    def test_memoize_result(self):
+        self.assertEqual(b'"started!"', self.loop.process_query(self.query_task()))
+        self.assertEqual(b'"started!"', self.loop.process_query(self.query_task()))
+        self.assertEqual(["get_status"], self.calls)
+        tags = {"workflow_type": "DummyWorkflow::dummy"}
+        self.assertEqual(1, self.metrics_scope.get_counter(QUERY_RESULT_CACHE_HIT, tags))
+        self.assertEqual(1, self.metrics_scope.get_counter(QUERY_RESULT_CACHE_MISS, tags))
+
+    def test_run_again_for_other_args_or_history(self):
+        self.loop.process_query(self.query_task())
+        self.assertEqual(b'"started?"', self.loop.process_query(self.query_task(query_args=b'["?"]')))
+        self.loop.process_query(self.query_task(new_events=1))
+        self.assertEqual(["get_status"] * 3, self.calls)
+
+    def test_non_memoized_query(self):
+        self.assertEqual(b"1", self.loop.process_query(self.query_task("DummyWorkflow::get_time", None)))
+        self.assertEqual(b"2", self.loop.process_query(self.query_task("DummyWorkflow::get_time", None)))
+        self.assertEqual(0, self.loop.query_cache.size())
+
+    def test_errors_not_memoized(self):
+        with self.assertRaises(Exception):
+            self.loop.process_query(self.query_task("DummyWorkflow::missing"))
+        self.assertEqual(0, self.loop.query_cache.size())
@@ -0,0 +1,198 @@
+import threading
+from unittest.mock import Mock
+
+from cadence.cadence_types import QueryWorkflowResponse, QueryWorkflowRequest, WorkflowExecution, WorkflowQuery
+from cadence.errors import QueryFailedError
+from cadence.metrics import InMemoryMetricsScope, CLIENT_QUERY_CACHE_HIT, CLIENT_QUERY_COALESCED
+from cadence.query_coalescer import QueryCoalescer
+from cadence.tests.test_query_cache import FakeClock
+from cadence.workflow import WorkflowClient, WorkflowClientOptions, query_method, workflow_method
+
+
+class GreetingWorkflow:
+    @workflow_method(task_list="greetings")
+    async def greet(self, name):
+        raise NotImplementedError
+
+    @query_method
+    async def get_status(self, verbose):
+        raise NotImplementedError
+
+
+class BlockingService:
+    def __init__(self, result=b'"running"', err=None):
+        self.result = result
+        self.err = err
+        self.release = threading.Event()
+        self.requests = []
+
+    def query_workflow(self, request):
+        self.requests.append(request)
+        self.release.wait(5)
+        if self.err:
+            return None, self.err
+        return QueryWorkflowResponse(query_result=self.result), None
+
+
+def new_client(service, **kwargs):
+    return WorkflowClient(service=service, domain="domain", options=WorkflowClientOptions(**kwargs))
+
+
+def query_concurrently(client, count, workflow_id="wf", verbose=False):
+    results = []
+
+    def query():
+        try:
+            results.append(client.new_workflow_stub_from_workflow_id(GreetingWorkflow, workflow_id).get_status(
+                verbose))
+        except Exception as ex:
+            results.append(ex)
+
+    threads = [threading.Thread(target=query) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def wait_for_waiters(client, count):
+    for _ in range(500):
+        if client.get_query_stats().coalesced == count:
+            return
+        threading.Event().wait(0.01)
+
+
+def test_coalesce_concurrent_queries():
+    metrics_scope = InMemoryMetricsScope()
+    service = BlockingService()
+    client = new_client(service, coalesce_queries=True, metrics_scope=metrics_scope)
+    threads, results = query_concurrently(client, 10)
+    wait_for_waiters(client, 9)
+    service.release.set()
+    for thread in threads:
+        thread.join()
+    assert results == ["running"] * 10
+    assert len(service.requests) == 1
+    stats = client.get_query_stats()
+    assert (stats.calls, stats.coalesced, stats.hits) == (1, 9, 0)
+    assert metrics_scope.get_counter(CLIENT_QUERY_COALESCED, {"domain": "domain",
+                                                              "query_type": "GreetingWorkflow::get_status"}) == 9
+
+
+def test_different_args_not_coalesced():
+    service = BlockingService()
+    service.release.set()
+    client = new_client(service, coalesce_queries=True)
+    stub = client.new_workflow_stub_from_workflow_id(GreetingWorkflow, "wf")
+    stub.get_status(True)
+    stub.get_status(False)
+    assert len(service.requests) == 2
+
+
+def test_error_shared_but_not_cached():
+    service = BlockingService(err=QueryFailedError(message="boom"))
+    client = new_client(service, query_cache_ttl_seconds=60)
+    threads, results = query_concurrently(client, 3)
+    wait_for_waiters(client, 2)
+    service.release.set()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 3 and all(isinstance(r, Exception) for r in results)
+    assert len(service.requests) == 1
+    service.err = None
+    assert client.new_workflow_stub_from_workflow_id(GreetingWorkflow, "wf").get_status(False) == "running"
+    assert len(service.requests) == 2
+
+
+def test_cache_until_ttl_or_invalidated():
+    metrics_scope = InMemoryMetricsScope()
+    service = BlockingService()
+    service.release.set()
+    client = new_client(service, query_cache_ttl_seconds=2, metrics_scope=metrics_scope)
+    clock = client.query_coalescer.clock = FakeClock()
+    stub = client.new_workflow_stub_from_workflow_id(GreetingWorkflow, "wf")
+    other_stub = client.new_workflow_stub_from_workflow_id(GreetingWorkflow, "other")
+    assert stub.get_status(False) == "running"
+    other_stub.get_status(False)
+    service.result = b'"done"'
+    assert stub.get_status(False) == "running"
+    assert metrics_scope.get_counter(CLIENT_QUERY_CACHE_HIT, {"domain": "domain",
+                                                              "query_type": "GreetingWorkflow::get_status"}) == 1
+
+    client.invalidate_query_results("wf")
+    assert stub.get_status(False) == "done"
+    assert other_stub.get_status(False) == "running"
+
+    clock.now = 2
+    assert other_stub.get_status(False) == "done"
+    assert len(service.requests) == 4
+
+
+def test_disabled_by_default():
+    service = Mock()
+    service.query_workflow = Mock(return_value=(QueryWorkflowResponse(query_result=b'"running"'), None))
+    client = new_client(service)
+    stub = client.new_workflow_stub_from_workflow_id(GreetingWorkflow, "wf")
+    stub.get_status(False)
+    stub.get_status(False)
+    assert service.query_workflow.call_count == 2
+    assert client.get_query_stats() is None
+
+
+def test_invalidate_in_flight_query():
+    service = BlockingService()
+    client = new_client(service, query_cache_ttl_seconds=60)
+    threads, results = query_concurrently(client, 1)
+    for _ in range(500):
+        if service.requests:
+            break
+        threading.Event().wait(0.01)
+    client.invalidate_query_results()
+    service.release.set()
+    threads[0].join()
+    # The response may predate the invalidation, it isn't reused
+    client.new_workflow_stub_from_workflow_id(GreetingWorkflow, "wf").get_status(False)
+    assert len(service.requests) == 2
+    assert client.get_query_stats().hits == 0
+
+
+def test_leader_raising_base_exception_releases_followers():
+    class Interrupted(BaseException):
+        pass
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def query_fn(request):
+        started.set()
+        release.wait(5)
+        raise Interrupted()
+
+    coalescer = QueryCoalescer(ttl_seconds=60)
+    request = QueryWorkflowRequest(domain="domain", execution=WorkflowExecution(workflow_id="wf"),
+                                   query=WorkflowQuery(query_type="get_status"))
+    errors = []
+
+    def leader():
+        try:
+            coalescer.query(request, query_fn)
+        except Interrupted as ex:
+            errors.append(ex)
+
+    leader_thread = threading.Thread(target=leader)
+    leader_thread.start()
+    assert started.wait(5)
+    follower_results = []
+    follower_thread = threading.Thread(target=lambda: follower_results.append(coalescer.query(request, query_fn)))
+    follower_thread.start()
+    for _ in range(500):
+        if coalescer.get_stats().coalesced == 1:
+            break
+        threading.Event().wait(0.01)
+    release.set()
+    leader_thread.join(5)
+    follower_thread.join(5)
+    assert not follower_thread.is_alive()
+    assert len(errors) == 1
+    response, err = follower_results[0]
+    assert response is None and isinstance(err, Interrupted)
+    assert not coalescer.results
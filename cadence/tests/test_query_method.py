@@ -7,6 +7,7 @@ import pytest
 from cadence.cadence_types import QueryWorkflowResponse, WorkflowExecution, QueryWorkflowRequest, QueryRejected, \
     WorkflowExecutionCloseStatus, WorkflowType, PollForDecisionTaskResponse, WorkflowQuery, \
     RespondQueryTaskCompletedRequest
+from cadence.data_converter import DEFAULT_DATA_CONVERTER
 from cadence.decision_loop import ReplayDecider, Status, QueryMethodTask, DecisionTaskLoop
 from cadence.exceptions import QueryRejectedException, QueryDidNotComplete
 from cadence.worker import _get_qm, Worker
@@ -93,6 +94,8 @@ def test_exec_query():
     workflow_client.domain = "the-domain"
     workflow_client.service = Mock()
     workflow_client.service.query_workflow = MagicMock(return_value=(response, None))
+    workflow_client.query_coalescer = None
+    workflow_client.data_converter = DEFAULT_DATA_CONVERTER
 
     ret = exec_query(workflow_client, QueryMethod(name="the_query_method"), [1, 2, 3], stub)
     assert ret == "blah"
@@ -100,7 +103,7 @@ def test_exec_query():
     request: QueryWorkflowRequest = args[0]
     assert request.execution is stub._execution
     assert request.query.query_type == "the_query_method"
-    assert request.query.query_args == json.dumps([1, 2, 3])
+    assert request.query.query_args == json.dumps([1, 2, 3]).encode("utf-8")
     assert request.domain == "the-domain"
 
 
@@ -115,6 +118,7 @@ def test_exec_query_query_rejected():
     workflow_client.domain = "the-domain"
     workflow_client.service = Mock()
     workflow_client.service.query_workflow = MagicMock(return_value=(response, None))
+    workflow_client.query_coalescer = None
 
     with pytest.raises(QueryRejectedException) as exc_info:
         exec_query(workflow_client, QueryMethod(name="the_query_method"), [1, 2, 3], stub)
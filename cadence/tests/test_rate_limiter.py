@@ -0,0 +1,65 @@
+from unittest.mock import Mock
+
+from cadence.rate_limiter import TokenBucket
+from cadence.worker import Worker, WorkerOptions
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_try_acquire():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock.now = 0.5
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+def test_burst_is_capped():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, burst=3, clock=clock)
+    clock.now = 100
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+
+def test_reserve():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=1, clock=clock)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0.1
+    assert bucket.reserve() == 0.2
+    stats = bucket.get_stats()
+    assert stats.acquired == 3
+    assert stats.throttled == 2
+    assert abs(stats.throttled_seconds - 0.3) < 1e-9
+
+
+def test_acquire_sleeps():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=4, burst=1, clock=clock)
+    sleep = Mock()
+    bucket.acquire(sleep)
+    sleep.assert_not_called()
+    bucket.acquire(sleep)
+    sleep.assert_called_once_with(0.25)
+
+
+def test_worker_rate_limiter_stats():
+    options = WorkerOptions(worker_activities_per_second=5,
+                            activity_type_rates_per_second={"Activities::greet": 1})
+    worker = Worker(options=options)
+    worker.start()
+    worker.activity_type_rate_limiters["Activities::greet"].reserve()
+    stats = worker.get_rate_limiter_stats()
+    assert set(stats) == {"*", "Activities::greet"}
+    assert stats["Activities::greet"].acquired == 1
+    assert stats["*"].acquired == 0
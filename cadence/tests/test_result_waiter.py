@@ -0,0 +1,163 @@
+import asyncio
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from cadence.async_client import AsyncWorkflowClient
+from cadence.backoff import BackoffPolicy
+from cadence.cadence_types import GetWorkflowExecutionHistoryResponse, History, HistoryEvent, EventType, \
+    WorkflowExecutionCompletedEventAttributes
+from cadence.errors import EntityNotExistsError, InternalServiceError
+from cadence.result_waiter import WorkflowResultWaiter
+from cadence.workflow import WorkflowClient, WorkflowExecutionCanceledException
+from cadence.workflowservice import WorkflowServicePool
+
+NO_WAIT = BackoffPolicy(initial_interval_seconds=0.001, maximum_interval_seconds=0.001)
+EMPTY_RESPONSE = GetWorkflowExecutionHistoryResponse(history=History(events=[]))
+
+
+def completed(result: bytes):
+    return GetWorkflowExecutionHistoryResponse(history=History(events=[HistoryEvent(
+        event_type=EventType.WorkflowExecutionCompleted,
+        workflow_execution_completed_event_attributes=WorkflowExecutionCompletedEventAttributes(result=result))]))
+
+
+class FakeService:
+    """
+    Each workflow closes after `closes_after[workflow_id]` polls
+    """
+
+    def __init__(self, closes_after):
+        self.closes_after = dict(closes_after)
+        self.lock = threading.Lock()
+        self.requests = []
+
+    def get_workflow_execution_history(self, request):
+        workflow_id = request.execution.workflow_id
+        with self.lock:
+            self.requests.append(request)
+            if workflow_id == "missing":
+                return None, EntityNotExistsError(message="missing")
+            if workflow_id == "flaky" and len(self.requests) == 1:
+                return None, InternalServiceError(message="retry me")
+            if workflow_id == "canceled":
+                return GetWorkflowExecutionHistoryResponse(history=History(events=[HistoryEvent(
+                    event_type=EventType.WorkflowExecutionCanceled)])), None
+            self.closes_after[workflow_id] -= 1
+            if self.closes_after[workflow_id] > 0:
+                return EMPTY_RESPONSE, None
+        return completed(('"%s done"' % workflow_id).encode()), None
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_wait_for_many(loop):
+    service = FakeService({"wf-%d" % i: i % 4 + 1 for i in range(100)})
+    client = AsyncWorkflowClient(service_pool=WorkflowServicePool(lambda: service, 4), domain="domain")
+    closed = []
+
+    async def wait_all():
+        waiter = WorkflowResultWaiter(client, poll_backoff=NO_WAIT)
+        futures = [waiter.wait("wf-%d" % i, callback=closed.append) for i in range(100)]
+        assert waiter.wait("wf-0") is futures[0]
+        results = await asyncio.gather(*futures)
+        await waiter.close()
+        return results
+
+    results = loop.run_until_complete(wait_all())
+    client.close()
+    assert results == ["wf-%d done" % i for i in range(100)]
+    assert len(closed) == 100
+    assert len(service.requests) == sum(i % 4 + 1 for i in range(100))
+    # More executions than connections: polls don't hold connections
+    assert not service.requests[0].wait_for_new_event
+
+
+def test_create_outside_loop(loop):
+    service = FakeService({"wf": 1})
+    client = AsyncWorkflowClient(service_pool=WorkflowServicePool(lambda: service, 4), domain="domain")
+    waiter = WorkflowResultWaiter(client, poll_backoff=NO_WAIT)
+    # Not bound to the loop current at construction (Python < 3.10)
+    assert waiter.changed is None
+
+    async def wait():
+        result = await waiter.wait("wf")
+        await waiter.close()
+        return result
+
+    assert loop.run_until_complete(wait()) == "wf done"
+    client.close()
+
+
+def test_errors(loop):
+    service = FakeService({"flaky": 1})
+    client = AsyncWorkflowClient(service_pool=WorkflowServicePool(lambda: service, 4), domain="domain")
+
+    async def wait_all():
+        waiter = WorkflowResultWaiter(client, poll_backoff=NO_WAIT)
+        futures = [waiter.wait("flaky"), waiter.wait("missing"), waiter.wait("canceled")]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        await waiter.close()
+        return results
+
+    flaky, missing, canceled = loop.run_until_complete(wait_all())
+    client.close()
+    assert flaky == "flaky done"
+    assert isinstance(missing, EntityNotExistsError)
+    assert isinstance(canceled, WorkflowExecutionCanceledException)
+    # Long polls while there is a connection for every execution
+    assert all(r.wait_for_new_event for r in service.requests)
+
+
+def test_new_execution_not_stuck_behind_long_polls(loop):
+    service = FakeService({"wf-1": 1})
+    release = threading.Event()
+    get_history = service.get_workflow_execution_history
+
+    def get_workflow_execution_history(request):
+        if request.execution.workflow_id == "slow":
+            release.wait(5)
+            return completed(b'"slow done"'), None
+        return get_history(request)
+
+    service.get_workflow_execution_history = get_workflow_execution_history
+    client = AsyncWorkflowClient(service_pool=WorkflowServicePool(lambda: service, 2), domain="domain")
+
+    async def wait_all():
+        waiter = WorkflowResultWaiter(client, poll_backoff=NO_WAIT)
+        slow = waiter.wait("slow")
+        await asyncio.sleep(0.05)
+        assert waiter.long_polls == 1
+        result = await asyncio.wait_for(waiter.wait("wf-1"), 1)
+        release.set()
+        results = [await slow, result]
+        await waiter.close()
+        return results
+
+    try:
+        assert loop.run_until_complete(wait_all()) == ["slow done", "wf-1 done"]
+    finally:
+        release.set()
+        client.close()
+    assert not service.requests[0].wait_for_new_event
+
+
+def test_sync_client_backs_off_on_empty_response():
+    service = Mock()
+    service.get_workflow_execution_history = Mock(side_effect=[(EMPTY_RESPONSE, None), (EMPTY_RESPONSE, None),
+                                                               (completed(b'"done"'), None)])
+    client = WorkflowClient(service=service, domain="domain", options=None)
+    with patch("cadence.workflow.time.sleep") as sleep:
+        assert client.wait_for_close_with_workflow_id("wid") == "done"
+    assert sleep.call_count == 2
+    first, second = [c.args[0] for c in sleep.call_args_list]
+    assert 0 < first < second
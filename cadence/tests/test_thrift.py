@@ -0,0 +1,35 @@
+import os
+from unittest.mock import Mock
+
+from thriftrw.idl.parser import Parser
+
+from cadence.thrift import CachingParser, cadence_thrift, load, cadence_thrift_file
+
+IDL = "struct Foo { 1: optional string bar }"
+
+
+def test_caching_parser(tmp_path):
+    parser = Mock(wraps=Parser())
+    caching_parser = CachingParser(parser, str(tmp_path))
+    program = caching_parser.parse(IDL)
+    assert os.listdir(tmp_path) == [os.path.basename(caching_parser.get_cache_path(IDL))]
+    assert CachingParser(parser, str(tmp_path)).parse(IDL) == program
+    parser.parse.assert_called_once()
+
+
+def test_unreadable_cache(tmp_path):
+    caching_parser = CachingParser(Parser(), str(tmp_path))
+    with open(caching_parser.get_cache_path(IDL), "wb") as f:
+        f.write(b"garbage")
+    assert caching_parser.parse(IDL).definitions[0].name == "Foo"
+
+
+def test_load(tmp_path):
+    module = load(cadence_thrift_file, cache_dir=str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 2  # cadence.thrift and shared.thrift
+    cached = load(cadence_thrift_file, cache_dir=str(tmp_path))
+    assert cached.shared.WorkflowExecution is not module.shared.WorkflowExecution
+    assert cached.WorkflowService.StartWorkflowExecution
+    execution = cached.shared.WorkflowExecution(workflowId="workflow-id", runId="run-id")
+    assert cadence_thrift.loads(cadence_thrift.shared.WorkflowExecution, cached.dumps(execution)).workflowId == \
+        "workflow-id"
@@ -0,0 +1,105 @@
+from unittest.mock import Mock
+
+import pytest
+
+from cadence.cadence_types import Header, StartWorkflowExecutionResponse
+from cadence.conversions import copy_py_to_thrift
+from cadence.tracing import SpanContext, RecordingTracer, InMemorySpanExporter, NOOP_TRACER, TRACEPARENT_HEADER, \
+    SPAN_KIND_CLIENT
+from cadence.workflow import WorkflowClient, WorkflowClientOptions, workflow_method
+from cadence.workflowservice import WorkflowService
+
+
+@pytest.fixture
+def exporter():
+    return InMemorySpanExporter()
+
+
+@pytest.fixture
+def tracer(exporter):
+    return RecordingTracer(exporter)
+
+
+def test_traceparent():
+    context = SpanContext(trace_id=0x4bf92f3577b34da6a3ce929d0e0e4736, span_id=0x00f067aa0ba902b7)
+    traceparent = context.to_traceparent()
+    assert traceparent == "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    assert SpanContext.from_traceparent(traceparent) == context
+    assert SpanContext.from_traceparent("garbage") is None
+
+
+def test_nested_spans(tracer, exporter):
+    with tracer.span("parent") as parent:
+        with tracer.span("child", attributes={"key": "value"}) as child:
+            pass
+    child_span, parent_span = exporter.get_finished_spans()
+    assert child_span is child and parent_span is parent
+    assert child.parent == parent.context
+    assert child.context.trace_id == parent.context.trace_id
+    assert child.attributes == {"key": "value"}
+    assert parent.parent is None
+    assert parent.end_time >= parent.start_time
+
+
+def test_explicit_parent(tracer, exporter):
+    remote = SpanContext(trace_id=1, span_id=2)
+    with tracer.span("outer"):
+        with tracer.span("task", parent=remote) as span:
+            pass
+    assert span.parent == remote
+    assert span.context.trace_id == 1
+
+
+def test_error_is_recorded(tracer, exporter):
+    with pytest.raises(ValueError):
+        with tracer.span("failing"):
+            raise ValueError("boom")
+    assert exporter.get_finished_spans()[0].error == "ValueError: boom"
+
+
+def test_inject_extract(tracer):
+    assert tracer.inject(None) is None
+    with tracer.span("start") as span:
+        header = tracer.inject(None)
+    assert header.fields[TRACEPARENT_HEADER] == span.context.to_traceparent().encode()
+    assert tracer.extract(header) == span.context
+    assert tracer.extract(Header()) is None
+    copy_py_to_thrift(header)
+
+
+def test_noop_tracer():
+    header = Header()
+    with NOOP_TRACER.span("span") as span:
+        assert span is None
+        assert NOOP_TRACER.inject(header) is header
+    assert not header.fields
+    assert NOOP_TRACER.extract(header) is None
+
+
+def test_rpc_span(tracer, exporter):
+    service = WorkflowService(Mock(), tracer=tracer)
+    service.connection.call_function = Mock(side_effect=ConnectionResetError("reset"))
+    with pytest.raises(ConnectionResetError):
+        service.thrift_call("DescribeDomain", None)
+    span = exporter.get_finished_spans()[0]
+    assert span.name == "WorkflowService::DescribeDomain"
+    assert span.kind == SPAN_KIND_CLIENT
+    assert span.error == "ConnectionResetError: reset"
+
+
+def test_start_workflow_propagates_context(tracer, exporter):
+    class DummyWorkflow:
+        @workflow_method(task_list="tasks")
+        def dummy(self):
+            pass
+
+    service = Mock()
+    service.start_workflow = Mock(return_value=(StartWorkflowExecutionResponse(run_id="run-id"), None))
+    client = WorkflowClient(service=service, domain="sample", options=WorkflowClientOptions(tracer=tracer))
+    stub = client.new_workflow_stub(DummyWorkflow)
+    WorkflowClient.start(stub.dummy)
+    span = exporter.get_finished_spans()[0]
+    assert span.name == "StartWorkflow:DummyWorkflow::dummy"
+    assert span.attributes["run_id"] == "run-id"
+    request = service.start_workflow.call_args[0][0]
+    assert tracer.extract(request.header) == span.context
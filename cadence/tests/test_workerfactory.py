@@ -0,0 +1,94 @@
+import time
+from unittest.mock import Mock
+
+from cadence.workerfactory import WorkerFactory, WorkerFactoryOptions
+
+
+class DummyWorker:
+
+    def __init__(self, threads: int = 1, threads_exit: bool = False):
+        self.threads = threads
+        self.threads_exit = threads_exit
+        self.threads_started = 0
+        self.threads_stopped = 0
+        self.service_instances = []
+
+    def start(self):
+        self.threads_started = self.threads
+        if self.threads_exit:
+            self.threads_stopped = self.threads
+
+    def stop(self):
+        self.threads_stopped = self.threads_started
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def test_start_in_process():
+    factory = WorkerFactory("localhost", 7933, "sample")
+    worker = Mock()
+    factory.workers.append(worker)
+    factory.start()
+    worker.start.assert_called_once()
+    factory.stop()
+    worker.stop.assert_called_once()
+
+
+def test_start_processes():
+    factory = WorkerFactory("localhost", 7933, "sample", options=WorkerFactoryOptions(processes=2))
+    factory.workers.append(DummyWorker())
+    factory.start()
+    try:
+        assert len(factory.processes) == 2
+        assert all(p.is_alive() for p in factory.processes)
+        assert len(set(p.pid for p in factory.processes)) == 2
+    finally:
+        factory.stop()
+    assert all(p.exitcode == 0 for p in factory.processes)
+
+
+def test_restart_crashed_process():
+    factory = WorkerFactory("localhost", 7933, "sample",
+                            options=WorkerFactoryOptions(processes=1, restart_delay_seconds=0))
+    factory.workers.append(DummyWorker())
+    factory.start()
+    try:
+        pid = factory.processes[0].pid
+        factory.processes[0].kill()
+        assert wait_for(lambda: factory.processes[0].pid != pid and factory.processes[0].is_alive())
+    finally:
+        factory.stop()
+
+
+def test_process_exits_when_worker_threads_exit():
+    factory = WorkerFactory("localhost", 7933, "sample",
+                            options=WorkerFactoryOptions(processes=1, restart_crashed_processes=False))
+    factory.workers.append(DummyWorker(threads_exit=True))
+    factory.workers.append(DummyWorker(threads=0))
+    factory.start()
+    process = factory.processes[0]
+    try:
+        assert wait_for(lambda: not process.is_alive())
+        assert process.exitcode == 1
+    finally:
+        factory.stop()
+
+
+def test_process_without_worker_threads_keeps_running():
+    factory = WorkerFactory("localhost", 7933, "sample",
+                            options=WorkerFactoryOptions(processes=1, restart_crashed_processes=False))
+    factory.workers.append(DummyWorker(threads=0))
+    factory.start()
+    process = factory.processes[0]
+    try:
+        assert not wait_for(lambda: not process.is_alive(), timeout=2.5)
+    finally:
+        factory.stop()
+    assert process.exitcode == 0
@@ -0,0 +1,55 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from cadence.workflowservice import WorkflowServicePool
+
+
+def test_reuse_connection():
+    factory = Mock(side_effect=lambda: Mock())
+    pool = WorkflowServicePool(factory, 2)
+    with pool.acquire() as s1:
+        pass
+    with pool.acquire() as s2:
+        pass
+    assert s1 is s2
+    assert factory.call_count == 1
+
+
+def test_discard_on_exception():
+    factory = Mock(side_effect=lambda: Mock())
+    pool = WorkflowServicePool(factory, 2)
+    with pytest.raises(OSError):
+        with pool.acquire() as s1:
+            raise OSError()
+    s1.close.assert_called_once()
+    with pool.acquire() as s2:
+        pass
+    assert s1 is not s2
+
+
+def test_size_limit():
+    factory = Mock(side_effect=lambda: Mock())
+    pool = WorkflowServicePool(factory, 1)
+    acquired = threading.Event()
+
+    def acquire():
+        with pool.acquire():
+            acquired.set()
+
+    with pool.acquire():
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        assert not acquired.wait(0.1)
+    thread.join()
+    assert acquired.is_set()
+
+
+def test_close():
+    factory = Mock(side_effect=lambda: Mock())
+    pool = WorkflowServicePool(factory, 2)
+    with pool.acquire() as s1:
+        pass
+    pool.close()
+    s1.close.assert_called_once()
@@ -47,5 +47,17 @@ def test_exec_signal(workflow_client, workflow_service, workflow_execution):
     args, kwargs = workflow_service.signal_workflow_execution.call_args_list[0]
     request: SignalWorkflowExecutionRequest = args[0]
     assert request.signal_name == "DummyWorkflow::the_signal_method"
-    assert request.input == json.dumps(["bob", 25])
+    assert request.input == json.dumps(["bob", 25]).encode("utf-8")
     assert request.workflow_execution == workflow_execution
+
+
+def test_stub_class_cached(workflow_client, workflow_service):
+    stub = workflow_client.new_workflow_stub(DummyWorkflow)
+    other_client = WorkflowClient(service=workflow_service, domain="other", options=None)
+    other = other_client.new_workflow_stub_from_workflow_id(DummyWorkflow, "the-workflow-id")
+    assert type(stub) is type(other)
+    assert stub._workflow_client is workflow_client
+    assert other._workflow_client is other_client
+    assert stub._execution is None
+    assert other._execution.workflow_id == "the-workflow-id"
+    assert not hasattr(stub, "__dict__")
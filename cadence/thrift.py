@@ -1,7 +1,67 @@
+import hashlib
+import logging
 import os
+import pickle
+import sys
 
 import thriftrw
+from thriftrw.loader import Loader
+from thriftrw.protocol import BinaryProtocol
+
+logger = logging.getLogger(__name__)
 
 this_dir = os.path.dirname(__file__)
 cadence_thrift_file = os.path.join(this_dir, "thrift/cadence.thrift")
-cadence_thrift = thriftrw.load(cadence_thrift_file)
+# Parsing the IDL with ply is most of the time spent importing this module, the parsed IDL is
+# cached here (like .pyc files). Precompile with: python -m cadence.thrift
+THRIFT_CACHE_DIR = os.environ.get("CADENCE_THRIFT_CACHE_DIR", os.path.join(this_dir, "thrift", "__pycache__"))
+
+
+class CachingParser:
+    """
+    Wraps the thriftrw parser and pickles the AST of each document, keyed by the hash of the
+    document and the thriftrw and Python versions. Code generation from the AST still runs on
+    every load, so the cache can't get out of sync with the installed thriftrw.
+    """
+
+    def __init__(self, parser, cache_dir: str):
+        self.parser = parser
+        self.cache_dir = cache_dir
+
+    def get_cache_path(self, contents: str) -> str:
+        key = hashlib.sha256(contents.encode("utf-8"))
+        key.update(("%s-%d.%d" % (thriftrw.__version__, *sys.version_info[:2])).encode("ascii"))
+        return os.path.join(self.cache_dir, "thrift-%s.pickle" % key.hexdigest()[:32])
+
+    def parse(self, contents: str):
+        path = self.get_cache_path(contents)
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as ex:
+            logger.warning("Ignoring unreadable thrift cache %s: %s", path, ex)
+        program = self.parser.parse(contents)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = "%s.%d.tmp" % (path, os.getpid())
+            with open(tmp_path, "wb") as f:
+                pickle.dump(program, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as ex:
+            # e.g. read-only site-packages, the IDL gets parsed on every start
+            logger.debug("Cannot write thrift cache %s: %s", path, ex)
+        return program
+
+
+def load(path: str, cache_dir: str = THRIFT_CACHE_DIR):
+    loader = Loader(protocol=BinaryProtocol())
+    loader.compiler.parser = CachingParser(loader.compiler.parser, cache_dir)
+    return loader.load(path)
+
+
+cadence_thrift = load(cadence_thrift_file)
+
+if __name__ == "__main__":
+    print("Thrift IDL cached in " + THRIFT_CACHE_DIR)
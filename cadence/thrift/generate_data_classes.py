@@ -14,13 +14,27 @@ TYPE_MAP = {
 
 HEADER = """from __future__ import annotations
 from typing import List, Dict
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import IntEnum
 
+
+def slots(cls):
+    # Same as @dataclass(slots=True), which requires Python 3.10: instances have no __dict__
+    cls_dict = dict(cls.__dict__)
+    names = tuple(f.name for f in fields(cls))
+    cls_dict["__slots__"] = names
+    for name in names:
+        # Defaults are kept by the generated __init__
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
 """
 
 DATA_CLASS_TEMPLATE = """
 # noinspection PyPep8
+@slots
 @dataclass
 class {{type_name}}:
     {% for field in fields %}{{field.name|to_snake()}}: {{ field.type|python_type }} = {{field.type|python_value}}
@@ -35,9 +49,11 @@ class {{type_name}}(IntEnum):
     {% endfor %}
     @classmethod
     def value_for(cls, n: int) -> {{type_name}}:
-        return next(filter(lambda i: i == n, cls), None)
+        return _{{type_name}}_BY_VALUE.get(n)
+
+
+_{{type_name}}_BY_VALUE = {item.value: item for item in {{type_name}}}
 
-    
 """
 
 def filter_to_snake(value):
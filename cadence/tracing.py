@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import contextvars
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Optional, List
+
+from cadence.cadence_types import Header
+
+# W3C Trace Context header, understood by OpenTelemetry propagators
+TRACEPARENT_HEADER = "traceparent"
+TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+SPAN_KIND_INTERNAL = "internal"
+SPAN_KIND_CLIENT = "client"
+SPAN_KIND_CONSUMER = "consumer"
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    trace_id: int
+    span_id: int
+
+    def to_traceparent(self) -> str:
+        return "00-%032x-%016x-01" % (self.trace_id, self.span_id)
+
+    @classmethod
+    def from_traceparent(cls, value: str) -> Optional[SpanContext]:
+        m = TRACEPARENT_PATTERN.match(value)
+        if not m:
+            return None
+        return cls(trace_id=int(m.group(1), 16), span_id=int(m.group(2), 16))
+
+
+@dataclass
+class Span:
+    name: str
+    context: SpanContext
+    parent: Optional[SpanContext] = None
+    kind: str = SPAN_KIND_INTERNAL
+    attributes: Dict[str, object] = field(default_factory=dict)
+    start_time: float = 0
+    end_time: Optional[float] = None
+    error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: object):
+        self.attributes[key] = value
+
+    def record_exception(self, ex: BaseException):
+        self.error = f"{type(ex).__name__}: {ex}"
+
+
+current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Creates spans for client calls, decision tasks, activity executions and RPCs. This base class
+    creates nothing: span() yields None and inject() leaves the header alone, so tracing costs a
+    function call when disabled.
+
+    Span contexts are propagated between processes in the Header of StartWorkflowExecutionRequest
+    and ScheduleActivityTaskDecisionAttributes using the W3C traceparent format.
+    """
+
+    @contextmanager
+    def span(self, name: str, parent: SpanContext = None, kind: str = SPAN_KIND_INTERNAL,
+             attributes: Dict[str, object] = None):
+        yield None
+
+    def inject(self, header: Optional[Header], span_context: SpanContext = None) -> Optional[Header]:
+        return header
+
+    def extract(self, header: Optional[Header]) -> Optional[SpanContext]:
+        return None
+
+
+NOOP_TRACER = Tracer()
+
+
+class SpanExporter:
+
+    def export(self, span: Span):
+        raise NotImplementedError()
+
+
+class InMemorySpanExporter(SpanExporter):
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self.lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self.lock:
+            self.spans.append(span)
+
+    def get_finished_spans(self) -> List[Span]:
+        with self.lock:
+            return list(self.spans)
+
+    def clear(self):
+        with self.lock:
+            self.spans = []
+
+
+class RecordingTracer(Tracer):
+    """
+    Records spans and hands them to `exporter` when they end. Without an explicit parent a span is
+    the child of the current span of the thread (or asyncio task).
+    """
+
+    def __init__(self, exporter: SpanExporter):
+        self.exporter = exporter
+
+    @contextmanager
+    def span(self, name: str, parent: SpanContext = None, kind: str = SPAN_KIND_INTERNAL,
+             attributes: Dict[str, object] = None):
+        if not parent:
+            current = current_span.get()
+            parent = current.context if current else None
+        trace_id = parent.trace_id if parent else random.getrandbits(128)
+        span = Span(name=name, context=SpanContext(trace_id, random.getrandbits(64)), parent=parent, kind=kind,
+                    attributes=dict(attributes) if attributes else {}, start_time=time.time())
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as ex:
+            span.record_exception(ex)
+            raise
+        finally:
+            current_span.reset(token)
+            span.end_time = time.time()
+            self.exporter.export(span)
+
+    def inject(self, header: Optional[Header], span_context: SpanContext = None) -> Optional[Header]:
+        if not span_context:
+            current = current_span.get()
+            span_context = current.context if current else None
+        if not span_context:
+            return header
+        if not header:
+            header = Header()
+        header.fields[TRACEPARENT_HEADER] = span_context.to_traceparent().encode("ascii")
+        return header
+
+    def extract(self, header: Optional[Header]) -> Optional[SpanContext]:
+        if not header or not header.fields:
+            return None
+        value = header.fields.get(TRACEPARENT_HEADER)
+        if not value:
+            return None
+        return SpanContext.from_traceparent(value.decode("ascii", errors="replace"))
@@ -5,17 +5,93 @@ import threading
 import logging
 import time
 
+from cadence.backoff import BackoffPolicy, CircuitBreaker, Backoff
 from cadence.constants import DEFAULT_SOCKET_TIMEOUT_SECONDS
 from cadence.conversions import camel_to_snake, snake_to_camel
+from cadence.data_converter import DataConverter, DEFAULT_DATA_CONVERTER
+from cadence.decider_cache import DeciderCache
+from cadence.decision_profiler import DecisionProfiler
+from cadence.exceptions import StopRequestedException
+from cadence.interceptors import InterceptorChains
+from cadence.metrics import MetricsScope, NOOP_SCOPE
+from cadence.payload_codec import PayloadCodec, create_data_converter
+from cadence.poller_autoscaler import create_autoscaler
+from cadence.query_cache import QueryResultCache
+from cadence.rate_limiter import TokenBucket, RateLimiterStats
 from cadence.workflow import WorkflowMethod, SignalMethod, QueryMethod
-from cadence.workflowservice import WorkflowService
+from cadence.tracing import Tracer, NOOP_TRACER
+from cadence.workflowservice import WorkflowService, WorkflowServicePool
 
 logger = logging.getLogger(__name__)
 
+STOP_CHECK_INTERVAL_SECONDS = 0.5
+
 
 @dataclass
 class WorkerOptions:
-    pass
+    # Number of background threads (and connections) used to send activity completions. When 0
+    # the activity poller responds inline before polling again.
+    activity_completion_responders: int = 0
+    activity_completion_queue_size: int = 100
+    activity_completion_max_attempts: int = 5
+    # Ask the server to return the next decision task (if there are new events) in the response to
+    # RespondDecisionTaskCompleted instead of waiting for the next poll.
+    return_new_decision_task: bool = False
+    # Maximum number of decision tasks processed at the same time, each on its own thread. Decision
+    # tasks for the same workflow run are always processed one at a time.
+    max_concurrent_decision_tasks: int = 1
+    # Pollers (each with its own connection) are scaled between min and max: up when polls keep
+    # returning tasks or the backlog grows, down when most long polls come back empty.
+    activity_pollers_min: int = 1
+    activity_pollers_max: int = 1
+    decision_pollers_min: int = 1
+    decision_pollers_max: int = 1
+    # When set, pollers also sample the task list backlog with DescribeTaskList at this interval
+    poller_backlog_sample_interval_seconds: float = 0
+    # Backoff applied by pollers after a failed poll
+    poll_backoff: BackoffPolicy = field(default_factory=BackoffPolicy)
+    # Number of consecutive poll failures, across all the pollers of the worker, that opens the circuit
+    # breaker and pauses polling. 0 disables the circuit breaker.
+    poll_circuit_breaker_failure_threshold: int = 0
+    # Retries the service calls of the worker failing with transient server or transport errors,
+    # reconnecting after transport errors. None disables retries.
+    service_retry_policy: BackoffPolicy = None
+    # Number of consecutive failed service calls, across all the connections of the worker, that opens
+    # a circuit breaker failing calls with CircuitOpenError. 0 disables the circuit breaker.
+    service_circuit_breaker_failure_threshold: int = 0
+    # Activities per second dispatched by the server for the whole task list, across all the workers
+    # polling it (TaskListMetadata.max_tasks_per_second)
+    task_list_activities_per_second: float = 200000
+    # Activities per second started by this worker, pollers wait before polling when exceeded. 0 means
+    # unlimited.
+    worker_activities_per_second: float = 0
+    # Activities per second started by this worker per activity type (e.g. "GreetingActivities::compose_greeting").
+    # Tasks over the limit are delayed before being executed, the delay counts toward their timeouts.
+    activity_type_rates_per_second: Dict[str, float] = field(default_factory=dict)
+    # Metrics emitted by the worker's pollers, tasks and service calls, tagged with domain and task_list
+    metrics_scope: MetricsScope = NOOP_SCOPE
+    # Times the phases and event handlers of every decision task when set, see DecisionProfiler
+    decision_profiler: DecisionProfiler = None
+    # Creates spans for decision tasks, activity executions and service calls
+    tracer: Tracer = NOOP_TRACER
+    # ActivityInterceptor, WorkflowInterceptor and ServiceInterceptor instances, outermost first
+    interceptors: List[object] = field(default_factory=list)
+    # Serializes workflow and activity inputs and results, signals, queries and version markers. Must
+    # match the data_converter of the WorkflowClient starting the workflows.
+    data_converter: DataConverter = DEFAULT_DATA_CONVERTER
+    # Applied to every payload after data_converter, e.g. CompressionCodec. Payloads written without
+    # it are still read.
+    payload_codec: PayloadCodec = None
+    # Number of workflow runs whose decider is kept after their decision task completes. Queries on
+    # these runs are answered from the live workflow instance when no event was added since,
+    # instead of replaying the history. 0 disables the cache.
+    decider_cache_size: int = 0
+    # Number of query results kept by the worker, keyed by run, history position, query type and
+    # arguments. The same query on an unchanged history is answered without running workflow code.
+    # Query methods declared with memoize=False are always run. 0 disables the cache.
+    query_cache_size: int = 0
+    # How long a query result is kept in the query cache
+    query_cache_ttl_seconds: float = 60
 
 
 def _find_interface_class(impl_cls) -> type:
@@ -72,6 +148,22 @@ class Worker:
     service_instances: List[WorkflowService] = field(default_factory=list)
     timeout: int = DEFAULT_SOCKET_TIMEOUT_SECONDS
 
+    poll_circuit_breaker: CircuitBreaker = None
+    service_circuit_breaker: CircuitBreaker = None
+    activity_rate_limiter: TokenBucket = None
+    activity_type_rate_limiters: Dict[str, TokenBucket] = field(default_factory=dict)
+    metrics_scope: MetricsScope = None
+    interceptor_chains: InterceptorChains = None
+    data_converter: DataConverter = None
+
+    def __post_init__(self):
+        if not self.options:
+            self.options = WorkerOptions()
+        self.metrics_scope = self.options.metrics_scope.tagged({"domain": self.domain, "task_list": self.task_list})
+        self.interceptor_chains = InterceptorChains(self.options.interceptors)
+        self.data_converter = create_data_converter(self.options.data_converter, self.options.payload_codec,
+                                                    self.metrics_scope)
+
     def register_activities_implementation(self, activities_instance: object, activities_cls_name: str = None):
         cls_name = activities_cls_name if activities_cls_name else type(activities_instance).__name__
         for method_name, fn in inspect.getmembers(activities_instance, predicate=inspect.ismethod):
@@ -86,6 +178,8 @@ class Worker:
             impl_cls._signal_methods = {}
         if not hasattr(impl_cls, "_query_methods"):
             impl_cls._query_methods = {}
+        if not hasattr(impl_cls, "_non_memoized_query_methods"):
+            impl_cls._non_memoized_query_methods = set()
         for method_name, fn in inspect.getmembers(impl_cls, predicate=inspect.isfunction):
             wm: WorkflowMethod = _get_wm(impl_cls, method_name)
             if wm:
@@ -108,25 +202,48 @@ class Worker:
             qm: QueryMethod = _get_qm(impl_cls, method_name)
             if qm:
                 impl_fn = getattr(impl_cls, method_name)
-                impl_cls._query_methods[qm.name] = impl_fn
+                names = [qm.name]
                 if "::" in qm.name:
                     _, method_name = qm.name.split("::")
-                    impl_cls._query_methods[f'{cls_name}::{camel_to_snake(method_name)}'] = impl_fn
-                    impl_cls._query_methods[f'{cls_name}::{snake_to_camel(method_name)}'] = impl_fn
+                    names.append(f'{cls_name}::{camel_to_snake(method_name)}')
+                    names.append(f'{cls_name}::{snake_to_camel(method_name)}')
+                for query_name in names:
+                    impl_cls._query_methods[query_name] = impl_fn
+                    if not qm.memoize:
+                        impl_cls._non_memoized_query_methods.add(query_name)
 
 
     def start(self):
-        from cadence.activity_loop import activity_task_loop
+        from cadence.activity_loop import activity_task_loop, create_responder
         from cadence.decision_loop import DecisionTaskLoop
         self.threads_stopped = 0
         self.threads_started = 0
         self.stop_requested = False
+        self.interceptor_chains = InterceptorChains(self.options.interceptors)
+        self.data_converter = create_data_converter(self.options.data_converter, self.options.payload_codec,
+                                                    self.metrics_scope)
+        if self.options.poll_circuit_breaker_failure_threshold:
+            self.poll_circuit_breaker = CircuitBreaker(failure_threshold=self.options.poll_circuit_breaker_failure_threshold)
+        if self.options.service_circuit_breaker_failure_threshold:
+            self.service_circuit_breaker = CircuitBreaker(
+                failure_threshold=self.options.service_circuit_breaker_failure_threshold)
+        if self.options.worker_activities_per_second:
+            self.activity_rate_limiter = TokenBucket(self.options.worker_activities_per_second)
+        self.activity_type_rate_limiters = {activity_type: TokenBucket(rate) for activity_type, rate
+                                            in self.options.activity_type_rates_per_second.items()}
         if self.activities:
-            thread = threading.Thread(target=activity_task_loop, args=(self,))
-            thread.start()
-            self.threads_started += 1
+            scaler = create_autoscaler(self.options.activity_pollers_min, self.options.activity_pollers_max)
+            pollers = scaler.max_pollers if scaler else 1
+            responder = create_responder(self, pollers)
+            for poller_index in range(pollers):
+                thread = threading.Thread(target=activity_task_loop, args=(self, poller_index, scaler, responder))
+                thread.start()
+                self.threads_started += 1
         if self.workflow_methods:
-            decision_task_loop = DecisionTaskLoop(worker=self)
+            decider_cache = DeciderCache(self.options.decider_cache_size) if self.options.decider_cache_size else None
+            query_cache = QueryResultCache(self.options.query_cache_size, self.options.query_cache_ttl_seconds) \
+                if self.options.query_cache_size else None
+            decision_task_loop = DecisionTaskLoop(worker=self, decider_cache=decider_cache, query_cache=query_cache)
             decision_task_loop.start()
             self.threads_started += 1
 
@@ -151,6 +268,24 @@ class Worker:
     def manage_service(self, service: WorkflowService):
         self.service_instances.append(service)
 
+    def create_service(self) -> WorkflowService:
+        service = WorkflowService.create(self.host, self.port, timeout=self.get_timeout(),
+                                         retry_policy=self.options.service_retry_policy,
+                                         circuit_breaker=self.service_circuit_breaker,
+                                         metrics_scope=self.metrics_scope, tracer=self.options.tracer,
+                                         interceptors=self.interceptor_chains.service_interceptors)
+        self.manage_service(service)
+        return service
+
+    def create_service_pool(self, size: int) -> WorkflowServicePool:
+        pool = WorkflowServicePool.create(self.host, self.port, size, timeout=self.get_timeout(),
+                                          metrics_scope=self.metrics_scope, tracer=self.options.tracer,
+                                          interceptors=self.interceptor_chains.service_interceptors,
+                                          retry_policy=self.options.service_retry_policy,
+                                          circuit_breaker=self.service_circuit_breaker)
+        self.manage_service(pool)
+        return pool
+
     def set_timeout(self, timeout):
         self.timeout = timeout
 
@@ -161,6 +296,26 @@ class Worker:
         if self.is_stop_requested():
             raise StopRequestedException()
 
+    def interruptible_sleep(self, seconds: float):
+        """
+        Raises StopRequestedException as soon as stop is requested while sleeping.
+        """
+        deadline = time.time() + seconds
+        while True:
+            self.raise_if_stop_requested()
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, STOP_CHECK_INTERVAL_SECONDS))
+
+    def get_rate_limiter_stats(self) -> Dict[str, RateLimiterStats]:
+        """
+        Stats of the worker-local rate limiters, the worker wide limiter is reported as "*".
+        """
+        stats = {activity_type: limiter.get_stats() for activity_type, limiter in self.activity_type_rate_limiters.items()}
+        if self.activity_rate_limiter:
+            stats["*"] = self.activity_rate_limiter.get_stats()
+        return stats
 
-class StopRequestedException(Exception):
-    pass
+    def create_poll_backoff(self) -> Backoff:
+        return Backoff(self.options.poll_backoff, self.poll_circuit_breaker)
@@ -1,12 +1,30 @@
+import logging
+import multiprocessing
+import signal
+import sys
+import threading
+import time
 from dataclasses import dataclass, field
-from typing import List
+from multiprocessing.process import BaseProcess
+from typing import List, Optional
 
 from cadence.worker import Worker, WorkerOptions
 
+logger = logging.getLogger(__name__)
+
+STOP_SIGNALS = {signal.SIGTERM, signal.SIGINT}
+PROCESS_CHECK_INTERVAL_SECONDS = 1
+
 
 @dataclass
 class WorkerFactoryOptions:
-    pass
+    # Number of worker processes to fork. Every process runs all the workers registered with the
+    # factory, with its own connections and pollers. When 0 the workers run in the current process.
+    processes: int = 0
+    restart_crashed_processes: bool = True
+    restart_delay_seconds: float = 1
+    # How long stop() waits for a process to shutdown gracefully before killing it
+    shutdown_timeout_seconds: float = 30
 
 
 @dataclass
@@ -16,6 +34,13 @@ class WorkerFactory:
     domain: str = None
     options: WorkerFactoryOptions = None
     workers: List[Worker] = field(default_factory=list)
+    processes: List[Optional[BaseProcess]] = field(default_factory=list)
+    supervisor: threading.Thread = None
+    stop_requested: threading.Event = field(default_factory=threading.Event)
+
+    def __post_init__(self):
+        if not self.options:
+            self.options = WorkerFactoryOptions()
 
     def new_worker(self, task_list: str, worker_options: WorkerOptions = None) -> Worker:
         worker = Worker(host=self.host, port=self.port, domain=self.domain, task_list=task_list, options=worker_options)
@@ -23,5 +48,80 @@ class WorkerFactory:
         return worker
 
     def start(self):
-        for worker in self.workers:
-            worker.start()
+        self.stop_requested.clear()
+        if not self.options.processes:
+            for worker in self.workers:
+                worker.start()
+            return
+        self.processes = [self.start_process(i) for i in range(self.options.processes)]
+        self.supervisor = threading.Thread(target=self.supervise, name="worker-process-supervisor", daemon=True)
+        self.supervisor.start()
+
+    def stop(self):
+        self.stop_requested.set()
+        if not self.options.processes:
+            for worker in self.workers:
+                worker.stop()
+            return
+        if self.supervisor:
+            self.supervisor.join()
+        for process in self.processes:
+            if process and process.is_alive():
+                process.terminate()
+        deadline = time.time() + self.options.shutdown_timeout_seconds
+        for process in self.processes:
+            if not process:
+                continue
+            process.join(max(deadline - time.time(), 0))
+            if process.is_alive():
+                logger.warning("Worker process %d did not stop in time, killing it", process.pid)
+                process.kill()
+                process.join()
+
+    def start_process(self, index: int) -> BaseProcess:
+        # fork so that workflow and activity implementations registered at runtime are inherited
+        context = multiprocessing.get_context("fork")
+        process = context.Process(target=run_worker_process, args=(self.workers,), name=f"cadence-worker-{index}")
+        # The child inherits the blocked signals and waits for them in run_worker_process(), so that a
+        # stop() right after start() shuts it down gracefully instead of killing it
+        previous_mask = signal.pthread_sigmask(signal.SIG_BLOCK, STOP_SIGNALS)
+        try:
+            process.start()
+        finally:
+            signal.pthread_sigmask(signal.SIG_SETMASK, previous_mask)
+        logger.info("Started worker process %d (%s)", process.pid, process.name)
+        return process
+
+    def supervise(self):
+        while not self.stop_requested.wait(1):
+            for i, process in enumerate(self.processes):
+                if not process or process.is_alive():
+                    continue
+                logger.error("Worker process %d (%s) exited with code %s", process.pid, process.name,
+                             process.exitcode)
+                if not self.options.restart_crashed_processes:
+                    self.processes[i] = None
+                    continue
+                if self.stop_requested.wait(self.options.restart_delay_seconds):
+                    return
+                self.processes[i] = self.start_process(i)
+
+
+def run_worker_process(workers: List[Worker]):
+    # SIGTERM/SIGINT are still blocked (see start_process) and are inherited blocked by the worker
+    # threads, they are received with sigtimedwait() instead of a handler
+    for worker in workers:
+        worker.service_instances = []
+        worker.start()
+    while not signal.sigtimedwait(STOP_SIGNALS, PROCESS_CHECK_INTERVAL_SECONDS):
+        if all_threads_exited(workers):
+            logger.error("All worker threads exited, restarting worker process")
+            sys.exit(1)
+    for worker in workers:
+        worker.stop()
+
+
+def all_threads_exited(workers: List[Worker]) -> bool:
+    # Workers with nothing registered start no threads, they don't count as exited
+    running = [worker for worker in workers if worker.threads_started > 0]
+    return bool(running) and all(worker.threads_stopped == worker.threads_started for worker in running)
@@ -3,26 +3,41 @@ import datetime
 import inspect
 import json
 import random
+import time
 import uuid
 from dataclasses import dataclass, field
-from typing import Callable, List, Type, Dict, Tuple
+from functools import lru_cache, partial
+from typing import Callable, List, Type, Dict, Tuple, Iterator, Optional
 from uuid import uuid4
 
 
 from cadence.activity import ActivityCompletionClient
 from cadence.activity_method import RetryParameters, ActivityOptions
+from cadence.backoff import BackoffPolicy, CircuitBreaker
 from cadence.cadence_types import WorkflowIdReusePolicy, StartWorkflowExecutionRequest, TaskList, WorkflowType, \
     GetWorkflowExecutionHistoryRequest, WorkflowExecution, HistoryEventFilterType, EventType, HistoryEvent, \
     StartWorkflowExecutionResponse, SignalWorkflowExecutionRequest, QueryWorkflowRequest, WorkflowQuery, \
-    QueryWorkflowResponse
+    QueryWorkflowResponse, StartTimeFilter, WorkflowExecutionInfo, WorkflowExecutionCloseStatus, \
+    ListOpenWorkflowExecutionsRequest, ListClosedWorkflowExecutionsRequest, ListWorkflowExecutionsRequest, \
+    WorkflowExecutionFilter, WorkflowTypeFilter
 from cadence.constants import DEFAULT_SOCKET_TIMEOUT_SECONDS
-from cadence.conversions import args_to_json, json_to_args
+from cadence.data_converter import DataConverter, DEFAULT_DATA_CONVERTER
 from cadence.errors import QueryFailedError
 from cadence.exception_handling import deserialize_exception
 from cadence.exceptions import WorkflowFailureException, ActivityFailureException, QueryRejectedException, \
     QueryFailureException
+from cadence.interceptors import ServiceInterceptor
+from cadence.metrics import MetricsScope, NOOP_SCOPE
+from cadence.pagination import iterate_pages, check_response
+from cadence.payload_codec import PayloadCodec, create_data_converter
+from cadence.query_coalescer import QueryCoalescer, QueryCoalescerStats, DEFAULT_QUERY_CACHE_SIZE
+from cadence.tracing import Tracer, NOOP_TRACER, SPAN_KIND_CLIENT
 from cadence.workflowservice import WorkflowService
 
+DEFAULT_PAGE_SIZE = 1000
+# Waits between long polls for the close event that returned no event
+EMPTY_POLL_BACKOFF = BackoffPolicy(initial_interval_seconds=0.1, maximum_interval_seconds=5)
+
 
 class Workflow:
 
@@ -34,6 +49,7 @@ class Workflow:
         cls = activities_cls()
         cls._decision_context = task.decider.decision_context
         cls._retry_parameters = retry_parameters
+        cls._data_converter = task.decider.data_converter
         cls._activity_options = activity_options
         return cls
 
@@ -104,7 +120,36 @@ class Workflow:
 
 
 class WorkflowStub:
-    pass
+    """
+    Base of the stub classes created for workflow interfaces, see get_workflow_stub_class. A stub
+    is bound to one execution once the workflow is started or from new_workflow_stub_from_workflow_id.
+    """
+    __slots__ = ("_workflow_client", "_workflow_options", "_execution")
+
+    def __init__(self, workflow_client, workflow_options: WorkflowOptions = None,
+                 execution: WorkflowExecution = None):
+        self._workflow_client = workflow_client
+        self._workflow_options = workflow_options
+        self._execution = execution
+
+
+def create_stub_class(cls: Type, workflow_stub_fn: Callable, signal_stub_fn: Callable,
+                      query_stub_fn: Callable) -> Type[WorkflowStub]:
+    attrs = {"__slots__": ()}
+    for name, fn in inspect.getmembers(cls, inspect.isfunction):
+        if hasattr(fn, "_workflow_method"):
+            attrs[name] = workflow_stub_fn(fn._workflow_method)
+        elif hasattr(fn, "_signal_method"):
+            attrs[name] = signal_stub_fn(fn._signal_method)
+        elif hasattr(fn, "_query_method"):
+            attrs[name] = query_stub_fn(fn._query_method)
+    return type(cls.__name__, (WorkflowStub,), attrs)
+
+
+@lru_cache(maxsize=None)
+def get_workflow_stub_class(cls: Type) -> Type[WorkflowStub]:
+    # Created once per workflow interface, stubs only differ by their client, options and execution
+    return create_stub_class(cls, get_workflow_stub_fn, get_signal_stub_fn, get_query_stub_fn)
 
 
 @dataclass
@@ -118,11 +163,27 @@ class WorkflowClient:
     service: WorkflowService
     domain: domain
     options: WorkflowClientOptions
+    data_converter: DataConverter = None
+    query_coalescer: QueryCoalescer = None
+
+    def __post_init__(self):
+        if not self.options:
+            self.options = WorkflowClientOptions()
+        metrics_scope = self.options.metrics_scope.tagged({"domain": self.domain})
+        self.data_converter = create_data_converter(self.options.data_converter, self.options.payload_codec,
+                                                    metrics_scope)
+        if self.options.coalesce_queries or self.options.query_cache_ttl_seconds:
+            self.query_coalescer = QueryCoalescer(self.options.query_cache_ttl_seconds,
+                                                  self.options.query_cache_size, metrics_scope)
 
     @classmethod
     def new_client(cls, host: str = "localhost", port: int = 7933, domain: str = "",
                    options: WorkflowClientOptions = None, timeout: int = DEFAULT_SOCKET_TIMEOUT_SECONDS) -> WorkflowClient:
-        service = WorkflowService.create(host, port, timeout=timeout)
+        options = options if options else WorkflowClientOptions()
+        service = WorkflowService.create(host, port, timeout=timeout, retry_policy=options.service_retry_policy,
+                                         circuit_breaker=create_circuit_breaker(options),
+                                         metrics_scope=options.metrics_scope, tracer=options.tracer,
+                                         interceptors=options.interceptors)
         return cls(service=service, domain=domain, options=options)
 
     @classmethod
@@ -134,28 +195,15 @@ class WorkflowClient:
                              workflow_options=stub._workflow_options, stub_instance=stub)
 
     def new_workflow_stub(self, cls: Type, workflow_options: WorkflowOptions = None):
-        attrs = {}
-        attrs["_workflow_client"] = self
-        attrs["_workflow_options"] = workflow_options
-        for name, fn in inspect.getmembers(cls, inspect.isfunction):
-            if hasattr(fn, "_workflow_method"):
-                attrs[name] = get_workflow_stub_fn(fn._workflow_method)
-            elif hasattr(fn, "_signal_method"):
-                attrs[name] = get_signal_stub_fn(fn._signal_method)
-            elif hasattr(fn, "_query_method"):
-                attrs[name] = get_query_stub_fn(fn._query_method)
-        stub_cls = type(cls.__name__, (WorkflowStub,), attrs)
-        return stub_cls()
+        return get_workflow_stub_class(cls)(self, workflow_options)
 
     def new_workflow_stub_from_workflow_id(self, cls: Type, workflow_id: str):
         """
         Use it to send signals or queries to a running workflow.
         Do not call workflow methods on it
         """
-        stub_instance = self.new_workflow_stub(cls)
         execution = WorkflowExecution(workflow_id=workflow_id, run_id=None)
-        stub_instance._execution = execution
-        return stub_instance
+        return get_workflow_stub_class(cls)(self, execution=execution)
 
     def wait_for_close(self, context: WorkflowExecutionContext) -> object:
         return self.wait_for_close_with_workflow_id(workflow_id=context.workflow_execution.workflow_id,
@@ -163,52 +211,134 @@ class WorkflowClient:
                                                     workflow_type=context.workflow_type)
 
     def wait_for_close_with_workflow_id(self, workflow_id: str, run_id: str = None, workflow_type: str = None):
+        empty_polls = 0
         while True:
             history_request = create_close_history_event_request(self, workflow_id, run_id)
             history_response, err = self.service.get_workflow_execution_history(history_request)
             if err:
                 raise Exception(err)
             if not history_response.history.events:
+                empty_polls += 1
+                time.sleep(EMPTY_POLL_BACKOFF.get_interval(empty_polls))
                 continue
-            history_event = history_response.history.events[0]
-            if history_event.event_type == EventType.WorkflowExecutionCompleted:
-                attributes = history_event.workflow_execution_completed_event_attributes
-                return json.loads(attributes.result)
-            elif history_event.event_type == EventType.WorkflowExecutionFailed:
-                attributes = history_event.workflow_execution_failed_event_attributes
-                if attributes.reason == "WorkflowFailureException":
-                    exception = deserialize_exception(attributes.details)
-                    if isinstance(exception, ActivityFailureException):
-                        exception.set_cause()
-                    workflow_execution = WorkflowExecution(workflow_id=workflow_id, run_id=run_id)
-                    raise WorkflowFailureException(workflow_type=workflow_type,
-                                                   execution=workflow_execution) from exception
-                else:
-                    details: Dict = json.loads(attributes.details)
-                    detail_message = details.get("detailMessage", "")
-                    raise WorkflowExecutionFailedException(attributes.reason, details=details,
-                                                           detail_message=detail_message)
-            elif history_event.event_type == EventType.WorkflowExecutionTimedOut:
-                raise WorkflowExecutionTimedOutException()
-            elif history_event.event_type == EventType.WorkflowExecutionTerminated:
-                attributes = history_event.workflow_execution_terminated_event_attributes
-                raise WorkflowExecutionTerminatedException(reason=attributes.reason, details=attributes.details,
-                                                           identity=attributes.identity)
-            elif history_event.event_type == EventType.WorkflowExecutionCanceled:
-                raise WorkflowExecutionCanceledException()
-            else:
-                raise Exception("Unexpected history close event: " + str(history_event))
+            return get_workflow_result(self.data_converter, history_response.history.events[0], workflow_id, run_id,
+                                       workflow_type)
 
     def new_activity_completion_client(self):
-        return ActivityCompletionClient(self.service)
+        return ActivityCompletionClient(self.service, self.data_converter)
+
+    def invalidate_query_results(self, workflow_id: str = None, run_id: str = None):
+        """
+        Makes the next queries on workflow_id (and run_id when given), or on every workflow when
+        called without arguments, call the server instead of reusing a cached response. E.g. after
+        signaling a workflow whose query results the signal changes.
+        """
+        if self.query_coalescer:
+            self.query_coalescer.invalidate(workflow_id, run_id)
+
+    def get_query_stats(self) -> Optional[QueryCoalescerStats]:
+        return self.query_coalescer.get_stats() if self.query_coalescer else None
+
+    def list_open_workflows(self, start_time_filter: StartTimeFilter, workflow_id: str = None,
+                            workflow_type: str = None, page_size: int = DEFAULT_PAGE_SIZE,
+                            prefetch: bool = True) -> Iterator[WorkflowExecutionInfo]:
+        """
+        Iterates over the open executions started within start_time_filter, optionally filtered by
+        workflow id or type, see iterate_pages for prefetch.
+        """
+        def fetch_page(service, next_page_token):
+            request = ListOpenWorkflowExecutionsRequest(domain=self.domain, maximum_page_size=page_size,
+                                                        next_page_token=next_page_token,
+                                                        start_time_filter=start_time_filter)
+            if workflow_id:
+                request.execution_filter = WorkflowExecutionFilter(workflow_id=workflow_id)
+            if workflow_type:
+                request.type_filter = WorkflowTypeFilter(name=workflow_type)
+            response = check_response(*service.list_open_workflow_executions(request))
+            return response.executions, response.next_page_token
+
+        return self.iterate_pages(fetch_page, prefetch)
+
+    def list_closed_workflows(self, start_time_filter: StartTimeFilter, workflow_id: str = None,
+                              workflow_type: str = None, close_status: WorkflowExecutionCloseStatus = None,
+                              page_size: int = DEFAULT_PAGE_SIZE,
+                              prefetch: bool = True) -> Iterator[WorkflowExecutionInfo]:
+        def fetch_page(service, next_page_token):
+            request = ListClosedWorkflowExecutionsRequest(domain=self.domain, maximum_page_size=page_size,
+                                                          next_page_token=next_page_token,
+                                                          start_time_filter=start_time_filter,
+                                                          status_filter=close_status)
+            if workflow_id:
+                request.execution_filter = WorkflowExecutionFilter(workflow_id=workflow_id)
+            if workflow_type:
+                request.type_filter = WorkflowTypeFilter(name=workflow_type)
+            response = check_response(*service.list_closed_workflow_executions(request))
+            return response.executions, response.next_page_token
+
+        return self.iterate_pages(fetch_page, prefetch)
+
+    def list_workflows(self, query: str, page_size: int = DEFAULT_PAGE_SIZE, scan: bool = False,
+                       prefetch: bool = True) -> Iterator[WorkflowExecutionInfo]:
+        """
+        Iterates over the executions matching a visibility query (requires advanced visibility).
+        With scan the executions are not sorted, which is cheaper for the server on large domains.
+        """
+        def fetch_page(service, next_page_token):
+            request = ListWorkflowExecutionsRequest(domain=self.domain, page_size=page_size,
+                                                    next_page_token=next_page_token, query=query)
+            list_executions = service.scan_workflow_executions if scan else service.list_workflow_executions
+            response = check_response(*list_executions(request))
+            return response.executions, response.next_page_token
+
+        return self.iterate_pages(fetch_page, prefetch)
+
+    def get_workflow_history(self, workflow_id: str, run_id: str = None, page_size: int = DEFAULT_PAGE_SIZE,
+                             prefetch: bool = True) -> Iterator[HistoryEvent]:
+        def fetch_page(service, next_page_token):
+            request = GetWorkflowExecutionHistoryRequest(
+                domain=self.domain, execution=WorkflowExecution(workflow_id=workflow_id, run_id=run_id),
+                maximum_page_size=page_size, next_page_token=next_page_token)
+            response = check_response(*service.get_workflow_execution_history(request))
+            return response.history.events, response.next_page_token
+
+        return self.iterate_pages(fetch_page, prefetch)
+
+    def iterate_pages(self, fetch_page: Callable[[WorkflowService, Optional[bytes]], Tuple[List, Optional[bytes]]],
+                      prefetch: bool) -> Iterator:
+        """
+        See pagination.iterate_pages, fetch_page is called with the service to use. Pages are
+        prefetched on a connection of their own, opened on the first page and closed with the
+        iterator, so that a fetch left running when the caller stops iterating doesn't hold
+        self.service. Close iterators that aren't exhausted, e.g. with contextlib.closing.
+        Without a connection of its own (a service not made by WorkflowService.create) pages
+        aren't prefetched.
+        """
+        service = self.service.clone() if prefetch else None
+        if not service:
+            yield from iterate_pages(partial(fetch_page, self.service), prefetch=False)
+            return
+        try:
+            yield from iterate_pages(partial(fetch_page, service), prefetch=True)
+        finally:
+            # Fails a prefetch still running
+            service.close()
 
 
 def exec_workflow(workflow_client, wm: WorkflowMethod, args, workflow_options: WorkflowOptions = None,
                   stub_instance: object = None) -> WorkflowExecutionContext:
-    start_request = create_start_workflow_request(workflow_client, wm, args)
-    start_response, err = workflow_client.service.start_workflow(start_request)
-    if err:
-        raise Exception(err)
+    start_request = create_start_workflow_request(workflow_client, wm, args, workflow_options)
+    tracer = workflow_client.options.tracer
+    with tracer.span("StartWorkflow:" + wm._name, kind=SPAN_KIND_CLIENT,
+                     attributes={"workflow_id": start_request.workflow_id}) as span:
+        # Decision tasks of the workflow are traced as children of this span
+        start_request.header = tracer.inject(start_request.header)
+        start_response, err = workflow_client.service.start_workflow(start_request)
+        if err:
+            if span:
+                span.error = str(err)
+            raise Exception(err)
+        if span:
+            span.set_attribute("run_id", start_response.run_id)
     execution = WorkflowExecution(workflow_id=start_request.workflow_id, run_id=start_response.run_id)
     stub_instance._execution = execution
     return WorkflowExecutionContext(workflow_type=wm._name, workflow_execution=execution)
@@ -224,55 +354,122 @@ def exec_workflow_sync(workflow_client: WorkflowClient, wm: WorkflowMethod, args
 
 def exec_signal(workflow_client: WorkflowClient, sm: SignalMethod, args, stub_instance: object = None):
     assert stub_instance._execution
-    request = SignalWorkflowExecutionRequest()
-    request.workflow_execution = stub_instance._execution
-    request.signal_name = sm.name
-    request.input = args_to_json(args)
-    request.domain = workflow_client.domain
+    request = create_signal_request(workflow_client, sm, args, stub_instance._execution)
     response, err = workflow_client.service.signal_workflow_execution(request)
     if err:
         raise Exception(err)
 
 
+def create_circuit_breaker(options: WorkflowClientOptions) -> Optional[CircuitBreaker]:
+    """
+    Circuit breaker shared by the connections of a client.
+    """
+    if not options.service_circuit_breaker_failure_threshold:
+        return None
+    return CircuitBreaker(failure_threshold=options.service_circuit_breaker_failure_threshold)
+
+
 def exec_query(workflow_client: WorkflowClient, qm: QueryMethod, args, stub_instance: object = None):
     assert stub_instance._execution
+    request = create_query_request(workflow_client, qm, args, stub_instance._execution)
+    response: QueryWorkflowResponse
+    if workflow_client.query_coalescer:
+        response, err = workflow_client.query_coalescer.query(request, workflow_client.service.query_workflow)
+    else:
+        response, err = workflow_client.service.query_workflow(request)
+    return get_query_result(workflow_client.data_converter, qm, stub_instance._execution, response, err)
+
+
+def create_signal_request(workflow_client: WorkflowClient, sm: SignalMethod, args,
+                          execution: WorkflowExecution) -> SignalWorkflowExecutionRequest:
+    request = SignalWorkflowExecutionRequest()
+    request.workflow_execution = execution
+    request.signal_name = sm.name
+    request.input = workflow_client.data_converter.args_to_payload(args)
+    request.domain = workflow_client.domain
+    return request
+
+
+def create_query_request(workflow_client: WorkflowClient, qm: QueryMethod, args,
+                         execution: WorkflowExecution) -> QueryWorkflowRequest:
     request = QueryWorkflowRequest()
-    request.execution = stub_instance._execution
+    request.execution = execution
     request.query = WorkflowQuery()
     request.query.query_type = qm.name
-    request.query.query_args = args_to_json(args)
+    request.query.query_args = workflow_client.data_converter.args_to_payload(args)
     request.domain = workflow_client.domain
-    response: QueryWorkflowResponse
-    response, err = workflow_client.service.query_workflow(request)
+    return request
+
+
+def get_query_result(data_converter: DataConverter, qm: QueryMethod, execution: WorkflowExecution,
+                     response: QueryWorkflowResponse, err) -> object:
     if err:
         if isinstance(err, QueryFailedError):
             cause = deserialize_exception(err.message)
-            raise QueryFailureException(query_type=qm.name, execution=stub_instance._execution) from cause
+            raise QueryFailureException(query_type=qm.name, execution=execution) from cause
         elif isinstance(err, Exception):
             raise err
         else:
             raise Exception(err)
     if response.query_rejected:
         raise QueryRejectedException(response.query_rejected.close_status)
-    return json.loads(response.query_result)
+    return data_converter.from_payload(response.query_result)
+
+
+def get_workflow_result(data_converter: DataConverter, history_event: HistoryEvent, workflow_id: str,
+                        run_id: str = None, workflow_type: str = None) -> object:
+    """
+    Returns the result of the workflow from its close event or raises the exception it failed with.
+    """
+    if history_event.event_type == EventType.WorkflowExecutionCompleted:
+        attributes = history_event.workflow_execution_completed_event_attributes
+        return data_converter.from_payload(attributes.result)
+    elif history_event.event_type == EventType.WorkflowExecutionFailed:
+        attributes = history_event.workflow_execution_failed_event_attributes
+        if attributes.reason == "WorkflowFailureException":
+            exception = deserialize_exception(attributes.details)
+            if isinstance(exception, ActivityFailureException):
+                exception.set_cause()
+            workflow_execution = WorkflowExecution(workflow_id=workflow_id, run_id=run_id)
+            raise WorkflowFailureException(workflow_type=workflow_type,
+                                           execution=workflow_execution) from exception
+        else:
+            details: Dict = json.loads(attributes.details)
+            detail_message = details.get("detailMessage", "")
+            raise WorkflowExecutionFailedException(attributes.reason, details=details,
+                                                   detail_message=detail_message)
+    elif history_event.event_type == EventType.WorkflowExecutionTimedOut:
+        raise WorkflowExecutionTimedOutException()
+    elif history_event.event_type == EventType.WorkflowExecutionTerminated:
+        attributes = history_event.workflow_execution_terminated_event_attributes
+        raise WorkflowExecutionTerminatedException(reason=attributes.reason, details=attributes.details,
+                                                   identity=attributes.identity)
+    elif history_event.event_type == EventType.WorkflowExecutionCanceled:
+        raise WorkflowExecutionCanceledException()
+    else:
+        raise Exception("Unexpected history close event: " + str(history_event))
 
 
-def create_start_workflow_request(workflow_client: WorkflowClient, wm: WorkflowMethod,
-                                  args: List) -> StartWorkflowExecutionRequest:
+def create_start_workflow_request(workflow_client: WorkflowClient, wm: WorkflowMethod, args: List,
+                                  workflow_options: WorkflowOptions = None) -> StartWorkflowExecutionRequest:
+    options = workflow_options if workflow_options else WorkflowOptions()
     start_request = StartWorkflowExecutionRequest()
     start_request.domain = workflow_client.domain
-    start_request.workflow_id = wm._workflow_id if wm._workflow_id else str(uuid4())
+    start_request.workflow_id = options.workflow_id or wm._workflow_id or str(uuid4())
     start_request.workflow_type = WorkflowType()
     start_request.workflow_type.name = wm._name
     start_request.task_list = TaskList()
-    start_request.task_list.name = wm._task_list
-    start_request.input = args_to_json(args)
-    start_request.execution_start_to_close_timeout_seconds = wm._execution_start_to_close_timeout_seconds
-    start_request.task_start_to_close_timeout_seconds = wm._task_start_to_close_timeout_seconds
-    start_request.identity = workflow_client.service.get_identity()
-    start_request.workflow_id_reuse_policy = wm._workflow_id_reuse_policy
+    start_request.task_list.name = options.task_list or wm._task_list
+    start_request.input = workflow_client.data_converter.args_to_payload(args)
+    start_request.execution_start_to_close_timeout_seconds = (options.execution_start_to_close_timeout_seconds or
+                                                              wm._execution_start_to_close_timeout_seconds)
+    start_request.task_start_to_close_timeout_seconds = (options.task_start_to_close_timeout_seconds or
+                                                         wm._task_start_to_close_timeout_seconds)
+    start_request.identity = WorkflowService.get_identity()
+    start_request.workflow_id_reuse_policy = (options.workflow_id_reuse_policy if options.workflow_id_reuse_policy
+                                              is not None else wm._workflow_id_reuse_policy)
     start_request.request_id = str(uuid4())
-    start_request.cron_schedule = wm._cron_schedule if wm._cron_schedule else None
+    start_request.cron_schedule = options.cron_schedule or wm._cron_schedule or None
     return start_request
 
 
@@ -358,12 +555,16 @@ def workflow_method(func=None,
 @dataclass
 class QueryMethod:
     name: str = None
+    # Whether the worker may answer the query from a previous result at the same history position,
+    # see WorkerOptions.query_cache_size. Set to False for queries that don't only read workflow state.
+    memoize: bool = True
 
 
-def query_method(func=None, name: str = None):
+def query_method(func=None, name: str = None, memoize: bool = True):
     def wrapper(fn):
         fn._query_method = QueryMethod()
         fn._query_method.name = name if name else get_workflow_method_name(fn)
+        fn._query_method.memoize = memoize
         return fn
 
     if func and inspect.isfunction(func):
@@ -401,12 +602,45 @@ def cron_schedule(value):
 
 @dataclass
 class WorkflowClientOptions:
-    pass
+    # Creates spans for workflow starts and service calls, see cadence.tracing
+    tracer: Tracer = NOOP_TRACER
+    # Wrap every call made to the server by the client
+    interceptors: List[ServiceInterceptor] = field(default_factory=list)
+    # Serializes workflow inputs and results, signals and queries, see WorkerOptions.data_converter
+    data_converter: DataConverter = DEFAULT_DATA_CONVERTER
+    # Applied to every payload after data_converter, see WorkerOptions.payload_codec
+    payload_codec: PayloadCodec = None
+    # Metrics emitted by service calls, the payload codec and query coalescing
+    metrics_scope: MetricsScope = NOOP_SCOPE
+    # Retries service calls failing with transient server or transport errors, see
+    # WorkerOptions.service_retry_policy. None disables retries.
+    service_retry_policy: BackoffPolicy = None
+    # Number of consecutive failed service calls, across all the connections of a client, that opens
+    # a circuit breaker failing calls with CircuitOpenError. 0 disables the circuit breaker.
+    service_circuit_breaker_failure_threshold: int = 0
+    # Identical queries (same execution, query type and arguments) made while one is in flight wait
+    # for its response instead of calling the server, see QueryCoalescer
+    coalesce_queries: bool = False
+    # Identical queries made within this many seconds of a successful one get its response, until
+    # WorkflowClient.invalidate_query_results is called for the workflow. Implies coalesce_queries,
+    # 0 disables the cache.
+    query_cache_ttl_seconds: float = 0
+    # Maximum number of query responses kept by the cache
+    query_cache_size: int = DEFAULT_QUERY_CACHE_SIZE
 
 
 @dataclass
 class WorkflowOptions:
-    pass
+    """
+    Overrides the values given to @workflow_method when starting a workflow, fields left to None
+    keep them.
+    """
+    workflow_id: str = None
+    workflow_id_reuse_policy: WorkflowIdReusePolicy = None
+    execution_start_to_close_timeout_seconds: int = None
+    task_start_to_close_timeout_seconds: int = None
+    task_list: str = None
+    cron_schedule: str = None
 
 
 @dataclass
@@ -1,15 +1,25 @@
 from __future__ import annotations
 
-from typing import Tuple, Callable
+from contextlib import contextmanager
+from typing import Tuple, Callable, List, Optional
 from uuid import uuid4
 
 import os
 import socket
+import threading
+import time
 
+from cadence.backoff import BackoffPolicy, CircuitBreaker, CircuitOpenError, is_retryable
 from cadence.thrift import cadence_thrift
 from cadence.connection import TChannelConnection, ThriftFunctionCall
 from cadence.errors import find_error
-from cadence.conversions import copy_thrift_to_py, copy_py_to_thrift
+from cadence.exceptions import StopRequestedException
+from cadence.interceptors import ServiceInterceptor, ServiceCall, build_chain
+from cadence.metrics import MetricsScope, NOOP_SCOPE, CADENCE_REQUEST, CADENCE_REQUEST_LATENCY, CADENCE_ERROR, \
+    CADENCE_TRANSPORT_ERROR
+from cadence.tchannel import TChannelException
+from cadence.tracing import Tracer, NOOP_TRACER, SPAN_KIND_CLIENT
+from cadence.conversions import copy_thrift_to_py, copy_py_to_thrift, is_thrift_object
 from cadence.cadence_types import PollForActivityTaskResponse, StartWorkflowExecutionRequest, StartWorkflowExecutionResponse, \
     RegisterDomainRequest, PollForActivityTaskRequest, RespondActivityTaskCompletedRequest, DescribeTaskListResponse, \
     DescribeWorkflowExecutionRequest, DescribeWorkflowExecutionResponse, QueryWorkflowRequest, QueryWorkflowResponse, \
@@ -23,7 +33,7 @@ from cadence.cadence_types import PollForActivityTaskResponse, StartWorkflowExec
     RespondDecisionTaskCompletedRequest, RespondDecisionTaskCompletedResponse, PollForDecisionTaskResponse, \
     PollForDecisionTaskRequest, GetWorkflowExecutionHistoryResponse, GetWorkflowExecutionHistoryRequest, \
     DeprecateDomainRequest, UpdateDomainRequest, UpdateDomainResponse, ListDomainsRequest, ListDomainsResponse, \
-    DescribeDomainRequest, DescribeDomainResponse
+    DescribeDomainRequest, DescribeDomainResponse, ListWorkflowExecutionsRequest, ListWorkflowExecutionsResponse
 
 TCHANNEL_SERVICE = "cadence-frontend"
 
@@ -31,41 +41,137 @@ TCHANNEL_SERVICE = "cadence-frontend"
 class WorkflowService:
 
     @classmethod
-    def create(cls, host: str, port: int, timeout: int = None):
-        connection = TChannelConnection.open(host, port, timeout=timeout)
-        return cls(connection)
+    def create(cls, host: str, port: int, timeout: int = None, retry_policy: BackoffPolicy = None,
+               circuit_breaker: CircuitBreaker = None, metrics_scope: MetricsScope = None, tracer: Tracer = None,
+               interceptors: List[ServiceInterceptor] = None):
+        def connect() -> TChannelConnection:
+            return TChannelConnection.open(host, port, timeout=timeout)
+
+        return cls(connect(), retry_policy=retry_policy, circuit_breaker=circuit_breaker, metrics_scope=metrics_scope,
+                   tracer=tracer, interceptors=interceptors, connect=connect)
 
     @classmethod
     def get_identity(cls):
         return "%d@%s" % (os.getpid(), socket.gethostname())
 
-    def __init__(self, connection: TChannelConnection):
+    def __init__(self, connection: TChannelConnection, retry_policy: BackoffPolicy = None,
+                 circuit_breaker: CircuitBreaker = None, metrics_scope: MetricsScope = None, tracer: Tracer = None,
+                 interceptors: List[ServiceInterceptor] = None, connect: Callable[[], TChannelConnection] = None):
         self.connection = connection
+        # Opens a new connection to replace one broken by a transport error before retrying
+        self.connect = connect
+        self.reconnect_needed = False
+        # Retries calls failing with transient errors, including transport errors (see
+        # backoff.is_retryable), when set
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.metrics_scope = metrics_scope if metrics_scope else NOOP_SCOPE
+        self.tracer = tracer if tracer else NOOP_TRACER
+        self.interceptors = interceptors
+        self.call_chain = build_chain([i.intercept_call for i in interceptors or []],
+                                      lambda call: self.traced_thrift_call(call.method_name, call.request))
+        # The connection is a blocking request/response exchange, calls from different threads take
+        # turns on it
+        self.lock = threading.Lock()
         self.execution_start_to_close_timeout_seconds = 86400
         self.task_start_to_close_timeout_seconds = 120
 
     def thrift_call(self, method_name, request_argument):
-        thrift_request_argument = copy_py_to_thrift(request_argument)
-        fn = getattr(cadence_thrift.WorkflowService, method_name, None)
-        assert fn
-        request = fn.request(thrift_request_argument)
-        request_payload = cadence_thrift.dumps(request)
-        call = ThriftFunctionCall.create(TCHANNEL_SERVICE, "WorkflowService::" + method_name, request_payload)
-        response = self.connection.call_function(call)
-        start_response = cadence_thrift.loads(fn.response, response.thrift_payload)
+        if self.call_chain:
+            return self.call_chain(ServiceCall(method_name, request_argument))
+        return self.traced_thrift_call(method_name, request_argument)
+
+    def traced_thrift_call(self, method_name, request_argument):
+        with self.tracer.span("WorkflowService::" + method_name, kind=SPAN_KIND_CLIENT,
+                              attributes={"rpc.service": TCHANNEL_SERVICE, "rpc.method": method_name}):
+            return self.send_thrift_call(method_name, request_argument)
+
+    def send_thrift_call(self, method_name, request_argument):
+        tags = {"operation": method_name}
+        self.metrics_scope.counter(CADENCE_REQUEST, tags=tags)
+        start = time.perf_counter()
+        try:
+            # Requests can be converted by the caller, e.g. to time the conversion
+            thrift_request_argument = request_argument if is_thrift_object(request_argument) \
+                else copy_py_to_thrift(request_argument)
+            fn = getattr(cadence_thrift.WorkflowService, method_name, None)
+            assert fn
+            request = fn.request(thrift_request_argument)
+            request_payload = cadence_thrift.dumps(request)
+            call = ThriftFunctionCall.create(TCHANNEL_SERVICE, "WorkflowService::" + method_name, request_payload)
+            with self.lock:
+                response = self.connection.call_function(call)
+            start_response = cadence_thrift.loads(fn.response, response.thrift_payload)
+        except StopRequestedException:
+            # Raised by the timeout callback of a poll when the worker stops, not a transport error
+            raise
+        except Exception:
+            self.metrics_scope.counter(CADENCE_TRANSPORT_ERROR, tags=tags)
+            raise
+        finally:
+            self.metrics_scope.histogram(CADENCE_REQUEST_LATENCY, time.perf_counter() - start, tags=tags)
         return start_response
 
-    def call_return(self, method_name: str, request: object, expected_return_type: type) -> Tuple[object, object]:
-        response = self.thrift_call(method_name, request)
-        if not response.success:
-            return None, find_error(response)
+    def call(self, method_name, request) -> Tuple[object, object]:
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.circuit_breaker and not self.circuit_breaker.allow_request():
+                return None, CircuitOpenError(method_name)
+            try:
+                if self.reconnect_needed:
+                    self.reconnect()
+                response = self.thrift_call(method_name, request)
+            except (TChannelException, OSError, EOFError):
+                if self.circuit_breaker:
+                    self.circuit_breaker.record_failure()
+                if not self.retry_policy or not self.retry_policy.should_retry(attempt):
+                    raise
+                # An error frame leaves the connection usable, a socket error doesn't
+                self.reconnect_needed = self.connect is not None
+                time.sleep(self.retry_policy.get_interval(attempt))
+                continue
+            error = find_error(response)
+            if error:
+                self.metrics_scope.counter(CADENCE_ERROR, tags={"operation": method_name,
+                                                                "error": type(error).__name__})
+            retryable = is_retryable(error)
+            if self.circuit_breaker:
+                if retryable:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+            if not retryable or not self.retry_policy or not self.retry_policy.should_retry(attempt):
+                return response, error
+            time.sleep(self.retry_policy.get_interval(attempt))
+
+    def reconnect(self):
+        with self.lock:
+            # noinspection PyBroadException
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+            self.connection = self.connect()
+            self.reconnect_needed = False
+
+    def call_return(self, method_name: str, request: object, expected_return_type: type,
+                    convert: bool = True) -> Tuple[object, object]:
+        """
+        Without convert the response is returned as a thrift object, for callers that convert it
+        themselves, e.g. to time the conversion.
+        """
+        response, error = self.call(method_name, request)
+        if error or not response.success:
+            return None, error
+        if not convert:
+            return response.success, None
         return_value = copy_thrift_to_py(response.success)
         assert isinstance(return_value, expected_return_type)
         return return_value, None
 
     def call_void(self, method_name, request):
-        response = self.thrift_call(method_name, request)
-        error = find_error(response)
+        response, error = self.call(method_name, request)
         return None, error
 
     def start_workflow(self, request: StartWorkflowExecutionRequest) -> Tuple[StartWorkflowExecutionResponse, object]:
@@ -90,9 +196,9 @@ class WorkflowService:
             Tuple[GetWorkflowExecutionHistoryResponse, object]:
         return self.call_return("GetWorkflowExecutionHistory", request, GetWorkflowExecutionHistoryResponse)
 
-    def poll_for_decision_task(self, request: PollForDecisionTaskRequest) -> \
+    def poll_for_decision_task(self, request: PollForDecisionTaskRequest, convert: bool = True) -> \
             Tuple[PollForDecisionTaskResponse, object]:
-        return self.call_return("PollForDecisionTask", request, PollForDecisionTaskResponse)
+        return self.call_return("PollForDecisionTask", request, PollForDecisionTaskResponse, convert)
 
     def respond_decision_task_completed(self, request: RespondDecisionTaskCompletedRequest) -> \
             Tuple[RespondDecisionTaskCompletedResponse, object]:
@@ -153,6 +259,14 @@ class WorkflowService:
             Tuple[ListClosedWorkflowExecutionsResponse, object]:
         return self.call_return("ListClosedWorkflowExecutions", request, ListClosedWorkflowExecutionsResponse)
 
+    def list_workflow_executions(self, request: ListWorkflowExecutionsRequest) -> \
+            Tuple[ListWorkflowExecutionsResponse, object]:
+        return self.call_return("ListWorkflowExecutions", request, ListWorkflowExecutionsResponse)
+
+    def scan_workflow_executions(self, request: ListWorkflowExecutionsRequest) -> \
+            Tuple[ListWorkflowExecutionsResponse, object]:
+        return self.call_return("ScanWorkflowExecutions", request, ListWorkflowExecutionsResponse)
+
     def respond_query_task_completed(self, request: RespondQueryTaskCompletedRequest) -> Tuple[None, object]:
         return self.call_void("RespondQueryTaskCompleted", request)
 
@@ -168,8 +282,80 @@ class WorkflowService:
     def describe_task_list(self, request) -> Tuple[DescribeTaskListResponse, object]:
         return self.call_return("DescribeTaskList", request, DescribeTaskListResponse)
 
+    def clone(self) -> Optional[WorkflowService]:
+        """
+        Returns a WorkflowService with the same settings on a new connection, or None when this one
+        was created without a way to connect (see create).
+        """
+        if not self.connect:
+            return None
+        return WorkflowService(self.connect(), retry_policy=self.retry_policy, circuit_breaker=self.circuit_breaker,
+                               metrics_scope=self.metrics_scope, tracer=self.tracer, interceptors=self.interceptors,
+                               connect=self.connect)
+
     def close(self):
         self.connection.close()
 
     def set_next_timeout_cb(self, cb: Callable):
         self.connection.set_next_timeout_cb(cb)
+
+
+class WorkflowServicePool:
+    """
+    Thread-safe pool of WorkflowService connections. At most `size` connections are open at
+    any given time, callers block in acquire() until one becomes available.
+    """
+
+    @classmethod
+    def create(cls, host: str, port: int, size: int, timeout: int = None, metrics_scope: MetricsScope = None,
+               tracer: Tracer = None, interceptors: List[ServiceInterceptor] = None,
+               retry_policy: BackoffPolicy = None, circuit_breaker: CircuitBreaker = None) -> WorkflowServicePool:
+        return cls(lambda: WorkflowService.create(host, port, timeout=timeout, retry_policy=retry_policy,
+                                                  circuit_breaker=circuit_breaker, metrics_scope=metrics_scope,
+                                                  tracer=tracer, interceptors=interceptors), size)
+
+    def __init__(self, factory: Callable[[], WorkflowService], size: int):
+        assert size > 0
+        self.factory = factory
+        self.size = size
+        self.idle: List[WorkflowService] = []
+        self.lock = threading.Lock()
+        self.available = threading.BoundedSemaphore(size)
+        self.closed = False
+
+    @contextmanager
+    def acquire(self) -> WorkflowService:
+        self.available.acquire()
+        try:
+            with self.lock:
+                service = self.idle.pop() if self.idle else None
+            if not service:
+                service = self.factory()
+            try:
+                yield service
+            except BaseException:
+                # The connection may be left in the middle of a frame, don't hand it out again
+                self.discard(service)
+                raise
+            with self.lock:
+                if not self.closed:
+                    self.idle.append(service)
+                    service = None
+            if service:
+                self.discard(service)
+        finally:
+            self.available.release()
+
+    def discard(self, service: WorkflowService):
+        # noinspection PyBroadException
+        try:
+            service.close()
+        except Exception:
+            pass
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            idle, self.idle = self.idle, []
+        for service in idle:
+            self.discard(service)
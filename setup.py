@@ -12,7 +12,7 @@ setuptools.setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/firdaus/cadence-python",
-    packages=setuptools.find_packages(exclude=["cadence.tests", "cadence.spikes"]),
+    packages=setuptools.find_packages(exclude=["cadence.tests", "cadence.spikes", "cadence.benchmarks"]),
     install_requires=[
         "dataclasses-json>=0.3.8",
         "more-itertools>=7.0.0",
@@ -20,6 +20,10 @@ setuptools.setup(
         "tblib>=1.6.0",
         "thriftrw>=1.7.2",
     ],
+    extras_require={
+        "orjson": ["orjson>=3.0.0"],
+        "msgpack": ["msgpack>=1.0.0"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "Programming Language :: Python :: 3.7",